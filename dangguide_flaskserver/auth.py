@@ -0,0 +1,251 @@
+# auth.py
+"""
+서명된 무상태 액세스 토큰.
+    토큰 = "<user_id>.<iat>.<exp>.<jti>.<HMAC-SHA256 서명(base64url)>"
+
+로그인(/api/users/login) 때 발급하고, 요청마다 before_request 에서
+Authorization: Bearer <토큰> 을 HMAC 으로만 검증한다 (DB 조회 없음).
+로그아웃/회원탈퇴로 폐기된 토큰은 메모리 사본으로 확인하고,
+원본(revoked_tokens / user_token_cutoffs)은 AUTH_REVOCATION_RELOAD_SEC 마다 다시 읽어
+다른 워커 프로세스의 폐기도 반영한다.
+
+AUTH_REQUIRED=1 이면 쓰기 API 는 토큰 필수, 아니면 기존처럼 body 의 user_id 도 허용.
+"""
+
+import base64
+import functools
+import hashlib
+import hmac
+import os
+import secrets
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+from flask import Flask, abort, g, jsonify, request
+
+from dao.user_dao import InactiveUser
+from dao.token_dao import load_revocations, prune_revocations, save_revoked_token, save_user_cutoff
+
+AUTH_SECRET = os.getenv("AUTH_SECRET", "")
+# AUTH_SECRET 미설정 시 생성한 키를 저장하는 파일 (워커/재시작 사이에 같은 키 사용)
+AUTH_SECRET_FILE = Path(os.getenv("AUTH_SECRET_FILE", str(Path(__file__).parent / ".auth_secret")))
+AUTH_TOKEN_TTL_SEC = int(os.getenv("AUTH_TOKEN_TTL_SEC", str(7 * 24 * 3600)))
+AUTH_REQUIRED = os.getenv("AUTH_REQUIRED", "0") == "1"
+AUTH_REVOCATION_RELOAD_SEC = float(os.getenv("AUTH_REVOCATION_RELOAD_SEC", "30"))
+# /api/admin/auth/stats 등 운영용 엔드포인트 접근 토큰 (미설정이면 해당 엔드포인트 비활성)
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN", "")
+
+
+def _load_or_create_secret(path: Path) -> str:
+    """
+    파일에 저장된 키를 읽고, 없으면 새로 만들어 저장.
+    여러 워커가 동시에 시작해도 O_EXCL 로 먼저 만든 하나의 키를 모두 같이 씀
+    """
+    try:
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    except FileExistsError:
+        for _ in range(50):
+            secret = path.read_text(encoding="ascii").strip()
+            if secret:
+                return secret
+            time.sleep(0.01)  # 다른 워커가 막 만들고 아직 쓰는 중
+        raise RuntimeError(f"{path} 가 비어 있음 → 파일을 지우거나 AUTH_SECRET 설정")
+
+    secret = secrets.token_hex(32)
+    with os.fdopen(fd, "w", encoding="ascii") as f:
+        f.write(secret)
+    return secret
+
+
+if not AUTH_SECRET:
+    if AUTH_REQUIRED:
+        # 토큰 필수 운영 환경은 키를 명시적으로 관리해야 함
+        raise RuntimeError("AUTH_REQUIRED=1 이면 AUTH_SECRET 환경변수 필수")
+    print(f"⚠️ AUTH_SECRET 미설정 → {AUTH_SECRET_FILE} 의 키 사용")
+    AUTH_SECRET = _load_or_create_secret(AUTH_SECRET_FILE)
+
+_key = AUTH_SECRET.encode("utf-8")
+
+
+class AuthError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class TokenClaims:
+    __slots__ = ("user_id", "iat", "exp", "jti")
+
+    def __init__(self, user_id: int, iat: int, exp: int, jti: str):
+        self.user_id = user_id
+        self.iat = iat
+        self.exp = exp
+        self.jti = jti
+
+
+def _sign(payload: str) -> str:
+    digest = hmac.new(_key, payload.encode("ascii"), hashlib.sha256).digest()
+    return base64.urlsafe_b64encode(digest).rstrip(b"=").decode("ascii")
+
+
+def issue_token(user_id: int) -> Dict[str, object]:
+    now = int(time.time())
+    exp = now + AUTH_TOKEN_TTL_SEC
+    payload = f"{user_id}.{now}.{exp}.{secrets.token_urlsafe(12)}"
+    return {"token": f"{payload}.{_sign(payload)}", "expires_at": exp}
+
+
+# ====================================
+# 🚫 폐기 목록 (메모리 사본)
+# ====================================
+_revoked: Dict[str, int] = {}        # jti → exp
+_user_cutoffs: Dict[int, int] = {}   # user_id → not_before
+_loaded_at = 0.0
+_reload_lock = threading.Lock()
+
+
+def reload_revocations() -> None:
+    with _reload_lock:
+        _reload()
+
+
+def _reload() -> None:
+    # _reload_lock 안에서 호출 → revoke_* 가 읽기와 교체 사이에 끼어들어 사라지지 않음
+    global _revoked, _user_cutoffs, _loaded_at
+    tokens, cutoffs = load_revocations(int(time.time()))
+    # 통째로 교체 (검증 쪽은 락 없이 읽음)
+    _revoked, _user_cutoffs = tokens, cutoffs
+    _loaded_at = time.monotonic()
+
+
+def _maybe_reload() -> None:
+    if time.monotonic() - _loaded_at < AUTH_REVOCATION_RELOAD_SEC:
+        return
+    # 한 요청만 다시 읽고 나머지는 기존 사본으로 진행
+    if _reload_lock.acquire(blocking=False):
+        try:
+            _reload()
+        finally:
+            _reload_lock.release()
+
+
+def verify_token(token: str) -> Optional[TokenClaims]:
+    """서명/만료/폐기 확인. 유효하지 않으면 None"""
+    payload, _, signature = token.rpartition(".")
+    if not payload or not token.isascii() or not hmac.compare_digest(signature, _sign(payload)):
+        return None
+
+    try:
+        uid, iat, exp, jti = payload.split(".")
+        claims = TokenClaims(int(uid), int(iat), int(exp), jti)
+    except ValueError:
+        return None
+
+    if claims.exp <= time.time():
+        return None
+    if claims.jti in _revoked:
+        return None
+    if claims.iat < _user_cutoffs.get(claims.user_id, 0):
+        return None
+    return claims
+
+
+def revoke_token(claims: TokenClaims) -> None:
+    # 저장 후 메모리 반영까지 reload 와 겹치지 않게 (먼저 읽은 DB 사본이 방금 폐기를 덮어쓰지 않도록)
+    with _reload_lock:
+        save_revoked_token(claims.jti, claims.user_id, claims.exp)
+        _revoked[claims.jti] = claims.exp
+
+
+def revoke_user_tokens(user_id: int) -> None:
+    """지금까지 발급된 해당 사용자 토큰 전부 무효 (같은 초에 발급된 것 포함)"""
+    not_before = int(time.time()) + 1
+    with _reload_lock:
+        save_user_cutoff(user_id, not_before)
+        _user_cutoffs[user_id] = max(_user_cutoffs.get(user_id, 0), not_before)
+
+
+# ====================================
+# 🔐 요청 훅 / 라우트 헬퍼
+# ====================================
+def _authenticate():
+    g.auth_claims = None
+
+    header = request.headers.get("Authorization", "")
+    if not header:
+        return None
+    if not header.startswith("Bearer "):
+        return jsonify({"ok": False, "error": "Authorization: Bearer <token> 형식"}), 401
+
+    _maybe_reload()
+    claims = verify_token(header[7:].strip())
+    if claims is None:
+        return jsonify({"ok": False, "error": "유효하지 않거나 만료된 토큰"}), 401
+
+    g.auth_claims = claims
+    return None
+
+
+def current_claims() -> Optional[TokenClaims]:
+    return g.get("auth_claims")
+
+
+def acting_user_id(claimed=None) -> Optional[int]:
+    """
+    쓰기 API 에서 행위자 id.
+    토큰이 있으면 토큰의 user_id (body 의 user_id 가 다르면 403),
+    없으면 AUTH_REQUIRED 일 때 401, 아니면 body 의 user_id 그대로 (기존 클라이언트 호환)
+    """
+    claims = current_claims()
+    if claims is not None:
+        if claimed not in (None, "") and str(claimed) != str(claims.user_id):
+            raise AuthError(403, "토큰 사용자와 user_id 가 다릅니다")
+        return claims.user_id
+
+    if AUTH_REQUIRED:
+        raise AuthError(401, "로그인이 필요합니다")
+    return claimed
+
+
+def require_admin(view):
+    """
+    운영용 엔드포인트 보호: X-Admin-Token 헤더가 ADMIN_TOKEN 과 같아야 함.
+    ADMIN_TOKEN 미설정이면 엔드포인트 자체를 숨김 (404)
+    """
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        if not ADMIN_TOKEN:
+            abort(404)
+        if not hmac.compare_digest(request.headers.get("X-Admin-Token", ""), ADMIN_TOKEN):
+            raise AuthError(403, "관리자 토큰이 필요합니다")
+        return view(*args, **kwargs)
+    return wrapper
+
+
+def viewer_user_id(claimed=None) -> Optional[int]:
+    """읽기 API 에서 '내가 좋아요 눌렀나' 등에 쓰는 id (없으면 None, 에러 없음)"""
+    claims = current_claims()
+    if claims is not None:
+        return claims.user_id
+    return None if AUTH_REQUIRED else claimed
+
+
+def init_app(app: Flask) -> None:
+    with app.app_context():
+        # 만료된 폐기 기록 정리는 시작 시 한 번 (요청 경로의 reload 는 읽기만 함)
+        prune_revocations(int(time.time()))
+        reload_revocations()
+
+    app.before_request(_authenticate)
+
+    @app.errorhandler(AuthError)
+    def _auth_error(e: AuthError):
+        return jsonify({"ok": False, "error": e.message}), e.status
+
+    @app.errorhandler(InactiveUser)
+    def _inactive_user(e: InactiveUser):
+        # 탈퇴한 계정은 토큰 없이 body 의 user_id 로 쓰기 요청해도 거절
+        return jsonify({"ok": False, "error": "탈퇴했거나 존재하지 않는 사용자"}), 403
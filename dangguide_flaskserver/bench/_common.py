@@ -0,0 +1,55 @@
+# bench/_common.py
+"""벤치마크 공통: 임시 DB 파일로 바꿔치기하고 시간 측정 유틸 제공"""
+
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+import db
+
+
+def use_temp_db() -> Path:
+    """실제 dangguide_server.db 를 건드리지 않도록 임시 DB 로 전환 후 스키마 생성"""
+    db.pool.close_all()
+    path = Path(tempfile.mkdtemp(prefix="dangguide_bench_")) / "bench.db"
+    db.DB_PATH = path
+    db.init_db()
+    return path
+
+
+def seed_users(n: int, start: int = 1) -> None:
+    conn = db.get_conn()
+    conn.executemany(
+        "INSERT INTO users (id, username, password) VALUES (?, ?, ?)",
+        ((i, f"bench_user_{i}", "x") for i in range(start, start + n)),
+    )
+    conn.commit()
+    conn.close()
+
+
+def time_calls(fn: Callable[[], object], repeat: int) -> Dict[str, float]:
+    """fn 을 repeat 번 호출하고 µs 단위 통계 반환"""
+    samples: List[float] = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1_000_000)
+    samples.sort()
+    return {
+        "median_us": round(statistics.median(samples), 1),
+        "p95_us": round(samples[int(len(samples) * 0.95) - 1], 1),
+        "mean_us": round(statistics.fmean(samples), 1),
+    }
+
+
+def print_table(title: str, rows: List[Dict[str, object]]) -> None:
+    print(f"\n📊 {title}")
+    if not rows:
+        return
+    keys = list(rows[0].keys())
+    widths = {k: max(len(k), *(len(str(r[k])) for r in rows)) for k in keys}
+    print("  " + "  ".join(k.rjust(widths[k]) for k in keys))
+    for r in rows:
+        print("  " + "  ".join(str(r[k]).rjust(widths[k]) for k in keys))
@@ -0,0 +1,73 @@
+# bench/bench_auth.py
+"""
+요청당 인증 오버헤드 측정.
+  1) verify_token 단독 (HMAC 검증 + 폐기 목록 확인)
+  2) before_request 훅 전체 (헤더 파싱 + 검증 + g 설정), 요청 컨텍스트 안에서 직접 호출
+  3) 참고용: 테스트 클라이언트로 보낸 전체 요청 (토큰 없음 / 있음)
+훅의 중앙값이 AUTH_BUDGET_US 이하인지 확인한다.
+
+    cd dangguide_flaskserver
+    python -m bench.bench_auth
+"""
+
+import os
+import sys
+
+from bench._common import use_temp_db, time_calls, print_table
+
+AUTH_BUDGET_US = float(os.getenv("AUTH_BUDGET_US", "50"))
+REPEAT = 5_000
+REVOKED = 10_000
+
+
+def run() -> bool:
+    use_temp_db()
+
+    import auth
+    from flask import Flask, jsonify
+    from db import init_app as init_db_pool
+
+    # 인증 훅만 붙인 최소 앱 (main 을 import 하면 견종 동기화 등 부수 작업이 시작됨)
+    app = Flask(__name__)
+    init_db_pool(app)
+    auth.init_app(app)
+
+    @app.get("/ping")
+    def ping():
+        return jsonify({"ok": True, "user_id": auth.viewer_user_id()})
+
+    client = app.test_client()
+
+    # 폐기 목록이 어느 정도 쌓인 상태에서 측정
+    for i in range(REVOKED):
+        auth._revoked[f"revoked-{i}"] = 2 ** 31
+
+    token = auth.issue_token(1)["token"]
+    headers = {"Authorization": f"Bearer {token}"}
+
+    verify = time_calls(lambda: auth.verify_token(token), REPEAT)
+    bad = time_calls(lambda: auth.verify_token(token[:-2] + "xx"), REPEAT)
+
+    with app.test_request_context("/ping", headers=headers):
+        hook = time_calls(auth._authenticate, REPEAT)
+        assert auth.current_claims() is not None
+
+    plain = time_calls(lambda: client.get("/ping"), REPEAT)
+    authed = time_calls(lambda: client.get("/ping", headers=headers), REPEAT)
+
+    rows = [
+        {"case": "verify_token (유효)", **verify},
+        {"case": "verify_token (서명 불일치)", **bad},
+        {"case": "before_request 훅", **hook},
+        {"case": "전체 요청 (토큰 없음)", **plain},
+        {"case": "전체 요청 (Bearer 토큰)", **authed},
+    ]
+    print_table(f"인증 오버헤드 (폐기 목록 {REVOKED}개)", rows)
+
+    ok = hook["median_us"] <= AUTH_BUDGET_US
+    print(f"\n{'✅' if ok else '❌'} 요청당 인증 훅 {hook['median_us']}µs (예산 {AUTH_BUDGET_US}µs)")
+    return ok
+
+
+if __name__ == "__main__":
+    sys.exit(0 if run() else 1)
@@ -0,0 +1,108 @@
+# bench/bench_feed.py
+"""
+게시글 N개일 때 목록 한 페이지(20개) 지연시간 비교:
+  join : 예전 get_posts (posts JOIN users + 첫 이미지 서브쿼리)
+  feed : post_feed 테이블 PK 범위 스캔 (현재 get_posts)
+첫 페이지와 중간 페이지(before_id = N/2) 둘 다 측정.
+
+    cd dangguide_flaskserver
+    python -m bench.bench_feed                 # 1k, 100k, 1M
+    python -m bench.bench_feed 1000 100000     # 원하는 크기만
+"""
+
+import random
+import sys
+import time
+
+import db
+from bench._common import use_temp_db, seed_users, time_calls, print_table
+from dao.board_dao import get_posts
+
+SIZES = [1_000, 100_000, 1_000_000]
+REPEAT = 500
+USERS = 1_000
+PAGE = 20
+
+# 비교용: post_feed 도입 전 get_posts 쿼리
+JOIN_SQL = """
+    WITH page AS (
+        SELECT
+            p.id,
+            p.title,
+            p.created_at,
+            u.username AS author_name,
+            COALESCE(p.like_count, 0)   AS likes,
+            COALESCE(p.comment_count, 0) AS comments
+        FROM posts p
+        JOIN users u ON u.id = p.user_id
+        WHERE p.id < COALESCE(?, 9223372036854775807)
+        ORDER BY p.id DESC
+        LIMIT ?
+    ),
+    first_image AS (
+        SELECT post_id, MIN(id) AS image_id
+        FROM post_images
+        WHERE post_id IN (SELECT id FROM page)
+        GROUP BY post_id
+    )
+    SELECT page.*, COALESCE(pi.thumb_path, pi.image_path) AS thumbnail
+    FROM page
+    LEFT JOIN first_image fi ON fi.post_id = page.id
+    LEFT JOIN post_images pi ON pi.id = fi.image_id
+    ORDER BY page.id DESC
+"""
+
+
+def _seed(n: int) -> None:
+    rng = random.Random(n)
+    conn = db.get_conn()
+    conn.executemany(
+        "INSERT INTO posts (id, user_id, title, content, like_count, comment_count) VALUES (?, ?, ?, ?, ?, ?)",
+        ((i, rng.randint(1, USERS), f"title {i}", "body", rng.randint(0, 50), rng.randint(0, 20))
+         for i in range(1, n + 1)),
+    )
+    # 글 3개 중 1개에 이미지 2장
+    conn.executemany(
+        "INSERT INTO post_images (post_id, image_path) VALUES (?, ?)",
+        ((i, f"{i}_{k}.jpg") for i in range(1, n + 1, 3) for k in range(2)),
+    )
+    conn.commit()
+    conn.close()
+
+
+def _join_page(before_id):
+    conn = db.get_conn()
+    rows = conn.execute(JOIN_SQL, (before_id, PAGE + 1)).fetchall()
+    conn.close()
+    return rows
+
+
+def run(sizes) -> None:
+    rows = []
+    for n in sizes:
+        use_temp_db()
+        seed_users(USERS)
+
+        started = time.perf_counter()
+        _seed(n)
+        seed_sec = time.perf_counter() - started
+
+        for label, before_id in (("first", None), ("middle", n // 2)):
+            join = time_calls(lambda: _join_page(before_id), REPEAT)
+            feed = time_calls(lambda: get_posts(PAGE, before_id), REPEAT)
+            rows.append({
+                "posts": n,
+                "seed_s": round(seed_sec, 1),
+                "page": label,
+                "join_median_us": join["median_us"],
+                "join_p95_us": join["p95_us"],
+                "feed_median_us": feed["median_us"],
+                "feed_p95_us": feed["p95_us"],
+            })
+
+    print_table(f"게시글 목록 {PAGE}개 지연시간 (join vs post_feed)", rows)
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:]]
+    run(args or SIZES)
@@ -0,0 +1,107 @@
+# bench/bench_like_buffer.py
+"""
+인기 글 몇 개에 좋아요가 몰릴 때 (연타 포함) SQLite 쓰기량 비교:
+  direct : 클릭마다 post_likes INSERT/DELETE + posts UPDATE 커밋
+  buffer : LIKE_BUFFER 로 최종 상태만 모아서 FLUSH_SEC 마다 한 트랜잭션
+
+    cd dangguide_flaskserver
+    python -m bench.bench_like_buffer              # 클릭 20k, 100k
+    python -m bench.bench_like_buffer 50000        # 원하는 클릭 수만
+"""
+
+import random
+import sys
+import time
+
+import db
+from bench._common import use_temp_db, seed_users, print_table
+from dao import board_dao, like_buffer as lb
+
+CLICKS = [20_000, 100_000]
+USERS = 2_000
+HOT_POSTS = 3
+FLUSH_SEC = 0.5
+DOUBLE_TAP_RATE = 0.3  # 클릭의 30% 는 바로 한 번 더 누름 (취소)
+
+
+def _seed_posts() -> None:
+    conn = db.get_conn()
+    conn.executemany(
+        "INSERT INTO posts (id, user_id, title, content) VALUES (?, 1, 'hot', 'post')",
+        ((i,) for i in range(1, HOT_POSTS + 1)),
+    )
+    conn.commit()
+    conn.close()
+
+
+def _clicks(n: int):
+    rnd = random.Random(42)
+    out = []
+    while len(out) < n:
+        click = (rnd.randint(1, HOT_POSTS), rnd.randint(1, USERS))
+        out.append(click)
+        if rnd.random() < DOUBLE_TAP_RATE:
+            out.append(click)
+    return out[:n]
+
+
+def _db_state():
+    conn = db.get_conn()
+    rows = conn.execute(
+        """
+        SELECT p.id, p.like_count, (SELECT COUNT(*) FROM post_likes l WHERE l.post_id = p.id) AS actual
+        FROM posts p ORDER BY p.id
+        """
+    ).fetchall()
+    conn.close()
+    return [tuple(r) for r in rows]
+
+
+def _run_mode(mode: str, clicks) -> dict:
+    use_temp_db()
+    seed_users(USERS)
+    _seed_posts()
+
+    buffer = lb.LikeBuffer()
+    lb.like_buffer = board_dao.like_buffer = buffer
+    board_dao.LIKE_BUFFER = mode == "buffer"
+    if mode == "buffer":
+        lb.start_like_flusher(FLUSH_SEC)
+
+    started = time.perf_counter()
+    for post_id, user_id in clicks:
+        board_dao.toggle_like(post_id, user_id)
+    click_sec = time.perf_counter() - started
+
+    if mode == "buffer":
+        lb.shutdown()
+    board_dao.LIKE_BUFFER = False
+
+    stats = buffer.stats()
+    # direct: 클릭 1회 = 트랜잭션 1개, buffer: 반영 1회 = 트랜잭션 1개
+    transactions = len(clicks) if mode == "direct" else stats["flushes"]
+    rows = len(clicks) if mode == "direct" else stats["rows_written"]
+    state = _db_state()
+    return {
+        "clicks": len(clicks),
+        "mode": mode,
+        "clicks_per_s": round(len(clicks) / click_sec),
+        "db_transactions": transactions,
+        "like_rows_written": rows,
+        "counters_ok": all(like_count == actual for _, like_count, actual in state),
+        "like_counts": "/".join(str(like_count) for _, like_count, _ in state),
+    }
+
+
+def run(sizes) -> None:
+    rows = []
+    for n in sizes:
+        clicks = _clicks(n)
+        for mode in ("direct", "buffer"):
+            rows.append(_run_mode(mode, clicks))
+    print_table(f"좋아요 몰림 (글 {HOT_POSTS}개, 사용자 {USERS}명, 연타 {int(DOUBLE_TAP_RATE * 100)}%, 반영 {FLUSH_SEC}s)", rows)
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:]]
+    run(args or CLICKS)
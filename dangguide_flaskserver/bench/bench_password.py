@@ -0,0 +1,97 @@
+# bench/bench_password.py
+"""
+비밀번호 해시/로그인 처리량.
+  1) scrypt 비용 파라미터(n)별 KDF 1회 시간, 코어당 초당 로그인 수
+  2) validate_login 을 동시 클라이언트 여러 개로 호출했을 때 초당 로그인 수 (워커 풀 경유)
+  3) 시도 제한에 걸린 요청의 거절 비용 (KDF 없음)
+
+    cd dangguide_flaskserver
+    python -m bench.bench_password
+    PASSWORD_WORKERS=4 python -m bench.bench_password
+"""
+
+import os
+import threading
+import time
+
+import db
+from bench._common import use_temp_db, time_calls, print_table
+from dao import passwords
+from dao.passwords import LoginThrottle, _scrypt, hash_password
+from dao.user_dao import validate_login
+
+COST_N = [2 ** 12, 2 ** 14, 2 ** 15]
+CLIENTS = [1, 4, 16]
+LOGINS_PER_CLIENT = 8
+USERS = 50
+
+
+def _bench_kdf() -> None:
+    rows = []
+    for n in COST_N:
+        stats = time_calls(lambda: _scrypt("correct horse", b"s" * 16, n, passwords.SCRYPT_R, passwords.SCRYPT_P), 10)
+        rows.append({
+            "n": n,
+            "r": passwords.SCRYPT_R,
+            "p": passwords.SCRYPT_P,
+            "mem_mb": round(128 * n * passwords.SCRYPT_R / 1024 / 1024, 1),
+            "kdf_median_ms": round(stats["median_us"] / 1000, 1),
+            "logins_per_sec_per_core": round(1_000_000 / stats["median_us"], 1),
+        })
+    print_table("scrypt KDF 1회 (단일 스레드)", rows)
+
+
+def _seed_hashed_users() -> None:
+    conn = db.get_conn()
+    conn.executemany(
+        "INSERT INTO users (id, username, password) VALUES (?, ?, ?)",
+        ((i, f"bench_user_{i}", hash_password(f"pw{i}")) for i in range(1, USERS + 1)),
+    )
+    conn.commit()
+    conn.close()
+
+
+def _bench_login() -> None:
+    use_temp_db()
+    _seed_hashed_users()
+
+    rows = []
+    for clients in CLIENTS:
+        def client(k: int) -> None:
+            for j in range(LOGINS_PER_CLIENT):
+                uid = (k * LOGINS_PER_CLIENT + j) % USERS + 1
+                assert validate_login(f"bench_user_{uid}", f"pw{uid}") is not None
+
+        threads = [threading.Thread(target=client, args=(k,)) for k in range(clients)]
+        started = time.perf_counter()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        elapsed = time.perf_counter() - started
+
+        total = clients * LOGINS_PER_CLIENT
+        rows.append({
+            "clients": clients,
+            "workers": passwords.PASSWORD_WORKERS,
+            "cpus": os.cpu_count(),
+            "logins": total,
+            "logins_per_sec": round(total / elapsed, 1),
+            "per_worker": round(total / elapsed / passwords.PASSWORD_WORKERS, 1),
+        })
+    print_table(f"validate_login 처리량 (n={passwords.SCRYPT_N})", rows)
+
+
+def _bench_throttle() -> None:
+    throttle = LoginThrottle(burst=5, per_minute=5)
+    for _ in range(5):
+        throttle.acquire("attacker")
+    stats = time_calls(lambda: throttle.acquire("attacker"), 10_000)
+    print_table("시도 제한 거절 (KDF 이전)", [{"rejected": throttle.stats()["rejected"], **stats}])
+
+
+if __name__ == "__main__":
+    _bench_kdf()
+    _bench_login()
+    _bench_throttle()
+    passwords.shutdown()
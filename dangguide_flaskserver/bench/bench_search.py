@@ -0,0 +1,95 @@
+# bench/bench_search.py
+"""
+게시글 N개(댓글은 글당 1개)가 있을 때 search_posts 1회 지연시간 측정.
+3글자 이상은 FTS5 색인, 2글자 이하는 LIKE 스캔 경로 (최신 SEARCH_LIKE_SCAN_POSTS 개 글까지).
+2글자 드문/없는 단어는 LIKE 경로의 최악의 경우 (스캔 범위를 끝까지 훑음).
+단어장이 작아서 "흔함" 단어는 대부분의 글에 들어가는 최악의 경우
+(일치 행 전부 bm25 계산) → 드문 단어 지연시간이 일반적인 검색에 가깝다.
+
+    cd dangguide_flaskserver
+    python -m bench.bench_search            # 100k
+    python -m bench.bench_search 10000 100000 300000
+"""
+
+import random
+import sys
+import time
+
+import db
+from bench._common import use_temp_db, seed_users, time_calls, print_table
+from dao.search_dao import SEARCH_LIKE_SCAN_POSTS, search_posts
+
+SIZES = [100_000]
+REPEAT = 200
+USERS = 1_000
+
+WORDS = [
+    "강아지", "산책", "사료", "간식", "리트리버", "푸들", "말티즈", "진돗개",
+    "공원", "병원", "예방접종", "미용", "훈련", "배변", "장난감", "하네스",
+    "목욕", "발톱", "털갈이", "분리불안", "입양", "중성화", "슬개골", "산책로",
+]
+
+QUERIES = [
+    ("fts 1단어 (흔함)", "강아지"),
+    ("fts 1단어 (드묾)", "블루베리"),
+    ("fts 2단어", "리트리버 산책로"),
+    ("fts+like 혼합", "리트리버 미용"),
+    ("like 2글자", "발톱"),
+    ("like 2글자 (드묾)", "귀지"),
+    ("like 2글자 (없음)", "냥이"),
+]
+
+
+def _text(rng: random.Random, n: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(n))
+
+
+def _seed(n: int) -> None:
+    rng = random.Random(n)
+    conn = db.get_conn()
+    conn.executemany(
+        "INSERT INTO posts (id, user_id, title, content) VALUES (?, ?, ?, ?)",
+        ((i, rng.randint(1, USERS), _text(rng, 4), _text(rng, 30)) for i in range(1, n + 1)),
+    )
+    conn.executemany(
+        "INSERT INTO comments (post_id, user_id, content) VALUES (?, ?, ?)",
+        ((i, rng.randint(1, USERS), _text(rng, 8)) for i in range(1, n + 1)),
+    )
+    # 드문 단어는 글 몇 개에만
+    conn.executemany(
+        "UPDATE posts SET content = content || ' 블루베리 귀지' WHERE id = ?",
+        ((i,) for i in range(1, n + 1, max(n // 20, 1))),
+    )
+    conn.commit()
+    conn.close()
+
+
+def run(sizes) -> None:
+    print(f"SEARCH_LIKE_SCAN_POSTS={SEARCH_LIKE_SCAN_POSTS}")
+    rows = []
+    for n in sizes:
+        use_temp_db()
+        seed_users(USERS)
+
+        started = time.perf_counter()
+        _seed(n)
+        seed_sec = time.perf_counter() - started
+
+        for label, q in QUERIES:
+            first = time_calls(lambda: search_posts(q, 20, 0), REPEAT)
+            deep = time_calls(lambda: search_posts(q, 20, 200), REPEAT // 4)
+            rows.append({
+                "posts": n,
+                "seed_s": round(seed_sec, 1),
+                "query": label,
+                "page1_median_us": first["median_us"],
+                "page1_p95_us": first["p95_us"],
+                "offset200_median_us": deep["median_us"],
+            })
+
+    print_table("search_posts 지연시간 (게시글 수별)", rows)
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:]]
+    run(args or SIZES)
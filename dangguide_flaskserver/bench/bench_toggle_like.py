@@ -0,0 +1,68 @@
+# bench/bench_toggle_like.py
+"""
+한 게시글에 좋아요가 이미 N개 쌓여 있을 때 toggle_like 1회 지연시간 측정.
++1/-1 카운터 갱신이면 N 과 무관하게 평평해야 한다.
+
+    cd dangguide_flaskserver
+    python -m bench.bench_toggle_like            # 10, 10k, 1M
+    python -m bench.bench_toggle_like 10 10000   # 원하는 크기만
+"""
+
+import sys
+import time
+
+import db
+from bench._common import use_temp_db, seed_users, time_calls, print_table
+from dao.board_dao import toggle_like
+
+SIZES = [10, 10_000, 1_000_000]
+REPEAT = 500
+
+
+def _seed_likes(post_id: int, n: int) -> None:
+    conn = db.get_conn()
+    conn.executemany(
+        "INSERT INTO post_likes (post_id, user_id) VALUES (?, ?)",
+        ((post_id, uid) for uid in range(1, n + 1)),
+    )
+    conn.execute("UPDATE posts SET like_count = ? WHERE id = ?", (n, post_id))
+    conn.commit()
+    conn.close()
+
+
+def run(sizes) -> None:
+    rows = []
+    for n in sizes:
+        use_temp_db()
+        # 기존 좋아요 N명 + 측정용 유저 REPEAT명
+        seed_users(n + REPEAT)
+        conn = db.get_conn()
+        conn.execute("INSERT INTO posts (id, user_id, title, content) VALUES (1, 1, 'hot', 'post')")
+        conn.commit()
+        conn.close()
+
+        started = time.perf_counter()
+        _seed_likes(1, n)
+        seed_sec = time.perf_counter() - started
+
+        # 아직 안 누른 유저들이 번갈아 ON → OFF (매번 새 (post, user) 조합)
+        uids = iter(range(n + 1, n + REPEAT + 1))
+        on = time_calls(lambda: toggle_like(1, next(uids)), REPEAT)
+        uids = iter(range(n + 1, n + REPEAT + 1))
+        off = time_calls(lambda: toggle_like(1, next(uids)), REPEAT)
+
+        rows.append({
+            "likes_on_post": n,
+            "seed_s": round(seed_sec, 2),
+            "like_on_median_us": on["median_us"],
+            "like_on_p95_us": on["p95_us"],
+            "like_off_median_us": off["median_us"],
+            "like_off_p95_us": off["p95_us"],
+        })
+
+    print_table("toggle_like 지연시간 (게시글 1개에 쌓인 좋아요 수별)", rows)
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:]]
+    run(args or SIZES)
@@ -0,0 +1,123 @@
+# bench/bench_write_queue.py
+"""
+여러 스레드가 동시에 좋아요/댓글을 쓸 때 처리량 비교:
+  direct : 스레드마다 자기 커넥션으로 커밋 (기존 방식, 쓰기 락 경쟁)
+  queue  : DB_WRITE_QUEUE 단일 writer 스레드가 묶어서 커밋 (group commit)
+
+    cd dangguide_flaskserver
+    python -m bench.bench_write_queue              # 스레드 4, 16, 32
+    python -m bench.bench_write_queue 8 64         # 원하는 스레드 수만
+"""
+
+import statistics
+import sys
+import threading
+import time
+
+import db
+from bench._common import use_temp_db, seed_users, print_table
+from dao.board_dao import create_comment, toggle_like
+
+THREADS = [4, 16, 32]
+OPS_PER_THREAD = 200
+HOT_POSTS = 5  # 몇 개 글에 요청이 몰리는 상황
+
+
+def _seed_posts() -> None:
+    conn = db.get_conn()
+    conn.executemany(
+        "INSERT INTO posts (id, user_id, title, content) VALUES (?, 1, 'hot', 'post')",
+        ((i,) for i in range(1, HOT_POSTS + 1)),
+    )
+    conn.commit()
+    conn.close()
+
+
+def _burst(threads: int) -> dict:
+    latencies = []
+    errors = []
+    lock = threading.Lock()
+    start = threading.Barrier(threads)
+
+    def worker(tid: int) -> None:
+        user_id = tid + 1
+        mine, failed = [], []
+        start.wait()
+        for i in range(OPS_PER_THREAD):
+            post_id = i % HOT_POSTS + 1
+            began = time.perf_counter()
+            try:
+                # 좋아요 토글 2번당 댓글 1번
+                if i % 3 == 2:
+                    create_comment(user_id, post_id, f"burst {tid}-{i}")
+                else:
+                    toggle_like(post_id, user_id)
+            except Exception as e:
+                failed.append(type(e).__name__)
+            mine.append((time.perf_counter() - began) * 1000)
+        with lock:
+            latencies.extend(mine)
+            errors.extend(failed)
+
+    pool = [threading.Thread(target=worker, args=(t,)) for t in range(threads)]
+    started = time.perf_counter()
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+    wall = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "ops_per_s": round(len(latencies) / wall),
+        "median_ms": round(statistics.median(latencies), 2),
+        "p95_ms": round(latencies[int(len(latencies) * 0.95) - 1], 2),
+        "max_ms": round(latencies[-1], 2),
+        "errors": len(errors),
+    }
+
+
+def _check_counters() -> bool:
+    """좋아요/댓글 카운터가 실제 행 수와 맞는지 (묶어서 커밋해도 정합성 유지)"""
+    conn = db.get_conn()
+    bad = conn.execute(
+        """
+        SELECT COUNT(*) FROM posts p
+        WHERE p.like_count != (SELECT COUNT(*) FROM post_likes l WHERE l.post_id = p.id)
+           OR p.comment_count != (SELECT COUNT(*) FROM comments c WHERE c.post_id = p.id)
+        """
+    ).fetchone()[0]
+    conn.close()
+    return bad == 0
+
+
+def run(thread_counts) -> None:
+    rows = []
+    for threads in thread_counts:
+        for mode in ("direct", "queue"):
+            use_temp_db()
+            db.pool.max_size = max(db.DB_POOL_SIZE, threads)
+            seed_users(threads)
+            _seed_posts()
+
+            db.DB_WRITE_QUEUE = mode == "queue"
+            result = _burst(threads)
+            db.write_queue.stop()
+            stats = db.write_queue_stats()
+            db.DB_WRITE_QUEUE = False
+
+            rows.append({
+                "threads": threads,
+                "mode": mode,
+                **result,
+                "batch_avg": stats["batch_avg"] if mode == "queue" else "-",
+                "counters_ok": _check_counters(),
+            })
+            db.write_queue = db.WriteQueue()  # 다음 측정용 통계 초기화
+
+    print_table(f"동시 쓰기 처리량 (스레드당 {OPS_PER_THREAD}회, 좋아요:댓글 = 2:1)", rows)
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:]]
+    run(args or THREADS)
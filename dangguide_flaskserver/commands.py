@@ -0,0 +1,79 @@
+# commands.py
+"""
+운영/유지보수용 Flask CLI 명령.
+    flask --app main reconcile_counters
+    flask --app main migration_status
+    flask --app main gc_blobs
+    flask --app main reap_accounts
+    flask --app main rebuild_feed
+    flask --app main prune_tokens
+"""
+
+import time
+
+import click
+from flask import Flask
+
+from db import get_conn
+from migrations import current_version, migration_history
+from dao.board_dao import reconcile_counters, rebuild_feed
+from dao.blob_store import gc_unreferenced_blobs
+from dao.account_reaper import reap_pending
+from dao.token_dao import prune_revocations
+
+
+@click.command("reconcile_counters")
+def reconcile_counters_command():
+    """posts.like_count / comment_count 를 실제 개수로 일괄 보정"""
+    fixed = reconcile_counters()
+    click.echo(f"✅ 카운터 보정 완료: {fixed}개 게시글 수정")
+
+
+@click.command("migration_status")
+def migration_status_command():
+    """현재 스키마 버전과 마이그레이션별 적용 시각/소요 시간 출력"""
+    conn = get_conn()
+    version = current_version(conn)
+    history = migration_history(conn)
+    conn.close()
+
+    click.echo(f"schema version: {version}")
+    for m in history:
+        click.echo(f"  v{m['version']:<3} {m['name']:<40} {m['applied_at']}  {m['duration_ms']:.1f}ms")
+
+
+@click.command("gc_blobs")
+def gc_blobs_command():
+    """어떤 게시글도 참조하지 않는 이미지 blob(파일 포함) 삭제"""
+    removed = gc_unreferenced_blobs()
+    click.echo(f"🧹 참조 없는 이미지 {removed}개 삭제")
+
+
+@click.command("reap_accounts")
+def reap_accounts_command():
+    """탈퇴 표시된 계정의 데이터를 지금 바로 정리 (서버 리퍼와 같은 배치 방식)"""
+    done = reap_pending()
+    click.echo(f"🧹 탈퇴 계정 {done}개 정리")
+
+
+@click.command("rebuild_feed")
+def rebuild_feed_command():
+    """게시글 목록용 post_feed 테이블을 posts/users/post_images 기준으로 전체 재생성"""
+    rows = rebuild_feed()
+    click.echo(f"✅ post_feed 재생성 완료: {rows}개 게시글")
+
+
+@click.command("prune_tokens")
+def prune_tokens_command():
+    """만료 시각이 지난 토큰 폐기 기록 삭제 (cron 등으로 주기 실행)"""
+    removed = prune_revocations(int(time.time()))
+    click.echo(f"🧹 만료된 토큰 폐기 기록 {removed}개 삭제")
+
+
+def register_commands(app: Flask) -> None:
+    app.cli.add_command(reconcile_counters_command)
+    app.cli.add_command(migration_status_command)
+    app.cli.add_command(gc_blobs_command)
+    app.cli.add_command(reap_accounts_command)
+    app.cli.add_command(rebuild_feed_command)
+    app.cli.add_command(prune_tokens_command)
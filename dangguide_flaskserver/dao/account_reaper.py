@@ -0,0 +1,196 @@
+"""
+탈퇴 계정 정리 (백그라운드).
+탈퇴 요청은 users.deleted_at 만 찍고 바로 응답하고, 여기서 연관 데이터를
+REAPER_BATCH 행씩 짧은 트랜잭션(run_write)으로 지운다. 배치 사이에는 커밋 후 잠깐 쉬어서
+다른 요청이 쓰기 락을 잡을 수 있게 한다.
+
+순서 (계정 하나당):
+  1) 이 사용자가 누른 좋아요 → 해당 글 like_count 감소
+  2) 이 사용자가 쓴 댓글 → 해당 글 comment_count 감소
+  3) 이 사용자의 게시글: 이미지/댓글/좋아요 → 게시글 (이미지 blob refcount 는 트리거가 감소)
+  4) 프로필, users 행
+  5) 참조가 없어진 이미지 파일 삭제 (gc_unreferenced_blobs)
+
+글 삭제 후의 이미지 파일 정리(request_blob_gc)도 같은 스레드에서 처리한다.
+"""
+
+import os
+import threading
+import time
+import traceback
+from collections import Counter
+from typing import Dict, List, Optional
+
+from db import get_conn, run_write
+from dao.blob_store import gc_unreferenced_blobs
+from dao.username_index import username_index
+
+REAPER_BATCH = int(os.getenv("REAPER_BATCH", "500"))
+REAPER_PAUSE_SEC = float(os.getenv("REAPER_PAUSE_SEC", "0.05"))
+# 깨우는 신호가 없어도 남은 계정이 있는지 확인하는 주기 (재시작 후 이어서 처리)
+REAPER_INTERVAL_SEC = float(os.getenv("REAPER_INTERVAL_SEC", "60"))
+# 게시글은 자식 행이 많으므로 배치를 더 작게
+POSTS_PER_BATCH = max(1, REAPER_BATCH // 50)
+
+
+def _execute(cur, sql: str, params: tuple) -> List:
+    return cur.execute(sql, params).fetchall()
+
+
+def _batch(sql: str, params: tuple) -> List:
+    """run_write 한 번 = 짧은 트랜잭션 하나 (DB_WRITE_QUEUE=1 이면 다른 요청의 쓰기와 같이 커밋)"""
+    rows = run_write(_execute, sql, params)
+    time.sleep(REAPER_PAUSE_SEC)
+    return rows
+
+
+def _delete_counted_batch(cur, user_id: int, table: str, counter: str) -> List[int]:
+    post_ids = [
+        r[0] for r in cur.execute(
+            f"""
+            DELETE FROM {table}
+            WHERE id IN (SELECT id FROM {table} WHERE user_id = ? LIMIT ?)
+            RETURNING post_id
+            """,
+            (user_id, REAPER_BATCH),
+        ).fetchall()
+    ]
+    cur.executemany(
+        f"UPDATE posts SET {counter} = MAX(COALESCE({counter}, 0) - ?, 0) WHERE id = ?",
+        [(n, pid) for pid, n in Counter(post_ids).items()],
+    )
+    return post_ids
+
+
+def _delete_with_counter(user_id: int, table: str, counter: str) -> int:
+    """사용자의 좋아요/댓글을 배치로 지우면서 해당 글 카운터를 같은 트랜잭션에서 감소"""
+    removed = 0
+    while True:
+        post_ids = run_write(_delete_counted_batch, user_id, table, counter)
+        removed += len(post_ids)
+        if len(post_ids) < REAPER_BATCH:
+            return removed
+        time.sleep(REAPER_PAUSE_SEC)
+
+
+def _delete_children(table: str, post_ids: List[int]) -> None:
+    marks = ",".join("?" * len(post_ids))
+    while True:
+        rows = _batch(
+            f"""
+            DELETE FROM {table}
+            WHERE id IN (SELECT id FROM {table} WHERE post_id IN ({marks}) LIMIT ?)
+            RETURNING id
+            """,
+            (*post_ids, REAPER_BATCH),
+        )
+        if len(rows) < REAPER_BATCH:
+            return
+
+
+def _delete_posts(user_id: int) -> int:
+    removed = 0
+    while True:
+        conn = get_conn()
+        cur = conn.cursor()
+        cur.execute("SELECT id FROM posts WHERE user_id = ? ORDER BY id LIMIT ?", (user_id, POSTS_PER_BATCH))
+        post_ids = [r[0] for r in cur.fetchall()]
+        conn.close()
+        if not post_ids:
+            return removed
+
+        for table in ("post_images", "comments", "post_likes"):
+            _delete_children(table, post_ids)
+
+        marks = ",".join("?" * len(post_ids))
+        _batch(f"DELETE FROM posts WHERE id IN ({marks}) RETURNING id", tuple(post_ids))
+        removed += len(post_ids)
+
+
+def reap_account(user_id: int) -> Dict[str, int]:
+    """탈퇴 표시된 계정 하나의 연관 데이터와 users 행 삭제"""
+    stats = {
+        "likes": _delete_with_counter(user_id, "post_likes", "like_count"),
+        "comments": _delete_with_counter(user_id, "comments", "comment_count"),
+        "posts": _delete_posts(user_id),
+    }
+
+    _batch("DELETE FROM user_profiles WHERE user_id = ? RETURNING id", (user_id,))
+    # 지운 행의 username 을 같이 받음 (읽기만 하려고 쓰기 트랜잭션을 따로 잡지 않음)
+    rows = _batch("DELETE FROM users WHERE id = ? AND deleted_at IS NOT NULL RETURNING username", (user_id,))
+    if rows:
+        # 아이디 재사용 가능 (Bloom 필터에서는 못 지우므로 DB 확인으로 넘어감)
+        username_index.discard(rows[0][0])
+
+    stats["blobs"] = gc_unreferenced_blobs()
+    return stats
+
+
+def pending_accounts() -> List[int]:
+    conn = get_conn()
+    cur = conn.cursor()
+    cur.execute("SELECT id FROM users WHERE deleted_at IS NOT NULL ORDER BY deleted_at")
+    ids = [r[0] for r in cur.fetchall()]
+    conn.close()
+    return ids
+
+
+def reap_pending() -> int:
+    """대기 중인 탈퇴 계정 전부 처리. return: 처리한 계정 수"""
+    done = 0
+    for user_id in pending_accounts():
+        started = time.time()
+        stats = reap_account(user_id)
+        print(f"🧹 탈퇴 계정 정리 user_id={user_id} {stats} ({time.time() - started:.1f}s)")
+        done += 1
+    return done
+
+
+# =========================
+# 백그라운드 스레드
+# =========================
+_wake = threading.Event()
+_gc_requested = threading.Event()
+_thread: Optional[threading.Thread] = None
+_thread_lock = threading.Lock()
+
+
+def _loop() -> None:
+    while True:
+        try:
+            reap_pending()
+        except Exception as e:
+            traceback.print_exc()
+            print(f"❌ 탈퇴 계정 정리 실패 (다음 주기에 재시도): {e}")
+        if _gc_requested.is_set():
+            _gc_requested.clear()
+            try:
+                gc_unreferenced_blobs()
+            except Exception as e:
+                traceback.print_exc()
+                print(f"❌ 이미지 파일 정리 실패 (다음 요청 때 재시도): {e}")
+                _gc_requested.set()
+        _wake.wait(REAPER_INTERVAL_SEC)
+        _wake.clear()
+
+
+def start_reaper() -> None:
+    global _thread
+    with _thread_lock:
+        if _thread is not None and _thread.is_alive():
+            return
+        # 시작 시 한 번: 지난 실행/마이그레이션(v12 등)에서 참조가 없어진 이미지 파일 정리
+        _gc_requested.set()
+        _thread = threading.Thread(target=_loop, name="account-reaper", daemon=True)
+        _thread.start()
+
+
+def wake_reaper() -> None:
+    """탈퇴 요청 직후 호출 → 주기를 기다리지 않고 바로 정리 시작"""
+    _wake.set()
+
+
+def request_blob_gc() -> None:
+    """글 삭제 등으로 참조가 없어졌을 수 있는 이미지 파일 정리를 이 스레드에 맡김 (요청은 기다리지 않음)"""
+    _gc_requested.set()
+    _wake.set()
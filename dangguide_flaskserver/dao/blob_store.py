@@ -0,0 +1,148 @@
+"""
+게시글 이미지 내용 주소(content-addressed) 저장소.
+
+- 업로드를 청크 단위로 임시 파일에 쓰면서 sha256 을 같이 계산
+- 최종 경로는 해시로 결정: static/post_images/ab/cd/<hash>.<ext>
+- blobs 테이블의 refcount 는 post_images 트리거가 관리하고,
+  참조가 0 이 된 blob 은 gc_unreferenced_blobs() 가 파일까지 지운다.
+"""
+
+import hashlib
+import os
+import uuid
+from pathlib import Path
+from typing import BinaryIO, List, Tuple
+
+from db import get_conn, run_write
+
+BASE_DIR = Path(__file__).resolve().parent.parent   # dangguide_flaskserver/
+STORE_ROOT = BASE_DIR / "static" / "post_images"
+TMP_DIR = STORE_ROOT / ".tmp"
+
+CHUNK_SIZE = 64 * 1024
+VARIANT_NAMES = ("thumb", "medium")
+
+
+class ImageTooLarge(Exception):
+    pass
+
+
+class StagedBlob:
+    """해시 계산까지 끝나고 아직 최종 위치로 옮기기 전인 업로드"""
+
+    def __init__(self, tmp_path: Path, blob_hash: str, rel_path: str, size: int):
+        self.tmp_path = tmp_path
+        self.hash = blob_hash
+        self.rel_path = rel_path
+        self.size = size
+
+
+def blob_rel_path(blob_hash: str, ext: str) -> str:
+    # 한 디렉터리에 파일이 너무 많아지지 않도록 2단계 샤딩
+    return f"{blob_hash[:2]}/{blob_hash[2:4]}/{blob_hash}.{ext}"
+
+
+def variant_rel_path(rel_path: str, name: str) -> str:
+    """리사이즈 파일 경로: ab/cd/<hash>.png → ab/cd/<hash>_thumb.jpg"""
+    p = Path(rel_path)
+    return str(p.with_name(f"{p.stem}_{name}.jpg").as_posix())
+
+
+def stage_upload(stream: BinaryIO, ext: str, max_bytes: int) -> StagedBlob:
+    """
+    스트림을 고정 크기 청크로 임시 파일에 쓰면서 해시 계산.
+    max_bytes 를 넘으면 임시 파일을 지우고 ImageTooLarge.
+    (업로드 요청의 stream 은 Werkzeug 가 이미 받아 둔 것 → 요청 본문 상한은 라우트에서 먼저 제한)
+    """
+    TMP_DIR.mkdir(parents=True, exist_ok=True)
+    tmp_path = TMP_DIR / uuid.uuid4().hex
+    digest = hashlib.sha256()
+    size = 0
+
+    try:
+        with open(tmp_path, "wb") as out:
+            while True:
+                chunk = stream.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > max_bytes:
+                    raise ImageTooLarge()
+                digest.update(chunk)
+                out.write(chunk)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+    blob_hash = digest.hexdigest()
+    return StagedBlob(tmp_path, blob_hash, blob_rel_path(blob_hash, ext), size)
+
+
+def discard_staged(staged: List[StagedBlob]) -> None:
+    for s in staged:
+        s.tmp_path.unlink(missing_ok=True)
+
+
+def publish_staged(staged: List[StagedBlob], rel_paths: List[str]) -> None:
+    """
+    DB 커밋 후 호출. 이미 같은 내용의 파일이 있으면 임시 파일만 버린다 (중복 제거).
+    rel_paths 는 DB 에 기록된 실제 경로 (같은 해시가 다른 확장자로 먼저 저장됐을 수 있음)
+    """
+    for s, rel_path in zip(staged, rel_paths):
+        final = STORE_ROOT / rel_path
+        if final.exists():
+            s.tmp_path.unlink(missing_ok=True)
+            continue
+        final.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(s.tmp_path, final)
+
+
+# =========================
+# 참조 없는 blob 정리
+# =========================
+def gc_unreferenced_blobs() -> int:
+    """
+    refcount 가 0 이하인 blob 행과 파일(리사이즈 포함)을 지운다.
+    return: 지운 blob 수
+
+    파일을 먼저 .gc 로 옮겨 두고 행 삭제가 성공했을 때만 지운다.
+    그 사이 같은 내용이 다시 업로드되면 행 삭제가 실패하므로 파일을 되돌린다.
+    (내용 주소라서 되돌린 파일과 새 업로드 파일은 내용이 같다)
+    """
+    conn = get_conn()
+    cur = conn.cursor()
+    cur.execute("SELECT hash, path FROM blobs WHERE refcount <= 0")
+    candidates: List[Tuple[str, str]] = [(r["hash"], r["path"]) for r in cur.fetchall()]
+    conn.close()
+
+    removed = 0
+    for blob_hash, rel_path in candidates:
+        final = STORE_ROOT / rel_path
+        parked = final.with_name(final.name + ".gc")
+        try:
+            os.replace(final, parked)
+        except FileNotFoundError:
+            parked = None
+
+        deleted = False
+        try:
+            deleted = run_write(_delete_blob_row, blob_hash)
+        finally:
+            # 다시 참조됐거나 삭제 자체가 실패했으면 파일 되돌림
+            if not deleted and parked is not None:
+                os.replace(parked, final)
+        if not deleted:
+            continue
+
+        if parked is not None:
+            parked.unlink(missing_ok=True)
+        for name in VARIANT_NAMES:
+            (STORE_ROOT / variant_rel_path(rel_path, name)).unlink(missing_ok=True)
+        removed += 1
+
+    return removed
+
+
+def _delete_blob_row(cur, blob_hash: str) -> bool:
+    cur.execute("DELETE FROM blobs WHERE hash = ? AND refcount <= 0", (blob_hash,))
+    return cur.rowcount == 1
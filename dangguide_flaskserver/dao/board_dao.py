@@ -1,41 +1,43 @@
 # dangguide_flaskserver/dao/board_dao.py
 
-from typing import List, Dict, Optional
-from db import get_conn
+from typing import List, Dict, Optional, Tuple
+from db import get_conn, run_write
+from dao.like_buffer import LIKE_BUFFER, like_buffer
+from dao.user_dao import InactiveUser, ensure_active_user
 
 
 # =========================
-# 게시글 목록
+# 게시글 목록 (커서 페이지네이션)
 # =========================
-def get_posts() -> List[Dict]:
+def get_posts(limit: int = 20, before_id: Optional[int] = None) -> Tuple[List[Dict], Optional[int]]:
+    """
+    id 내림차순으로 before_id 보다 작은 글을 limit 개까지 반환.
+    return: (posts, 다음 페이지용 before_id 또는 None)
+    """
     conn = get_conn()
     cur = conn.cursor()
 
+    # post_feed 에 작성자명/카운터/썸네일이 미리 합쳐져 있음 (트리거로 유지, migrations v11)
+    # → 조인 없이 PK 범위 스캔 한 번으로 한 페이지(+1개: 다음 페이지 존재 여부)
     cur.execute(
         """
-        SELECT
-            p.id,
-            p.title,
-            p.created_at,
-            u.username AS author_name,
-            COALESCE(p.like_count, 0)   AS likes,
-            COALESCE(p.comment_count, 0) AS comments,
-            (
-                SELECT image_path
-                FROM post_images
-                WHERE post_id = p.id
-                ORDER BY id ASC
-                LIMIT 1
-            ) AS thumbnail
-        FROM posts p
-        JOIN users u ON u.id = p.user_id
-        ORDER BY p.id DESC
-        """
+        SELECT id, title, created_at, author_name, likes, comments, thumbnail
+        FROM post_feed
+        WHERE id < COALESCE(?, 9223372036854775807)  -- OR 로 쓰면 rowid 범위 탐색을 못 함
+        ORDER BY id DESC
+        LIMIT ?
+        """,
+        (before_id, limit + 1),
     )
 
     rows = cur.fetchall()
     conn.close()
 
+    next_before_id = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_before_id = rows[-1]["id"]
+
     posts: List[Dict] = []
     for r in rows:
         posts.append(
@@ -44,21 +46,50 @@ def get_posts() -> List[Dict]:
                 "title": r["title"],
                 "created_at": r["created_at"],
                 "author_name": r["author_name"],
-                "likes": r["likes"],         # ← Flutter에서 PostItem.likes 로 쓰기
+                "likes": like_buffer.like_count(r["id"], r["likes"]),  # ← Flutter에서 PostItem.likes 로 쓰기
                 "comments": r["comments"],   # ← Flutter에서 PostItem.comments
                 "thumbnail": r["thumbnail"], # 필요 없으면 빼도 됨
             }
         )
-    return posts
+    return posts, next_before_id
+
+
+def fill_post_feed(cur) -> int:
+    """post_feed 를 posts 기준으로 통째로 다시 채움. return: 채운 행 수"""
+    cur.execute("DELETE FROM post_feed")
+    cur.execute(
+        """
+        INSERT INTO post_feed (id, user_id, title, created_at, author_name, likes, comments, thumbnail)
+        SELECT
+            p.id,
+            p.user_id,
+            p.title,
+            p.created_at,
+            u.username,
+            COALESCE(p.like_count, 0),
+            COALESCE(p.comment_count, 0),
+            (SELECT COALESCE(pi.thumb_path, pi.image_path) FROM post_images pi
+             WHERE pi.post_id = p.id ORDER BY pi.id LIMIT 1)
+        FROM posts p
+        JOIN users u ON u.id = p.user_id
+        """
+    )
+    return cur.rowcount
+
+
+def rebuild_feed() -> int:
+    """트리거 밖에서 데이터를 고쳤을 때 등 post_feed 전체 재생성"""
+    return run_write(fill_post_feed)
 
 
 # =========================
 # 게시글 생성
 # =========================
 def create_post(user_id: int, title: str, content: str) -> Dict:
-    conn = get_conn()
-    cur = conn.cursor()
+    return run_write(_create_post, user_id, title, content)
+
 
+def _create_post(cur, user_id: int, title: str, content: str) -> Dict:
     cur.execute(
         """
         INSERT INTO posts (user_id, title, content)
@@ -67,6 +98,7 @@ def create_post(user_id: int, title: str, content: str) -> Dict:
         (user_id, title, content),
     )
     post_id = cur.lastrowid
+    ensure_active_user(cur, user_id)
 
     cur.execute(
         """
@@ -85,8 +117,6 @@ def create_post(user_id: int, title: str, content: str) -> Dict:
         (post_id,),
     )
     row = cur.fetchone()
-    conn.commit()
-    conn.close()
 
     return {
         "id": row["id"],
@@ -102,9 +132,17 @@ def create_post(user_id: int, title: str, content: str) -> Dict:
 
 
 # =========================
-# 댓글 목록
+# 댓글 목록 (커서 페이지네이션)
 # =========================
-def get_comments(post_id: int) -> List[Dict]:
+# 게시글 상세에 같이 실어 보내는 댓글 수 (나머지는 댓글 목록 API 로)
+COMMENT_PREVIEW_LIMIT = 20
+
+
+def get_comments(post_id: int, after_id: Optional[int] = None, limit: int = 20) -> Tuple[List[Dict], Optional[int]]:
+    """
+    id 오름차순으로 after_id 다음 댓글을 limit 개까지 (comments(post_id, id) 인덱스 범위 스캔).
+    return: (comments, 다음 페이지용 after_id 또는 None)
+    """
     conn = get_conn()
     cur = conn.cursor()
 
@@ -117,14 +155,20 @@ def get_comments(post_id: int) -> List[Dict]:
             u.username AS user_name
         FROM comments c
         JOIN users u ON u.id = c.user_id
-        WHERE c.post_id = ?
+        WHERE c.post_id = ? AND c.id > ?
         ORDER BY c.id ASC
+        LIMIT ?
         """,
-        (post_id,),
+        (post_id, after_id or 0, limit + 1),
     )
     rows = cur.fetchall()
     conn.close()
 
+    next_after_id = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_after_id = rows[-1]["id"]
+
     comments: List[Dict] = []
     for r in rows:
         comments.append(
@@ -135,16 +179,17 @@ def get_comments(post_id: int) -> List[Dict]:
                 "user_name": r["user_name"],
             }
         )
-    return comments
+    return comments, next_after_id
 
 
 # =========================
 # 댓글 생성
 # =========================
 def create_comment(user_id: int, post_id: int, content: str) -> None:
-    conn = get_conn()
-    cur = conn.cursor()
+    run_write(_create_comment, user_id, post_id, content)
 
+
+def _create_comment(cur, user_id: int, post_id: int, content: str) -> None:
     # 댓글 삽입
     cur.execute(
         """
@@ -153,22 +198,18 @@ def create_comment(user_id: int, post_id: int, content: str) -> None:
         """,
         (user_id, post_id, content),
     )
+    ensure_active_user(cur, user_id)
 
-    # 댓글 개수 재계산해서 posts.comment_count에 반영
+    # 댓글 개수 +1 (전체 COUNT(*) 재계산하지 않음)
     cur.execute(
         """
         UPDATE posts
-        SET comment_count = (
-            SELECT COUNT(*) FROM comments WHERE post_id = ?
-        )
+        SET comment_count = COALESCE(comment_count, 0) + 1
         WHERE id = ?
         """,
-        (post_id, post_id),
+        (post_id,),
     )
 
-    conn.commit()
-    conn.close()
-
 
 # =========================
 # 좋아요 토글 (여러 유저 가능)
@@ -177,68 +218,123 @@ def toggle_like(post_id: int, user_id: int) -> bool:
     """
     True  → 이번 요청으로 '좋아요 ON'
     False → 이번 요청으로 '좋아요 OFF'
+
+    좋아요 수는 전체를 다시 세지 않고 +1/-1 만 반영 (글이 인기 많아도 비용 일정)
+    LIKE_BUFFER=1 이면 메모리 버퍼에만 기록하고 dao/like_buffer.py 가 주기적으로 모아서 반영
     """
+    if LIKE_BUFFER:
+        return like_buffer.toggle(post_id, user_id, _is_liked)
+    return run_write(_toggle_like, post_id, user_id)
+
+
+def _is_liked(post_id: int, user_id: int) -> bool:
+    """좋아요 버퍼가 처음 보는 (글, 사용자) 의 DB 상태. 탈퇴/없는 사용자면 InactiveUser"""
     conn = get_conn()
     cur = conn.cursor()
+    cur.execute(
+        """
+        SELECT
+            EXISTS (SELECT 1 FROM users WHERE id = ?1 AND deleted_at IS NULL) AS active,
+            EXISTS (SELECT 1 FROM post_likes WHERE post_id = ?2 AND user_id = ?1) AS liked
+        """,
+        (user_id, post_id),
+    )
+    row = cur.fetchone()
+    conn.close()
+    if not row["active"]:
+        raise InactiveUser(user_id)
+    return bool(row["liked"])
+
 
-    # 이 유저가 이미 이 글 좋아요 했는지 확인
+def _toggle_like(cur, post_id: int, user_id: int) -> bool:
+    # 이미 좋아요 했으면 지우면서 확인 (SELECT 후 DELETE 두 번 왕복하지 않음)
     cur.execute(
         """
-        SELECT 1
-        FROM post_likes
+        DELETE FROM post_likes
         WHERE post_id = ? AND user_id = ?
+        RETURNING id
         """,
         (post_id, user_id),
     )
-    row = cur.fetchone()
 
-    if row:
-        # 이미 좋아요 → 취소
-        cur.execute(
-            """
-            DELETE FROM post_likes
-            WHERE post_id = ? AND user_id = ?
-            """,
-            (post_id, user_id),
-        )
+    if cur.fetchone() is not None:
         liked = False
+        delta = -1
     else:
-        # 아직 안 눌렀으면 → 좋아요 추가
+        # 아직 안 눌렀으면 → 좋아요 추가 (동시 요청으로 이미 있으면 무시)
         cur.execute(
             """
             INSERT INTO post_likes (post_id, user_id)
             VALUES (?, ?)
+            ON CONFLICT (post_id, user_id) DO NOTHING
             """,
             (post_id, user_id),
         )
+        # rowcount 는 다음 execute 에서 덮어써지므로 확인 쿼리 전에 저장
+        inserted = cur.rowcount == 1
+        ensure_active_user(cur, user_id)
         liked = True
+        delta = 1 if inserted else 0
 
-    # 🔥 좋아요 총 개수 다시 계산해서 posts.like_count에 반영
-    cur.execute(
-        """
-        UPDATE posts
-        SET like_count = (
-            SELECT COUNT(*)
-            FROM post_likes
-            WHERE post_id = ?
+    if delta:
+        cur.execute(
+            """
+            UPDATE posts
+            SET like_count = MAX(COALESCE(like_count, 0) + ?, 0)
+            WHERE id = ?
+            """,
+            (delta, post_id),
         )
-        WHERE id = ?
-        """,
-        (post_id, post_id),
-    )
 
-    conn.commit()
-    conn.close()
     return liked
 
 
 # =========================
 # 게시글 이미지 추가
 # =========================
+def add_post_images(post_id: int, blobs: List[Tuple[str, str, int]]) -> List[Tuple[int, str]]:
+    """
+    한 요청의 이미지들을 한 트랜잭션으로 기록.
+    blobs: [(sha256, 저장소 상대 경로, 크기), ...]
+    return: [(post_images.id, 실제 경로), ...]
+            (같은 내용이 이미 저장돼 있으면 그 blob 의 경로를 재사용)
+    """
+    return run_write(_add_post_images, post_id, blobs)
+
+
+def _add_post_images(cur, post_id: int, blobs: List[Tuple[str, str, int]]) -> List[Tuple[int, str]]:
+    saved: List[Tuple[int, str]] = []
+    for blob_hash, rel_path, size in blobs:
+        cur.execute(
+            """
+            INSERT INTO blobs (hash, path, size)
+            VALUES (?, ?, ?)
+            ON CONFLICT (hash) DO NOTHING
+            """,
+            (blob_hash, rel_path, size),
+        )
+        cur.execute("SELECT path FROM blobs WHERE hash = ?", (blob_hash,))
+        path = cur.fetchone()["path"]
+
+        # refcount 는 post_images 트리거가 +1
+        cur.execute(
+            """
+            INSERT INTO post_images (post_id, image_path, blob_hash)
+            VALUES (?, ?, ?)
+            """,
+            (post_id, path, blob_hash),
+        )
+        saved.append((cur.lastrowid, path))
+
+    return saved
+
+
 def add_post_image(post_id: int, filename: str) -> None:
-    conn = get_conn()
-    cur = conn.cursor()
+    """예전 방식(해시 없는 평평한 파일명) 이미지 기록"""
+    run_write(_add_post_image, post_id, filename)
+
 
+def _add_post_image(cur, post_id: int, filename: str) -> None:
     cur.execute(
         """
         INSERT INTO post_images (post_id, image_path)
@@ -247,20 +343,60 @@ def add_post_image(post_id: int, filename: str) -> None:
         (post_id, filename),
     )
 
-    conn.commit()
-    conn.close()
+
+def set_post_image_variants(image_id: int, thumb_path: Optional[str], medium_path: Optional[str]) -> None:
+    """썸네일 워커가 만든 리사이즈 파일명 기록"""
+    run_write(_set_post_image_variants, image_id, thumb_path, medium_path)
+
+
+def _set_post_image_variants(cur, image_id: int, thumb_path: Optional[str], medium_path: Optional[str]) -> None:
+    cur.execute(
+        """
+        UPDATE post_images
+        SET thumb_path = ?, medium_path = ?
+        WHERE id = ?
+        """,
+        (thumb_path, medium_path, image_id),
+    )
 
 
 # =========================
-# 게시글 단건 상세 + 이미지/댓글/좋아요
+# 게시글 삭제
 # =========================
-def get_post_detail(post_id: int, current_user_id: Optional[int]) -> Optional[Dict]:
-    conn = get_conn()
-    cur = conn.cursor()
+def delete_post(post_id: int, user_id: int) -> bool:
+    """
+    작성자 본인 글만 삭제. 이미지/댓글/좋아요는 FK CASCADE,
+    이미지 blob refcount 는 트리거가 내려줌 (파일 정리는 백그라운드 GC)
+    return: 삭제했으면 True
+    """
+    deleted = run_write(_delete_post, post_id, user_id)
+    if deleted:
+        # 아직 반영 안 된 좋아요는 갈 곳이 없으므로 버림
+        like_buffer.drop_post(post_id)
+    return deleted
+
+
+def _delete_post(cur, post_id: int, user_id: int) -> bool:
+    cur.execute("DELETE FROM posts WHERE id = ? AND user_id = ? RETURNING id", (post_id, user_id))
+    return cur.fetchone() is not None
+
+
+# =========================
+# 게시글 상세 (여러 건 한 번에) + 이미지/댓글/좋아요
+# =========================
+def _load_post_details(cur, post_ids: List[int], current_user_id: Optional[int]) -> Dict[int, Dict]:
+    """
+    post_ids 개수와 상관없이 IN 쿼리 4번(글, 이미지, 댓글, 내 좋아요)으로 전부 읽는다.
+    return: {post_id: detail}  (없는 id 는 빠짐)
+    """
+    ids = list(dict.fromkeys(post_ids))
+    if not ids:
+        return {}
+    placeholders = ",".join("?" * len(ids))
 
     # 기본 게시글 + 작성자
     cur.execute(
-        """
+        f"""
         SELECT
             p.id,
             p.title,
@@ -271,56 +407,73 @@ def get_post_detail(post_id: int, current_user_id: Optional[int]) -> Optional[Di
             COALESCE(p.comment_count, 0) AS comments
         FROM posts p
         JOIN users u ON u.id = p.user_id
-        WHERE p.id = ?
+        WHERE p.id IN ({placeholders})
         """,
-        (post_id,),
+        ids,
     )
-    row = cur.fetchone()
-    if not row:
-        conn.close()
-        return None
-
-    detail: Dict = {
-        "id": row["id"],
-        "title": row["title"],
-        "content": row["content"],
-        "created_at": row["created_at"],
-        "author_name": row["author_name"],
-        "likes": row["likes"],
-        "comments": row["comments"],
-    }
+    details: Dict[int, Dict] = {}
+    for row in cur.fetchall():
+        details[row["id"]] = {
+            "id": row["id"],
+            "title": row["title"],
+            "content": row["content"],
+            "created_at": row["created_at"],
+            "author_name": row["author_name"],
+            "likes": like_buffer.like_count(row["id"], row["likes"]),
+            "comments": row["comments"],
+            "images": [],
+            "comment_items": [],
+            "comments_next_after_id": None,
+            "liked_by_me": False,
+        }
+    if not details:
+        return details
+
+    found = list(details)
+    placeholders = ",".join("?" * len(found))
 
     # 이미지 목록 (파일명 리스트, 라우트에서 URL로 변환)
     cur.execute(
-        """
-        SELECT image_path
+        f"""
+        SELECT post_id, image_path
         FROM post_images
-        WHERE post_id = ?
-        ORDER BY id ASC
+        WHERE post_id IN ({placeholders})
+        ORDER BY post_id, id ASC
         """,
-        (post_id,),
+        found,
     )
-    detail["images"] = [r["image_path"] for r in cur.fetchall()]
+    for r in cur.fetchall():
+        details[r["post_id"]]["images"].append(r["image_path"])
 
-    # 댓글 목록
+    # 댓글: 글마다 앞에서부터 COMMENT_PREVIEW_LIMIT 개만 (+1개로 다음 페이지 여부 확인)
+    # 글별로 comments(post_id, id) 인덱스 범위 스캔 → 댓글이 수천 개여도 비용 일정
     cur.execute(
-        """
+        f"""
         SELECT
+            c.post_id,
             c.id,
             c.content,
             c.created_at,
             u.username AS user_name
-        FROM comments c
+        FROM posts p
+        JOIN comments c ON c.id IN (
+            SELECT id FROM comments
+            WHERE post_id = p.id
+            ORDER BY id ASC
+            LIMIT ?
+        )
         JOIN users u ON u.id = c.user_id
-        WHERE c.post_id = ?
-        ORDER BY c.id ASC
+        WHERE p.id IN ({placeholders})
+        ORDER BY c.post_id, c.id ASC
         """,
-        (post_id,),
+        (COMMENT_PREVIEW_LIMIT + 1, *found),
     )
-    comment_rows = cur.fetchall()
-    comment_items: List[Dict] = []
-    for r in comment_rows:
-        comment_items.append(
+    for r in cur.fetchall():
+        items = details[r["post_id"]]["comment_items"]
+        if len(items) == COMMENT_PREVIEW_LIMIT:
+            details[r["post_id"]]["comments_next_after_id"] = items[-1]["id"]
+            continue
+        items.append(
             {
                 "id": r["id"],
                 "content": r["content"],
@@ -328,54 +481,82 @@ def get_post_detail(post_id: int, current_user_id: Optional[int]) -> Optional[Di
                 "user_name": r["user_name"],
             }
         )
-    detail["comment_items"] = comment_items
-
-    # 댓글 수를 DB와 동기화해 두고 싶다면:
-    cur.execute(
-        """
-        UPDATE posts
-        SET comment_count = ?
-        WHERE id = ?
-        """,
-        (len(comment_items), post_id),
-    )
-
-    # 좋아요 실제 개수 다시 계산 (혹시 모를 싱크 맞추기)
-    cur.execute(
-        """
-        SELECT COUNT(*) AS cnt
-        FROM post_likes
-        WHERE post_id = ?
-        """,
-        (post_id,),
-    )
-    like_cnt = cur.fetchone()["cnt"]
-    detail["likes"] = like_cnt
-
-    cur.execute(
-        """
-        UPDATE posts
-        SET like_count = ?
-        WHERE id = ?
-        """,
-        (like_cnt, post_id),
-    )
 
     # 내가 좋아요 눌렀는지
-    liked_by_me = False
     if current_user_id is not None:
         cur.execute(
-            """
-            SELECT 1
+            f"""
+            SELECT post_id
             FROM post_likes
-            WHERE post_id = ? AND user_id = ?
+            WHERE user_id = ? AND post_id IN ({placeholders})
             """,
-            (post_id, current_user_id),
+            (current_user_id, *found),
         )
-        liked_by_me = cur.fetchone() is not None
+        for r in cur.fetchall():
+            details[r["post_id"]]["liked_by_me"] = True
+
+        # 아직 DB 에 반영 안 된 좋아요 버퍼 상태 우선
+        for post_id, detail in details.items():
+            detail["liked_by_me"] = like_buffer.liked(post_id, current_user_id, detail["liked_by_me"])
+
+    return details
+
+
+def get_posts_batch(post_ids: List[int], current_user_id: Optional[int]) -> Dict[int, Dict]:
+    """
+    피드 화면의 여러 글 상세를 한 번에 (id 개수와 무관하게 쿼리 수 일정).
+    읽기 트랜잭션 하나로 일관된 스냅샷을 읽는다.
+    """
+    conn = get_conn()
+    cur = conn.cursor()
 
-    detail["liked_by_me"] = liked_by_me
+    cur.execute("BEGIN")
+    details = _load_post_details(cur, post_ids, current_user_id)
 
-    conn.commit()
+    conn.commit()  # 읽기 트랜잭션 종료
     conn.close()
-    return detail
+    return details
+
+
+# =========================
+# 게시글 단건 상세 + 이미지/댓글/좋아요
+# =========================
+def get_post_detail(post_id: int, current_user_id: Optional[int]) -> Optional[Dict]:
+    """
+    조회 전용. like_count/comment_count 는 쓰기 시점(좋아요/댓글)에 갱신되므로
+    여기서는 읽기 트랜잭션 하나로 일관된 스냅샷만 읽는다. (쓰기 락 안 잡음)
+    """
+    return get_posts_batch([post_id], current_user_id).get(post_id)
+
+
+# =========================
+# 카운터 일괄 보정 (오프라인 유지보수용)
+# =========================
+def reconcile_counters() -> int:
+    """
+    posts.like_count / comment_count 를 실제 post_likes / comments 개수와 비교해
+    어긋난 글만 한 번에 고친다.
+    return: 보정된 게시글 수
+    """
+    return run_write(_reconcile_counters)
+
+
+def _reconcile_counters(cur) -> int:
+    cur.execute(
+        """
+        UPDATE posts
+        SET like_count = actual.likes,
+            comment_count = actual.comments
+        FROM (
+            SELECT
+                p.id,
+                (SELECT COUNT(*) FROM post_likes l WHERE l.post_id = p.id) AS likes,
+                (SELECT COUNT(*) FROM comments c WHERE c.post_id = p.id)   AS comments
+            FROM posts p
+        ) AS actual
+        WHERE posts.id = actual.id
+          AND (posts.like_count IS NOT actual.likes
+               OR posts.comment_count IS NOT actual.comments)
+        """
+    )
+    return cur.rowcount
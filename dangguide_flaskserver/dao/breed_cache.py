@@ -0,0 +1,92 @@
+"""
+견종 카탈로그 읽기 캐시.
+카탈로그는 관리자 동기화 때만 바뀌므로 catalog_version 이 같으면
+미리 직렬화해 둔 JSON 바이트와 ETag 를 그대로 돌려준다 (전체 조회/JSON 인코딩 생략).
+버전은 DB(catalog_meta)에 있어서 요청마다 PK 조회 한 번으로 다른 워커의 동기화도 반영된다.
+"""
+
+import hashlib
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+from flask import current_app
+
+from dao.breed_dao import get_all_breeds, catalog_version
+
+# (JSON 바이트, 강한 ETag 값)
+CachedBody = Tuple[bytes, str]
+
+
+class _Catalog:
+    def __init__(self, version: int, list_body: CachedBody, by_id: Dict[int, CachedBody]):
+        self.version = version
+        self.list_body = list_body
+        self.by_id = by_id
+
+
+_lock = threading.Lock()
+_catalog: Optional[_Catalog] = None
+_stats = {"hits": 0, "misses": 0, "builds": 0}
+
+
+def _serialize(payload: Dict[str, Any]) -> CachedBody:
+    body = current_app.json.dumps(payload).encode("utf-8") + b"\n"
+    return body, hashlib.sha1(body).hexdigest()
+
+
+def _build(version: int) -> Optional[_Catalog]:
+    breeds = get_all_breeds()
+    if not breeds:
+        # 첫 동기화 전(빈 카탈로그)은 캐시하지 않음 → warming 상태를 라우트에서 처리
+        return None
+
+    list_body = _serialize({"ok": True, "count": len(breeds), "breeds": breeds, "warming": False})
+    by_id = {b["id"]: _serialize({"ok": True, "breed": b}) for b in breeds}
+    return _Catalog(version, list_body, by_id)
+
+
+def _current() -> Optional[_Catalog]:
+    global _catalog
+    version = catalog_version()
+
+    catalog = _catalog
+    if catalog is not None and catalog.version == version:
+        with _lock:
+            _stats["hits"] += 1
+        return catalog
+
+    with _lock:
+        _stats["misses"] += 1
+        # 다른 스레드가 먼저 만들었으면 그대로 사용
+        if _catalog is None or _catalog.version != version:
+            built = _build(version)
+            if built is not None:
+                _stats["builds"] += 1
+            _catalog = built
+        return _catalog
+
+
+def get_breed_list_body() -> Optional[CachedBody]:
+    catalog = _current()
+    return catalog.list_body if catalog else None
+
+
+def get_breed_body(breed_id: int) -> Optional[CachedBody]:
+    """카탈로그가 비어 있으면 None, 해당 id 가 없으면 (b"", "")"""
+    catalog = _current()
+    if catalog is None:
+        return None
+    return catalog.by_id.get(breed_id, (b"", ""))
+
+
+def cache_stats() -> Dict[str, Any]:
+    with _lock:
+        catalog = _catalog
+        total = _stats["hits"] + _stats["misses"]
+        return {
+            **_stats,
+            "hit_ratio": round(_stats["hits"] / total, 3) if total else None,
+            "catalog_version": catalog_version(),
+            "cached_version": catalog.version if catalog else None,
+            "cached_breeds": len(catalog.by_id) if catalog else 0,
+        }
@@ -1,45 +1,107 @@
-from typing import List, Dict, Any
-from db import get_conn
+import hashlib
+import json
+import re
+from typing import List, Dict, Any, Iterable, Optional, Tuple
+from db import get_conn, run_write
+
+# 견종 카탈로그 버전: 저장으로 내용이 바뀔 때마다 catalog_meta 에서 +1 (메모리 캐시/인덱스 무효화 기준)
+# DB 에 두므로 동기화를 돌리지 않은 다른 워커 프로세스도 다음 요청에서 바뀐 걸 안다
+def catalog_version() -> int:
+    conn = get_conn()
+    row = conn.execute("SELECT version FROM catalog_meta WHERE name = 'dog_breeds'").fetchone()
+    conn.close()
+    return row[0] if row else 0
+
+
+# dog_breeds 에 저장하는 컬럼 (content_hash 제외)
+BREED_COLUMNS = [
+    "id",
+    "name_en", "name_ko",
+    "temperament_en", "temperament_ko",
+    "bred_for_en", "bred_for_ko",
+    "breed_group_en", "breed_group_ko",
+    "life_span_en", "life_span_ko",
+    "origin_en", "origin_ko",
+    "weight_kg", "height_cm",
+    "image_url",
+]
+
+
+# weight_kg/height_cm 문자열에서 파싱한 숫자 범위 (검색/추천 필터용, 해시에는 포함 안 함)
+RANGE_COLUMNS = ["weight_min_kg", "weight_max_kg", "height_min_cm", "height_max_cm"]
+
+_NUMBER_RE = re.compile(r"\d+(?:\.\d+)?")
+
+
+def parse_range(text: Optional[str]) -> Tuple[Optional[float], Optional[float]]:
+    """
+    "3 - 6" → (3.0, 6.0), "36" → (36.0, 36.0), "10 – 15 years" → (10.0, 15.0)
+    숫자가 없으면 (None, None)
+    """
+    numbers = [float(n) for n in _NUMBER_RE.findall(text or "")]
+    if not numbers:
+        return None, None
+    return min(numbers), max(numbers)
+
+
+def breed_ranges(breed: Dict[str, Any]) -> tuple:
+    """RANGE_COLUMNS 순서의 값"""
+    return (*parse_range(breed.get("weight_kg")), *parse_range(breed.get("height_cm")))
+
+
+def breed_content_hash(breed: Dict[str, Any]) -> str:
+    payload = json.dumps([breed.get(c) for c in BREED_COLUMNS], ensure_ascii=False)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def _breed_row(breed: Dict[str, Any]) -> tuple:
+    return (*(breed.get(c) for c in BREED_COLUMNS), *breed_ranges(breed), breed_content_hash(breed))
+
+
+# 응답에는 내부용 content_hash 를 빼고 내보냄
+_SELECT_COLUMNS = ", ".join(BREED_COLUMNS + RANGE_COLUMNS)
+
+_WRITE_COLUMNS = BREED_COLUMNS + RANGE_COLUMNS + ["content_hash"]
+
+_UPSERT_SQL = f"""
+    INSERT INTO dog_breeds ({", ".join(_WRITE_COLUMNS)})
+    VALUES ({", ".join("?" * len(_WRITE_COLUMNS))})
+    ON CONFLICT(id) DO UPDATE SET
+        {", ".join(f"{c} = excluded.{c}" for c in _WRITE_COLUMNS[1:])}
+    WHERE dog_breeds.content_hash IS NOT excluded.content_hash
+"""
+
+
+def save_breeds_many(breeds: Iterable[Dict[str, Any]]) -> int:
+    """
+    여러 견종을 한 트랜잭션으로 UPSERT.
+    INSERT OR REPLACE(삭제 후 재삽입)와 달리 제자리 UPDATE 하고,
+    내용 해시가 같은 행은 건드리지 않는다.
+    return: 실제로 추가/변경된 행 수
+    """
+    return run_write(_upsert_breeds, breeds)
+
+
+def _upsert_breeds(cur, breeds: Iterable[Dict[str, Any]]) -> int:
+    before = cur.connection.total_changes
+    cur.executemany(_UPSERT_SQL, (_breed_row(b) for b in breeds))
+    written = cur.connection.total_changes - before
+    if written:
+        # 같은 트랜잭션에서 버전 +1 → 커밋되는 순간 모든 프로세스가 새 카탈로그를 보게 됨
+        cur.execute("UPDATE catalog_meta SET version = version + 1 WHERE name = 'dog_breeds'")
+    return written
 
 
 def save_breed(breed: Dict[str, Any]):
     """DogAPI에서 받은 데이터를 dog_breeds 테이블에 저장/업데이트"""
-    conn = get_conn()
-    cur = conn.cursor()
-
-    cur.execute("""
-        INSERT OR REPLACE INTO dog_breeds (
-            id,
-            name_en, name_ko,
-            temperament_en, temperament_ko,
-            bred_for_en, bred_for_ko,
-            breed_group_en, breed_group_ko,
-            life_span_en, life_span_ko,
-            origin_en, origin_ko,
-            weight_kg, height_cm,
-            image_url
-        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-    """, (
-        breed["id"],
-        breed.get("name_en"), breed.get("name_ko"),
-        breed.get("temperament_en"), breed.get("temperament_ko"),
-        breed.get("bred_for_en"), breed.get("bred_for_ko"),
-        breed.get("breed_group_en"), breed.get("breed_group_ko"),
-        breed.get("life_span_en"), breed.get("life_span_ko"),
-        breed.get("origin_en"), breed.get("origin_ko"),
-        breed.get("weight_kg"), breed.get("height_cm"),
-        breed.get("image_url"),
-    ))
-
-    conn.commit()
-    conn.close()
+    save_breeds_many([breed])
 
 
 def get_all_breeds() -> List[Dict[str, Any]]:
     conn = get_conn()
     cur = conn.cursor()
 
-    cur.execute("""SELECT * FROM dog_breeds ORDER BY id ASC""")
+    cur.execute(f"""SELECT {_SELECT_COLUMNS} FROM dog_breeds ORDER BY id ASC""")
     rows = cur.fetchall()
     conn.close()
 
@@ -50,7 +112,7 @@ def get_breed_by_id(breed_id: int):
     conn = get_conn()
     cur = conn.cursor()
 
-    cur.execute("""SELECT * FROM dog_breeds WHERE id = ?""", (breed_id,))
+    cur.execute(f"""SELECT {_SELECT_COLUMNS} FROM dog_breeds WHERE id = ?""", (breed_id,))
     row = cur.fetchone()
     conn.close()
 
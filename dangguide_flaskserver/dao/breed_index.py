@@ -0,0 +1,218 @@
+"""
+견종 검색용 메모리 인덱스.
+카탈로그는 ~200개이고 동기화 때만 바뀌므로 catalog_version 마다 한 번 만들어 두고
+이름(접두/부분/오타 허용), 그룹, 원산지, 성격 키워드, 체중/체고 범위 필터를 메모리에서 처리한다.
+"""
+
+import difflib
+import threading
+from bisect import bisect_left, bisect_right
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from dao.breed_dao import get_all_breeds, catalog_version
+
+# 정렬 키 → 견종 dict 에서 값 꺼내는 컬럼 (앞에 "-" 붙이면 내림차순)
+SORT_KEYS = {
+    "name": "name_en",
+    "name_ko": "name_ko",
+    "weight": "weight_min_kg",
+    "height": "height_min_cm",
+}
+
+# 이름 일치 등급 (작을수록 관련도 높음)
+_EXACT, _PREFIX, _WORD_PREFIX, _SUBSTRING, _FUZZY = range(5)
+FUZZY_CUTOFF = 0.7
+
+
+def _norm(text: Optional[str]) -> str:
+    return (text or "").strip().lower()
+
+
+def _split_list(text: Optional[str]) -> List[str]:
+    """"독일, 프랑스" → ["독일", "프랑스"]"""
+    return [t for t in (_norm(x) for x in (text or "").split(",")) if t]
+
+
+class _SortedKeys:
+    """문자열 키 → 견종 위치 집합. 정렬된 키 목록으로 접두 검색"""
+
+    def __init__(self, pairs: Iterable[Tuple[str, int]]):
+        self.postings: Dict[str, Set[int]] = {}
+        for key, pos in pairs:
+            if key:
+                self.postings.setdefault(key, set()).add(pos)
+        self.keys = sorted(self.postings)
+
+    def prefix(self, prefix: str) -> Set[int]:
+        hits: Set[int] = set()
+        i = bisect_left(self.keys, prefix)
+        while i < len(self.keys) and self.keys[i].startswith(prefix):
+            hits |= self.postings[self.keys[i]]
+            i += 1
+        return hits
+
+
+class _RangeIndex:
+    """[min, max] 범위 컬럼. 질의 범위와 겹치는 견종 찾기 (min 정렬 + bisect)"""
+
+    def __init__(self, ranges: List[Tuple[Optional[float], Optional[float]]]):
+        known = sorted((lo, pos) for pos, (lo, hi) in enumerate(ranges) if lo is not None)
+        self.mins = [lo for lo, _ in known]
+        self.positions = [pos for _, pos in known]
+        self.maxs = [hi for _, hi in ranges]
+
+    def overlapping(self, low: Optional[float], high: Optional[float]) -> Set[int]:
+        # 견종 min <= 질의 high 인 앞부분만 보고, 그중 견종 max >= 질의 low
+        end = len(self.mins) if high is None else bisect_right(self.mins, high)
+        return {
+            pos for pos in self.positions[:end]
+            if low is None or (self.maxs[pos] is not None and self.maxs[pos] >= low)
+        }
+
+
+class _Index:
+    def __init__(self, version: int, breeds: List[Dict[str, Any]]):
+        self.version = version
+        self.breeds = breeds
+
+        full_names: List[Tuple[str, int]] = []
+        words: List[Tuple[str, int]] = []
+        self.names: List[Tuple[str, int]] = []  # 부분 일치용 (공백 그대로)
+        for pos, b in enumerate(breeds):
+            for name in (b.get("name_en"), b.get("name_ko")):
+                name = _norm(name)
+                self.names.append((name, pos))
+                full_names.append((name, pos))
+                full_names.append((name.replace(" ", ""), pos))  # "골든리트리버"
+                words.extend((w, pos) for w in name.split())
+        self.full_names = _SortedKeys(full_names)
+        self.name_words = _SortedKeys(words)
+
+        self.groups = _SortedKeys(
+            (_norm(b.get(col)), pos) for pos, b in enumerate(breeds) for col in ("breed_group_en", "breed_group_ko")
+        )
+        self.origins = _SortedKeys(
+            (t, pos) for pos, b in enumerate(breeds)
+            for col in ("origin_en", "origin_ko") for t in _split_list(b.get(col))
+        )
+        self.temperaments = _SortedKeys(
+            (t, pos) for pos, b in enumerate(breeds)
+            for col in ("temperament_en", "temperament_ko") for t in _split_list(b.get(col))
+        )
+
+        self.weight = _RangeIndex([(b.get("weight_min_kg"), b.get("weight_max_kg")) for b in breeds])
+        self.height = _RangeIndex([(b.get("height_min_cm"), b.get("height_max_cm")) for b in breeds])
+
+        # 정렬 키별 순위 ("name", "-name" ...). 값 없는 견종은 오름/내림 모두 뒤
+        self.ranks: Dict[str, List[int]] = {}
+        for key, col in SORT_KEYS.items():
+            known = [p for p in range(len(breeds)) if breeds[p].get(col) is not None]
+            missing = [p for p in range(len(breeds)) if breeds[p].get(col) is None]
+            value = (lambda p: breeds[p][col]) if col.endswith(("_kg", "_cm")) else (lambda p: _norm(breeds[p][col]))
+            asc = sorted(known, key=lambda p: (value(p), p))
+            self.ranks[key] = self._rank(asc + missing)
+            self.ranks["-" + key] = self._rank(asc[::-1] + missing)
+
+    @staticmethod
+    def _rank(order: List[int]) -> List[int]:
+        rank = [0] * len(order)
+        for r, p in enumerate(order):
+            rank[p] = r
+        return rank
+
+    # ---------- 이름 ----------
+    def match_name(self, q: str) -> Dict[int, int]:
+        """위치 → 일치 등급"""
+        q = _norm(q)
+        grades: Dict[int, int] = {}
+
+        def mark(positions: Iterable[int], grade: int) -> None:
+            for p in positions:
+                if grade < grades.get(p, _FUZZY + 1):
+                    grades[p] = grade
+
+        mark(self.full_names.postings.get(q, ()), _EXACT)
+        mark(self.full_names.prefix(q), _PREFIX)
+        mark(self.name_words.prefix(q), _WORD_PREFIX)
+        mark((p for name, p in self.names if q in name), _SUBSTRING)
+
+        if not grades:
+            # 오타 허용: 전체 이름/단어 중 비슷한 것
+            keys = self.full_names.keys + self.name_words.keys
+            for key in difflib.get_close_matches(q, keys, n=10, cutoff=FUZZY_CUTOFF):
+                mark(self.full_names.postings.get(key, set()) | self.name_words.postings.get(key, set()), _FUZZY)
+        return grades
+
+
+_lock = threading.Lock()
+_index: Optional[_Index] = None
+
+
+def _current() -> Optional[_Index]:
+    global _index
+    version = catalog_version()
+
+    index = _index
+    if index is not None and index.version == version:
+        return index
+
+    with _lock:
+        if _index is None or _index.version != version:
+            breeds = get_all_breeds()
+            _index = _Index(version, breeds) if breeds else None
+        return _index
+
+
+def _any_prefix(keys: _SortedKeys, values: List[str]) -> Set[int]:
+    hits: Set[int] = set()
+    for v in values:
+        hits |= keys.prefix(_norm(v))
+    return hits
+
+
+def search_breeds(
+    q: Optional[str] = None,
+    groups: Optional[List[str]] = None,
+    origins: Optional[List[str]] = None,
+    temperaments: Optional[List[str]] = None,
+    weight_range: Tuple[Optional[float], Optional[float]] = (None, None),
+    height_range: Tuple[Optional[float], Optional[float]] = (None, None),
+    sort: Optional[str] = None,
+) -> Optional[List[Dict[str, Any]]]:
+    """
+    groups/origins: 하나라도 일치 (OR), temperaments: 모두 포함 (AND), 모두 접두 일치.
+    범위: 견종의 [min, max] 가 질의 범위와 겹치면 포함.
+    sort: "relevance"(q 가 있을 때 기본) | name | name_ko | weight | height, "-" 붙이면 내림차순
+    카탈로그가 비어 있으면 None. 잘못된 sort 는 ValueError
+    """
+    sort = sort or ("relevance" if q else "name")
+    if sort != "relevance" and sort.removeprefix("-") not in SORT_KEYS:
+        raise ValueError(f"sort 는 relevance, {', '.join(SORT_KEYS)} 중 하나")
+
+    index = _current()
+    if index is None:
+        return None
+
+    candidates: Set[int] = set(range(len(index.breeds)))
+    grades: Dict[int, int] = {}
+    if q and q.strip():
+        grades = index.match_name(q)
+        candidates &= grades.keys()
+    if groups:
+        candidates &= _any_prefix(index.groups, groups)
+    if origins:
+        candidates &= _any_prefix(index.origins, origins)
+    for t in temperaments or []:
+        candidates &= index.temperaments.prefix(_norm(t))
+    if weight_range != (None, None):
+        candidates &= index.weight.overlapping(*weight_range)
+    if height_range != (None, None):
+        candidates &= index.height.overlapping(*height_range)
+
+    if sort == "relevance":
+        rank = index.ranks["name"]
+        order = sorted(candidates, key=lambda p: (grades.get(p, 0), rank[p]))
+    else:
+        rank = index.ranks[sort]
+        order = sorted(candidates, key=lambda p: rank[p])
+    return [index.breeds[p] for p in order]
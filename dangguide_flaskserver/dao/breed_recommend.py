@@ -0,0 +1,226 @@
+"""
+견종 추천: 사용자 선호(크기, 성격, 그룹, 수명)에 맞춰 전체 견종 점수를 매긴다.
+catalog_version 마다 숫자 특징 행렬을 한 번 만들어 두고 (체중/체고/수명 범위,
+성격·그룹 원-핫) 요청마다 numpy 벡터 연산으로 ~200개를 한 번에 계산한다.
+"""
+
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from dao.breed_dao import get_all_breeds, catalog_version, parse_range
+
+# 크기 구간 (kg) → 목표 체중 범위
+SIZE_RANGES = {
+    "small": (0.0, 10.0),
+    "medium": (10.0, 25.0),
+    "large": (25.0, 45.0),
+    "giant": (45.0, 100.0),
+}
+
+# 항목별 가중치 (선호를 준 항목만 합산 후 정규화)
+WEIGHTS = {
+    "size": 3.0,
+    "temperament": 3.0,
+    "avoid": 2.0,
+    "group": 1.0,
+    "life_span": 1.0,
+}
+
+
+def _norm(text: Optional[str]) -> str:
+    return (text or "").strip().lower()
+
+
+def _split_list(text: Optional[str]) -> List[str]:
+    return [_norm(x) for x in (text or "").split(",") if _norm(x)]
+
+
+def _vocab_matrix(rows: List[List[str]]) -> Tuple[np.ndarray, Dict[str, int]]:
+    """견종별 토큰 목록 → (견종 × 토큰) 0/1 행렬 + 토큰 → 열 번호"""
+    vocab: Dict[str, int] = {}
+    for tokens in rows:
+        for t in tokens:
+            vocab.setdefault(t, len(vocab))
+
+    m = np.zeros((len(rows), len(vocab)), dtype=np.float32)
+    for i, tokens in enumerate(rows):
+        m[i, [vocab[t] for t in tokens]] = 1.0
+    return m, vocab
+
+
+class _Features:
+    def __init__(self, version: int, breeds: List[Dict[str, Any]]):
+        self.version = version
+        self.breeds = breeds
+        self.ids = np.array([b["id"] for b in breeds])
+
+        def ranges(get) -> np.ndarray:
+            # 값 없으면 NaN (해당 항목 점수 0)
+            return np.array([[np.nan if v is None else v for v in get(b)] for b in breeds], dtype=np.float64)
+
+        self.weight = ranges(lambda b: (b.get("weight_min_kg"), b.get("weight_max_kg")))
+        self.height = ranges(lambda b: (b.get("height_min_cm"), b.get("height_max_cm")))
+        self.life = ranges(lambda b: parse_range(b.get("life_span_en")))
+
+        # 성격: 영문 토큰 기준 열, 한국어 번역은 같은 위치 토큰을 같은 열로 매핑
+        temperament_rows = [_split_list(b.get("temperament_en")) for b in breeds]
+        self.temperament, self.temperament_vocab = _vocab_matrix(temperament_rows)
+        for b, en_tokens in zip(breeds, temperament_rows):
+            ko_tokens = _split_list(b.get("temperament_ko"))
+            if len(ko_tokens) == len(en_tokens):
+                for ko, en in zip(ko_tokens, en_tokens):
+                    self.temperament_vocab.setdefault(ko, self.temperament_vocab[en])
+
+        group_rows = [[_norm(b.get("breed_group_en"))] if b.get("breed_group_en") else [] for b in breeds]
+        self.group, self.group_vocab = _vocab_matrix(group_rows)
+        for b in breeds:
+            if b.get("breed_group_en") and b.get("breed_group_ko"):
+                self.group_vocab.setdefault(_norm(b["breed_group_ko"]), self.group_vocab[_norm(b["breed_group_en"])])
+
+        # 이름 → 행 번호 (프로필의 견종으로 "비슷한 견종" 찾기)
+        self.row_by_name: Dict[str, int] = {}
+        for i, b in enumerate(breeds):
+            for name in (b.get("name_en"), b.get("name_ko")):
+                if name:
+                    self.row_by_name[_norm(name).replace(" ", "")] = i
+
+    @staticmethod
+    def one_hot(matrix: np.ndarray, vocab: Dict[str, int], tokens: List[str]) -> Tuple[np.ndarray, List[str]]:
+        """선호 토큰 → 열 벡터 (모르는 토큰은 따로 돌려줌). 한국어 토큰은 영문과 같은 열"""
+        vec = np.zeros(matrix.shape[1], dtype=np.float32)
+        unknown = []
+        for t in tokens:
+            col = vocab.get(_norm(t))
+            if col is None:
+                unknown.append(t)
+            else:
+                vec[col] = 1.0
+        return vec, unknown
+
+
+_lock = threading.Lock()
+_features: Optional[_Features] = None
+
+
+def _current() -> Optional[_Features]:
+    global _features
+    version = catalog_version()
+
+    features = _features
+    if features is not None and features.version == version:
+        return features
+
+    with _lock:
+        if _features is None or _features.version != version:
+            breeds = get_all_breeds()
+            _features = _Features(version, breeds) if breeds else None
+        return _features
+
+
+def _range_fit(ranges: np.ndarray, low: float, high: float) -> np.ndarray:
+    """
+    견종 [min, max] 와 목표 [low, high] 가 겹치면 1,
+    떨어진 거리만큼 감소 (목표 폭/중앙값 기준 스케일). 값 없으면 0
+    """
+    gap = np.maximum(0.0, np.maximum(ranges[:, 0] - high, low - ranges[:, 1]))
+    scale = max((high - low) / 2, (low + high) / 2 * 0.25, 1.0)
+    fit = 1.0 / (1.0 + (gap / scale) ** 2)
+    return np.nan_to_num(fit, nan=0.0)
+
+
+def recommend_breeds(
+    size: Optional[str] = None,
+    weight_kg: Optional[float] = None,
+    temperaments: Optional[List[str]] = None,
+    avoid: Optional[List[str]] = None,
+    groups: Optional[List[str]] = None,
+    min_life_span: Optional[float] = None,
+    similar_to: Optional[str] = None,
+    limit: int = 10,
+) -> Optional[Dict[str, Any]]:
+    """
+    선호 조건으로 모든 견종 점수(0~1) 계산 후 상위 limit 개.
+    size(small/medium/large/giant) 또는 weight_kg(±20%) 로 체중 목표,
+    similar_to 는 견종 이름 → 그 견종의 성격/체중을 선호로 사용.
+    카탈로그가 비어 있으면 None, 잘못된 size 는 ValueError
+    """
+    if size and size not in SIZE_RANGES:
+        raise ValueError(f"size 는 {', '.join(SIZE_RANGES)} 중 하나")
+
+    f = _current()
+    if f is None:
+        return None
+
+    n = len(f.breeds)
+    components: Dict[str, np.ndarray] = {}
+    ignored: List[str] = []
+
+    temperaments = list(temperaments or [])
+    base_row = None
+    if similar_to:
+        base_row = f.row_by_name.get(_norm(similar_to).replace(" ", ""))
+        if base_row is None:
+            ignored.append(similar_to)
+        else:
+            # 기준 견종의 성격 토큰을 선호에 추가, 체중 목표가 없으면 그 견종 체중 범위
+            liked = f.temperament[base_row] > 0
+            temperaments += [t for t, col in f.temperament_vocab.items() if liked[col]]
+            if size is None and weight_kg is None and not np.isnan(f.weight[base_row]).any():
+                low, high = f.weight[base_row]
+                components["size"] = _range_fit(f.weight, float(low), float(high))
+
+    if size:
+        components["size"] = _range_fit(f.weight, *SIZE_RANGES[size])
+    elif weight_kg is not None:
+        components["size"] = _range_fit(f.weight, weight_kg * 0.8, weight_kg * 1.2)
+
+    if temperaments:
+        vec, unknown = f.one_hot(f.temperament, f.temperament_vocab, temperaments)
+        ignored += unknown
+        if vec.any():
+            # 선호 성격 중 가진 비율
+            components["temperament"] = (f.temperament @ vec) / vec.sum()
+
+    if avoid:
+        vec, unknown = f.one_hot(f.temperament, f.temperament_vocab, avoid)
+        ignored += unknown
+        if vec.any():
+            # 피하고 싶은 성격이 하나도 없으면 1
+            components["avoid"] = 1.0 - np.minimum(f.temperament @ vec, 1.0)
+
+    if groups:
+        vec, unknown = f.one_hot(f.group, f.group_vocab, groups)
+        ignored += unknown
+        if vec.any():
+            components["group"] = np.minimum(f.group @ vec, 1.0)
+
+    if min_life_span is not None:
+        # 최대 수명이 원하는 수명 이상이면 1, 모자란 햇수만큼 감소
+        short = np.maximum(0.0, min_life_span - f.life[:, 1])
+        components["life_span"] = np.nan_to_num(1.0 / (1.0 + short), nan=0.0)
+
+    if components:
+        total_weight = sum(WEIGHTS[k] for k in components)
+        score = sum(WEIGHTS[k] * v for k, v in components.items()) / total_weight
+    else:
+        score = np.zeros(n)
+
+    if base_row is not None:
+        score[base_row] = -1.0  # 기준 견종 자신은 제외
+        n -= 1
+
+    limit = min(limit, n)
+    top = np.argpartition(-score, limit - 1)[:limit] if limit > 0 else np.array([], dtype=int)
+    top = top[np.lexsort((f.ids[top], -score[top]))]
+
+    results = [
+        {
+            "breed": f.breeds[i],
+            "score": round(float(score[i]), 4),
+            "components": {k: round(float(v[i]), 4) for k, v in components.items()},
+        }
+        for i in top
+    ]
+    return {"results": results, "ignored": ignored, "criteria": sorted(components)}
@@ -1,19 +1,152 @@
-from dao.breed_dao import save_breed
-from routes.thedogapi import fetch_all_breeds, normalize_breed, translate_breed
+import threading
+import time
+import traceback
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
+from dao.breed_dao import save_breeds_many, count_breeds
+from routes.thedogapi import (
+    fetch_breed_changes, commit_breed_hashes, normalize_breed, translate_breeds, translation_failed
+)
 
-def sync_breeds_from_api(limit: int = 200) -> int:
+# 진행 상황 콜백: (단계, 완료 수, 전체 수)
+SyncProgressFn = Callable[[str, int, int], None]
+
+
+def sync_breeds_from_api(
+    limit: int = 200,
+    on_progress: Optional[SyncProgressFn] = None,
+    force: bool = False,
+) -> int:
     """
     DogAPI에서 breed 정보를 가져와 DB에 저장.
-    return: 저장된 개수
+    페이지는 ETag 로 재검증하고, 지난 동기화 이후 바뀐 견종만 번역/저장한다.
+    force=True (또는 DB 가 비어 있으면) 전체를 다시 처리.
+    return: 실제로 추가/변경된 개수
+    """
+    def report(stage: str, done: int = 0, total: int = 0) -> None:
+        if on_progress:
+            on_progress(stage, done, total)
+
+    report("fetching")
+    force = force or count_breeds() == 0
+    raw_breeds, changed = fetch_breed_changes(limit, force=force)
+    if not changed:
+        return 0
+
+    saved, _ = apply_breed_changes(changed, on_progress)
+    return saved
+
+
+def apply_breed_changes(
+    changed: List[Dict[str, Any]],
+    on_progress: Optional[SyncProgressFn] = None,
+) -> Tuple[int, List[int]]:
     """
-    raw_breeds = fetch_breeds(limit)
-    count = 0
+    바뀐 raw 견종 번역 → 저장 → 해시 기록.
+    번역에 실패한 견종은 "(번역 실패)" 로 저장하되 해시를 기록하지 않아 다음 동기화 때 다시 번역한다.
+    return: (추가/변경된 개수, 번역 실패로 재시도 대기 중인 견종 id)
+    """
+    def report(stage: str, done: int = 0, total: int = 0) -> None:
+        if on_progress:
+            on_progress(stage, done, total)
+
+    # 번역은 전체를 한 번에 (중복 문장 제거 + 캐시 + 동시 요청)
+    breeds = translate_breeds(
+        [normalize_breed(raw) for raw in changed],
+        on_progress=lambda done, total: report("translating", done, total),
+    )
+
+    # 저장도 한 트랜잭션으로
+    report("saving", 0, len(breeds))
+    saved = save_breeds_many(breeds)
+
+    # translate_breeds 는 순서를 유지하므로 raw 와 1:1
+    complete = [raw for raw, breed in zip(changed, breeds) if not translation_failed(breed)]
+    commit_breed_hashes(complete)
+    return saved, [breed["id"] for breed in breeds if translation_failed(breed)]
+
+
+# =========================
+# 백그라운드 동기화 (앱 시작을 막지 않음)
+# =========================
+_lock = threading.Lock()
+_thread: Optional[threading.Thread] = None
+_status: Dict[str, Any] = {
+    "state": "idle",          # idle / running / done / failed
+    "stage": None,            # fetching / translating / saving
+    "done": 0,
+    "total": 0,
+    "saved": None,
+    "started_at": None,
+    "stage_started_at": None,
+    "finished_at": None,
+    "errors": [],
+}
+
+
+def _update(**fields) -> None:
+    with _lock:
+        _status.update(fields)
+
+
+def _run(limit: int) -> None:
+    def on_progress(stage: str, done: int, total: int) -> None:
+        with _lock:
+            if _status["stage"] != stage:
+                _status["stage_started_at"] = time.time()
+            _status.update(stage=stage, done=done, total=total)
+
+    try:
+        saved = sync_breeds_from_api(limit, on_progress=on_progress)
+        with _lock:
+            _status.update(state="done", stage=None, done=_status["total"], saved=saved, finished_at=time.time())
+        print(f"✅ 백그라운드 동기화 완료! 저장된 개수: {saved}")
+    except Exception as e:
+        traceback.print_exc()
+        with _lock:
+            _status["errors"].append(str(e))
+            _status.update(state="failed", finished_at=time.time())
+        print(f"❌ 백그라운드 동기화 실패: {e}")
+
+
+def start_background_sync(limit: int = 200) -> bool:
+    """
+    견종 동기화를 데몬 스레드로 시작.
+    return: 새로 시작했으면 True, 이미 돌고 있으면 False
+    """
+    global _thread
+    with _lock:
+        if _thread is not None and _thread.is_alive():
+            return False
+        _status.update(
+            state="running", stage=None, done=0, total=0, saved=None,
+            started_at=time.time(), stage_started_at=None, finished_at=None, errors=[],
+        )
+        _thread = threading.Thread(target=_run, args=(limit,), name="breed-sync", daemon=True)
+        _thread.start()
+    return True
+
+
+def is_sync_running() -> bool:
+    with _lock:
+        return _status["state"] == "running"
+
+
+def get_sync_status() -> Dict[str, Any]:
+    """진행률(%), 경과 시간, 예상 남은 시간(번역 단계 기준)을 포함한 현재 상태"""
+    with _lock:
+        status = dict(_status, errors=list(_status["errors"]))
+
+    now = time.time()
+    started = status["started_at"]
+    end = status["finished_at"] or now
+    status["elapsed_sec"] = round(end - started, 1) if started else None
 
-    for raw in raw_breeds:
-        breed = normalize_breed(raw)
-        breed = translate_breed(breed)
-        save_breed(breed)
-        count += 1
+    done, total = status["done"], status["total"]
+    status["progress"] = round(done / total, 3) if total else None
 
-    return count
+    eta = None
+    if status["state"] == "running" and status["stage"] == "translating" and done and total:
+        eta = round((now - status["stage_started_at"]) / done * (total - done), 1)
+    status["eta_sec"] = eta
+    return status
@@ -0,0 +1,88 @@
+"""
+게시글 이미지 리사이즈(썸네일/중간 크기) 백그라운드 워커.
+업로드 요청은 원본 저장까지만 하고, 리사이즈는 스레드 풀에서 처리한 뒤 post_images 에 기록한다.
+Pillow 가 없으면 리사이즈를 건너뛰고 원본을 그대로 쓴다.
+"""
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from dao.board_dao import set_post_image_variants
+from dao.blob_store import variant_rel_path
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # pragma: no cover - 선택 의존성
+    Image = None
+
+IMAGE_WORKERS = int(os.getenv("IMAGE_WORKERS", "2"))
+
+# (접두어, 긴 변 최대 픽셀)
+VARIANTS = {
+    "thumb": 320,
+    "medium": 1080,
+}
+JPEG_QUALITY = 82
+
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=IMAGE_WORKERS, thread_name_prefix="image-variants")
+    return _executor
+
+
+def make_variant(src: Path, dst: Path, max_side: int) -> None:
+    with Image.open(src) as im:
+        im = ImageOps.exif_transpose(im)  # 휴대폰 사진 회전 정보 반영
+        im.thumbnail((max_side, max_side))
+        if im.mode not in ("RGB", "L"):
+            im = im.convert("RGB")
+        # 다른 워커가 같은 파일을 만드는 중일 수 있으므로 임시 파일에 쓰고 교체
+        tmp = dst.with_name(dst.name + f".{os.getpid()}.{threading.get_ident()}.tmp")
+        im.save(tmp, "JPEG", quality=JPEG_QUALITY, optimize=True, progressive=True)
+        os.replace(tmp, dst)
+
+
+def _process(folder: Path, image_id: int, filename: str) -> None:
+    src = folder / filename
+    made = {}
+
+    try:
+        for name, max_side in VARIANTS.items():
+            variant = variant_rel_path(filename, name)
+            # 같은 내용(blob)이 이미 리사이즈돼 있으면 재사용
+            if not (folder / variant).exists():
+                make_variant(src, folder / variant, max_side)
+            made[name] = variant
+    except Exception as e:
+        print(f"[image variant error] image_id={image_id}, file={filename}, error={e}")
+        return
+
+    set_post_image_variants(image_id, made.get("thumb"), made.get("medium"))
+
+
+def schedule_variants(folder: Path, images: List[Tuple[int, str]]) -> bool:
+    """
+    images: [(post_images.id, 저장소 상대 경로), ...]
+    return: 작업을 넘겼으면 True (Pillow 없으면 False)
+    """
+    if Image is None or not images:
+        return False
+
+    ex = _get_executor()
+    for image_id, filename in images:
+        ex.submit(_process, folder, image_id, filename)
+    return True
+
+
+def shutdown(wait: bool = True) -> None:
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=wait)
+        _executor = None
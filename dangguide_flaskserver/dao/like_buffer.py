@@ -0,0 +1,234 @@
+"""
+좋아요 쓰기 모아서 반영 (LIKE_BUFFER=1 일 때만).
+인기 글에 좋아요 연타/몰림이 오면 클릭마다 post_likes INSERT/DELETE + posts UPDATE 커밋이 생긴다.
+여기서는 (post_id, user_id) 마다 "마지막으로 원한 상태"만 메모리에 기록하고
+LIKE_BUFFER_FLUSH_SEC 마다 DB 와 달라진 것만 한 트랜잭션으로 반영한다.
+
+읽기(목록/상세의 likes, liked_by_me)는 DB 값에 아직 반영 안 된 차이를 더해서 응답.
+서버가 비정상 종료되면 최대 LIKE_BUFFER_FLUSH_SEC 동안의 좋아요가 유실될 수 있다 (정상 종료 시에는 flush).
+"""
+
+import atexit
+import os
+import threading
+import traceback
+from collections import defaultdict
+from typing import Callable, Dict, List, Optional, Tuple
+
+from db import run_write
+
+LIKE_BUFFER = os.getenv("LIKE_BUFFER", "0") == "1"
+# 반영 주기 = 비정상 종료 시 유실될 수 있는 최대 구간
+LIKE_BUFFER_FLUSH_SEC = float(os.getenv("LIKE_BUFFER_FLUSH_SEC", "1.0"))
+# 대기 중인 (글, 사용자) 조합이 이만큼 쌓이면 주기를 기다리지 않고 반영
+LIKE_BUFFER_MAX_PENDING = int(os.getenv("LIKE_BUFFER_MAX_PENDING", "10000"))
+
+Key = Tuple[int, int]  # (post_id, user_id)
+
+
+def _apply_changes(cur, changes: List[Tuple[Key, bool]]) -> int:
+    """
+    원하는 상태로 post_likes 를 맞추고 실제로 바뀐 행 수만큼 like_count 조정.
+    그 사이 삭제된 글/탈퇴한 사용자의 좋아요는 건너뜀 (FK 에러로 전체가 실패하지 않게)
+    return: 바뀐 post_likes 행 수
+    """
+    by_post: Dict[int, Tuple[List[tuple], List[tuple]]] = defaultdict(lambda: ([], []))
+    for (post_id, user_id), liked in changes:
+        by_post[post_id][0 if liked else 1].append((post_id, user_id))
+
+    written = 0
+    for post_id, (ons, offs) in by_post.items():
+        delta = 0
+        if ons:
+            cur.executemany(
+                """
+                INSERT INTO post_likes (post_id, user_id)
+                SELECT ?1, ?2
+                WHERE EXISTS (SELECT 1 FROM posts WHERE id = ?1)
+                  AND EXISTS (SELECT 1 FROM users WHERE id = ?2 AND deleted_at IS NULL)
+                ON CONFLICT (post_id, user_id) DO NOTHING
+                """,
+                ons,
+            )
+            delta += cur.rowcount
+        if offs:
+            cur.executemany("DELETE FROM post_likes WHERE post_id = ? AND user_id = ?", offs)
+            delta -= cur.rowcount
+
+        if delta:
+            cur.execute(
+                "UPDATE posts SET like_count = MAX(COALESCE(like_count, 0) + ?, 0) WHERE id = ?",
+                (delta, post_id),
+            )
+        written += len(ons) + len(offs)
+    return written
+
+
+class LikeBuffer:
+    def __init__(self, max_pending: int = LIKE_BUFFER_MAX_PENDING):
+        self.max_pending = max_pending
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        # key → [원하는 상태, DB 상태]
+        self._pending: Dict[Key, List[bool]] = {}
+        # post_id → 아직 DB 에 없는 like_count 차이
+        self._delta: Dict[int, int] = {}
+        self._wake = threading.Event()
+        # flush 커밋마다 +1 (toggle 이 락 밖에서 읽은 DB 상태가 낡았는지 확인용)
+        self._generation = 0
+
+        # 통계
+        self._toggles = 0
+        self._flushes = 0
+        self._rows_written = 0
+        self._flush_errors = 0
+
+    def toggle(self, post_id: int, user_id: int, lookup: Callable[[int, int], bool]) -> bool:
+        """상태 뒤집기. 처음 보는 조합이면 lookup 으로 DB 상태를 읽음. return: 새 상태(좋아요 ON 이면 True)"""
+        key = (post_id, user_id)
+        while True:
+            with self._lock:
+                entry = self._pending.get(key)
+                if entry is not None:
+                    return self._flip(key, entry)
+                generation = self._generation
+
+            # DB 조회는 락 밖에서. 그 사이 flush 가 커밋됐으면 읽은 값이 낡았을 수 있으니 다시 읽음
+            db_state = bool(lookup(post_id, user_id))
+
+            with self._lock:
+                entry = self._pending.get(key)
+                if entry is None and generation != self._generation:
+                    continue
+                if entry is None:
+                    entry = self._pending[key] = [db_state, db_state]
+                return self._flip(key, entry)
+
+    def _flip(self, key: Key, entry: List[bool]) -> bool:
+        # self._lock 안에서 호출
+        entry[0] = not entry[0]
+        post_id = key[0]
+        self._delta[post_id] = self._delta.get(post_id, 0) + (1 if entry[0] else -1)
+        self._toggles += 1
+        if len(self._pending) >= self.max_pending:
+            self.wake()
+        return entry[0]
+
+    def wait(self, timeout: float) -> None:
+        """다음 반영 시점까지 대기 (대기 중 조합이 가득 차면 바로 깨어남)"""
+        self._wake.wait(timeout)
+        self._wake.clear()
+
+    def wake(self) -> None:
+        self._wake.set()
+
+    def like_count(self, post_id: int, db_count: int) -> int:
+        return max(db_count + self._delta.get(post_id, 0), 0)
+
+    def liked(self, post_id: int, user_id: int, db_liked: bool) -> bool:
+        entry = self._pending.get((post_id, user_id))
+        return db_liked if entry is None else entry[0]
+
+    def flush(self) -> int:
+        """DB 와 달라진 상태만 한 트랜잭션으로 반영. return: 반영한 (글, 사용자) 조합 수"""
+        with self._flush_lock:
+            with self._lock:
+                snapshot = {k: (e[0], e[1]) for k, e in self._pending.items()}
+            if not snapshot:
+                return 0
+
+            changes = [(k, want) for k, (want, base) in snapshot.items() if want != base]
+            try:
+                written = run_write(_apply_changes, changes) if changes else 0
+            except Exception:
+                # 남겨 두고 다음 주기에 재시도
+                with self._lock:
+                    self._flush_errors += 1
+                raise
+
+            with self._lock:
+                for key, (want, base) in snapshot.items():
+                    entry = self._pending.get(key)
+                    if entry is None:
+                        # 반영하는 사이 글이 삭제됨 (drop_post 가 차이까지 비움)
+                        continue
+
+                    post_id = key[0]
+                    remaining = self._delta.get(post_id, 0) - (int(want) - int(base))
+                    if remaining:
+                        self._delta[post_id] = remaining
+                    else:
+                        self._delta.pop(post_id, None)
+
+                    if entry[0] == want:
+                        del self._pending[key]
+                    else:
+                        # 반영하는 사이 또 눌림 → DB 상태만 갱신하고 다음 주기에 반영
+                        entry[1] = want
+
+                self._generation += 1
+                self._flushes += 1
+                self._rows_written += written
+            return len(changes)
+
+    def drop_post(self, post_id: int) -> int:
+        """삭제된 글의 대기 중인 좋아요 버림. return: 버린 (글, 사용자) 조합 수"""
+        with self._lock:
+            keys = [k for k in self._pending if k[0] == post_id]
+            for key in keys:
+                del self._pending[key]
+            self._delta.pop(post_id, None)
+            return len(keys)
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            return {
+                "enabled": LIKE_BUFFER,
+                "pending": len(self._pending),
+                "toggles": self._toggles,
+                "flushes": self._flushes,
+                "rows_written": self._rows_written,
+                "flush_errors": self._flush_errors,
+            }
+
+
+like_buffer = LikeBuffer()
+
+
+# =========================
+# 주기적 반영 스레드
+# =========================
+_thread: Optional[threading.Thread] = None
+_stopping = threading.Event()
+
+
+def _loop(interval: float) -> None:
+    while not _stopping.is_set():
+        like_buffer.wait(interval)
+        try:
+            like_buffer.flush()
+        except Exception as e:
+            traceback.print_exc()
+            print(f"❌ 좋아요 반영 실패 (다음 주기에 재시도): {e}")
+
+
+def start_like_flusher(interval: float = LIKE_BUFFER_FLUSH_SEC) -> None:
+    global _thread
+    if _thread is not None and _thread.is_alive():
+        return
+    _stopping.clear()
+    _thread = threading.Thread(target=_loop, args=(interval,), name="like-flusher", daemon=True)
+    _thread.start()
+
+
+def shutdown() -> None:
+    """종료 시 남은 좋아요 반영"""
+    _stopping.set()
+    like_buffer.wake()
+    if _thread is not None:
+        _thread.join(timeout=5)
+    like_buffer.flush()
+
+
+# 쓰기 큐(db.write_queue)보다 나중에 등록 → 먼저 실행되어 큐가 멈추기 전에 반영
+atexit.register(shutdown)
@@ -3,7 +3,8 @@ from __future__ import annotations
 
 from typing import Optional, Dict, Any
 
-from db import get_conn
+from db import get_conn, run_write
+from dao.user_dao import ensure_active_user
 
 
 def get_user_profile(user_id: int) -> Optional[Dict[str, Any]]:
@@ -57,9 +58,10 @@ def upsert_user_profile(user_id: int, data: Dict[str, Any]) -> None:
     user_id 기준으로 user_profiles 테이블에 INSERT 또는 UPDATE.
     이미 있으면 UPDATE, 없으면 INSERT.
     """
-    conn = get_conn()
-    cur = conn.cursor()
+    run_write(_upsert_user_profile, user_id, data)
+
 
+def _upsert_user_profile(cur, user_id: int, data: Dict[str, Any]) -> None:
     cur.execute(
         """
         INSERT INTO user_profiles (
@@ -98,6 +100,4 @@ def upsert_user_profile(user_id: int, data: Dict[str, Any]) -> None:
             data.get("profile_image"),
         ),
     )
-
-    conn.commit()
-    conn.close()
+    ensure_active_user(cur, user_id)
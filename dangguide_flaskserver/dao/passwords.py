@@ -0,0 +1,197 @@
+"""
+비밀번호 해시 (hashlib.scrypt, 메모리 하드 KDF).
+저장 형식: scrypt$<n>$<r>$<p>$<salt b64>$<hash b64>
+
+KDF 는 한 번에 수십 ms 걸리므로 요청 스레드에서 직접 돌리지 않고
+크기가 정해진 워커 풀에서 실행한다 (hashlib.scrypt 는 계산 중 GIL 을 놓음).
+대기 중인 작업이 너무 많으면 바로 PasswordBusy 를 던져 요청이 쌓이지 않게 한다.
+"""
+
+import base64
+import hashlib
+import hmac
+import os
+import secrets
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional, Tuple
+
+# ====================================
+# ⚙️ 비용 파라미터 (환경변수로 조정)
+# ====================================
+SCRYPT_N = int(os.getenv("PASSWORD_SCRYPT_N", str(2 ** 14)))
+SCRYPT_R = int(os.getenv("PASSWORD_SCRYPT_R", "8"))
+SCRYPT_P = int(os.getenv("PASSWORD_SCRYPT_P", "1"))
+SALT_BYTES = 16
+HASH_BYTES = 32
+
+PASSWORD_WORKERS = int(os.getenv("PASSWORD_WORKERS", str(os.cpu_count() or 2)))
+# 실행 중 + 대기 중 KDF 최대 개수 (넘으면 PasswordBusy → 503)
+PASSWORD_MAX_PENDING = int(os.getenv("PASSWORD_MAX_PENDING", str(PASSWORD_WORKERS * 8)))
+PASSWORD_WAIT_SEC = float(os.getenv("PASSWORD_WAIT_SEC", "5"))
+
+PREFIX = "scrypt"
+
+
+class PasswordBusy(Exception):
+    """KDF 워커 풀이 가득 참"""
+
+
+def _b64(raw: bytes) -> str:
+    return base64.b64encode(raw).decode("ascii")
+
+
+def _scrypt(password: str, salt: bytes, n: int, r: int, p: int) -> bytes:
+    # maxmem 기본값(32MB)은 n/r 을 올리면 부족하므로 필요한 만큼 + 여유
+    return hashlib.scrypt(
+        password.encode("utf-8"),
+        salt=salt, n=n, r=r, p=p,
+        maxmem=128 * n * r * (p + 2) + 1024 * 1024,
+        dklen=HASH_BYTES,
+    )
+
+
+def _hash_now(password: str) -> str:
+    salt = secrets.token_bytes(SALT_BYTES)
+    digest = _scrypt(password, salt, SCRYPT_N, SCRYPT_R, SCRYPT_P)
+    return f"{PREFIX}${SCRYPT_N}${SCRYPT_R}${SCRYPT_P}${_b64(salt)}${_b64(digest)}"
+
+
+def _verify_now(password: str, stored: str) -> Tuple[bool, bool]:
+    if not stored.startswith(PREFIX + "$"):
+        # 해시 도입 전 평문 행 → 맞으면 재해시 대상
+        return hmac.compare_digest(stored.encode("utf-8"), password.encode("utf-8")), True
+
+    try:
+        _, n, r, p, salt, digest = stored.split("$")
+        n, r, p = int(n), int(r), int(p)
+        expected = base64.b64decode(salt), base64.b64decode(digest)
+    except ValueError:
+        return False, False
+
+    actual = _scrypt(password, expected[0], n, r, p)
+    ok = hmac.compare_digest(actual, expected[1])
+    # 비용 파라미터를 올렸으면 로그인 성공 때 새 파라미터로 다시 저장
+    return ok, ok and (n, r, p) != (SCRYPT_N, SCRYPT_R, SCRYPT_P)
+
+
+# ====================================
+# 🧵 워커 풀
+# ====================================
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+_slots = threading.BoundedSemaphore(PASSWORD_MAX_PENDING)
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=PASSWORD_WORKERS, thread_name_prefix="kdf")
+    return _executor
+
+
+def _run(fn, *args):
+    if not _slots.acquire(timeout=PASSWORD_WAIT_SEC):
+        raise PasswordBusy()
+    try:
+        return _get_executor().submit(fn, *args).result()
+    finally:
+        _slots.release()
+
+
+def hash_password(password: str) -> str:
+    return _run(_hash_now, password)
+
+
+def verify_password(password: str, stored: Optional[str]) -> Tuple[bool, bool]:
+    """
+    return: (일치 여부, 다시 해시해서 저장해야 하는지)
+    stored 가 None(없는 사용자)이어도 같은 비용으로 계산해 응답 시간으로 존재 여부가 드러나지 않게 함
+    """
+    if stored is None:
+        _run(_verify_dummy, password)
+        return False, False
+    return _run(_verify_now, password, stored)
+
+
+_dummy: Optional[str] = None
+
+
+def _verify_dummy(password: str) -> None:
+    global _dummy
+    if _dummy is None:
+        _dummy = _hash_now(secrets.token_hex(16))
+    _verify_now(password, _dummy)
+
+
+def shutdown() -> None:
+    if _executor is not None:
+        _executor.shutdown(wait=False)
+
+
+# ====================================
+# 🚦 아이디별 로그인 시도 제한 (KDF 전에 거절)
+# ====================================
+# 토큰 버킷: 아이디마다 LOGIN_BURST 번까지 연속 시도, 이후 분당 LOGIN_PER_MINUTE 번 회복
+LOGIN_BURST = int(os.getenv("LOGIN_BURST", "5"))
+LOGIN_PER_MINUTE = float(os.getenv("LOGIN_PER_MINUTE", "5"))
+LOGIN_THROTTLE_MAX_KEYS = int(os.getenv("LOGIN_THROTTLE_MAX_KEYS", "100000"))
+
+
+class LoginThrottle:
+    def __init__(self, burst: int = LOGIN_BURST, per_minute: float = LOGIN_PER_MINUTE,
+                 max_keys: int = LOGIN_THROTTLE_MAX_KEYS):
+        self.burst = burst
+        self.rate = per_minute / 60.0
+        self.max_keys = max_keys
+        self._lock = threading.Lock()
+        # username → (남은 토큰, 마지막 갱신 시각)
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+        self.rejected = 0
+
+    def _refill(self, key: str, now: float) -> float:
+        tokens, updated = self._buckets.get(key, (float(self.burst), now))
+        return min(float(self.burst), tokens + (now - updated) * self.rate)
+
+    def acquire(self, username: str) -> float:
+        """시도 1회 차감. 허용이면 0, 거절이면 다시 시도 가능할 때까지 초"""
+        key = username.lower()
+        now = time.monotonic()
+        with self._lock:
+            tokens = self._refill(key, now)
+            if tokens < 1.0:
+                self._buckets[key] = (tokens, now)
+                self.rejected += 1
+                return (1.0 - tokens) / self.rate
+
+            self._buckets[key] = (tokens - 1.0, now)
+            if len(self._buckets) > self.max_keys:
+                self._prune(now)
+            return 0.0
+
+    def reset(self, username: str) -> None:
+        """로그인 성공 → 해당 아이디 기록 삭제"""
+        with self._lock:
+            self._buckets.pop(username.lower(), None)
+
+    def _prune(self, now: float) -> None:
+        # 이미 가득 찬(= 기록할 필요 없는) 버킷부터 제거
+        full = [k for k in self._buckets if self._refill(k, now) >= self.burst]
+        for k in full:
+            del self._buckets[k]
+
+        # 그래도 넘치면 오래된 순으로 절반 제거
+        if len(self._buckets) > self.max_keys:
+            oldest = sorted(self._buckets, key=lambda k: self._buckets[k][1])
+            for k in oldest[:len(oldest) // 2]:
+                del self._buckets[k]
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"tracked": len(self._buckets), "rejected": self.rejected}
+
+
+login_throttle = LoginThrottle()
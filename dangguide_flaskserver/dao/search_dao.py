@@ -0,0 +1,242 @@
+# dangguide_flaskserver/dao/search_dao.py
+"""
+게시글/댓글 전문 검색 (posts_fts / comments_fts, trigram 토크나이저).
+trigram 은 3글자 이상 검색어만 색인으로 찾을 수 있어서,
+'산책' 같은 2글자 이하 검색어만 있으면 LIKE 로 최신 글부터 훑는다.
+한국어는 2글자 단어가 흔하므로 이 경로는 최신 SEARCH_LIKE_SCAN_POSTS 개 글까지만 훑는다
+(글/댓글이 아무리 많아도 검색 1회 비용이 일정, 그보다 오래된 글은 3글자 이상 단어로 찾아야 함).
+"""
+
+import html
+import os
+import re
+from typing import Dict, List, Tuple
+
+from db import get_conn
+from dao.like_buffer import like_buffer
+
+MIN_TRIGRAM_LEN = 3
+# 2글자 이하 검색어만 있을 때 LIKE 로 훑는 최신 글 수
+SEARCH_LIKE_SCAN_POSTS = int(os.getenv("SEARCH_LIKE_SCAN_POSTS", "5000"))
+SNIPPET_TOKENS = 16
+
+# 스니펫은 본문을 HTML 이스케이프한 뒤 일치 부분만 <b> 로 감싼다.
+# SQL 에서는 본문에 나올 수 없는 제어문자로 표시해두고 나중에 치환
+_MARK_OPEN = "\x02"
+_MARK_CLOSE = "\x03"
+
+
+def _terms(query: str) -> List[str]:
+    return [t for t in query.split() if t]
+
+
+def _match_expr(terms: List[str]) -> str:
+    # 사용자 입력을 FTS5 문법으로 해석하지 않도록 각 단어를 문자열로 감싸고 AND
+    return " ".join('"' + t.replace('"', '""') + '"' for t in terms)
+
+
+def _render_snippet(marked: str) -> str:
+    return (
+        html.escape(marked or "", quote=False)
+        .replace(_MARK_OPEN, "<b>")
+        .replace(_MARK_CLOSE, "</b>")
+    )
+
+
+def _like_pattern(term: str) -> str:
+    # 검색어의 % _ 는 와일드카드가 아니라 글자로 (SQL 쪽은 ESCAPE '\')
+    escaped = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def _short_terms_filter(terms: List[str]) -> Tuple[str, List[str]]:
+    """trigram 으로 못 찾는 2글자 이하 단어 조건 (글 제목/본문 또는 댓글에 포함)"""
+    cond = " AND ".join(
+        "(p.title LIKE ? ESCAPE '\\' OR p.content LIKE ? ESCAPE '\\'"
+        " OR EXISTS (SELECT 1 FROM comments c WHERE c.post_id = p.id AND c.content LIKE ? ESCAPE '\\'))"
+        for _ in terms
+    )
+    args = [a for t in terms for a in (_like_pattern(t),) * 3]
+    return cond, args
+
+
+def _row_to_result(r) -> Dict:
+    return {
+        "id": r["id"],
+        "title": r["title"],
+        "created_at": r["created_at"],
+        "author_name": r["author_name"],
+        "likes": like_buffer.like_count(r["id"], r["likes"]),
+        "comments": r["comments"],
+        "snippet": _render_snippet(r["snippet"]),
+        "matched_in": r["matched_in"],
+    }
+
+
+def _make_snippet(text: str, terms: List[str], width: int = 40) -> str:
+    """LIKE 경로용 간단한 스니펫 (첫 일치 위치 앞뒤 + 강조)"""
+    text = text or ""
+    lower = text.lower()
+    pos = min((lower.find(t.lower()) for t in terms if lower.find(t.lower()) >= 0), default=-1)
+    if pos < 0:
+        return text[:width * 2]
+
+    start = max(0, pos - width)
+    piece = text[start:pos + width]
+    # 대소문자 무시, 긴 단어부터 한 번에 (짧은 단어가 이미 감싼 부분 안에서 또 일치하지 않게)
+    pattern = re.compile("|".join(re.escape(t) for t in sorted(terms, key=len, reverse=True)), re.IGNORECASE)
+    piece = pattern.sub(lambda m: f"{_MARK_OPEN}{m.group(0)}{_MARK_CLOSE}", piece)
+    return _render_snippet(("…" if start > 0 else "") + piece + ("…" if pos + width < len(text) else ""))
+
+
+def search_posts(query: str, limit: int, offset: int) -> Tuple[List[Dict], bool]:
+    """
+    제목/본문/댓글에서 검색해 게시글 단위로 묶어 관련도 순 정렬.
+    return: (results, 다음 페이지 존재 여부)
+    """
+    terms = _terms(query)
+    if not terms:
+        return [], False
+
+    long_terms = [t for t in terms if len(t) >= MIN_TRIGRAM_LEN]
+    short_terms = [t for t in terms if len(t) < MIN_TRIGRAM_LEN]
+    if long_terms:
+        # 긴 단어로 색인 검색 후, 짧은 단어는 후보 글에만 LIKE 로 확인
+        rows = _search_fts(long_terms, short_terms, limit + 1, offset)
+    else:
+        rows = _search_like(terms, limit + 1, offset)
+
+    has_more = len(rows) > limit
+    return rows[:limit], has_more
+
+
+def _search_fts(terms: List[str], short_terms: List[str], limit: int, offset: int) -> List[Dict]:
+    conn = get_conn()
+    cur = conn.cursor()
+
+    expr = _match_expr(terms)
+    short_cond, short_args = _short_terms_filter(short_terms)
+    short_join = f"JOIN posts p ON p.id = best.post_id WHERE {short_cond}" if short_terms else ""
+
+    # 1) 점수만으로 페이지를 먼저 자르고
+    # 2) snippet() 은 그 페이지 행에만 계산 (흔한 단어면 일치 행이 수만 개라 비쌈)
+    # bm25: 작을수록 관련도 높음. 제목 가중치 10, 본문 1
+    cur.execute(
+        f"""
+        WITH hits AS (
+            SELECT rowid AS post_id, NULL AS comment_id, bm25(posts_fts, 10.0, 1.0) AS score
+            FROM posts_fts
+            WHERE posts_fts MATCH ?
+
+            UNION ALL
+
+            SELECT c.post_id, c.id, bm25(comments_fts)
+            FROM comments_fts
+            JOIN comments c ON c.id = comments_fts.rowid
+            WHERE comments_fts MATCH ?
+        ),
+        best AS (
+            -- 글마다 가장 관련도 높은 일치 하나 (MIN 과 같은 행의 comment_id 사용)
+            SELECT post_id, comment_id, MIN(score) AS score
+            FROM hits
+            GROUP BY post_id
+        ),
+        page AS (
+            SELECT best.post_id, best.comment_id, best.score
+            FROM best
+            {short_join}
+            ORDER BY best.score ASC, best.post_id DESC
+            LIMIT ? OFFSET ?
+        )
+        SELECT
+            p.id,
+            p.title,
+            p.created_at,
+            u.username AS author_name,
+            COALESCE(p.like_count, 0)    AS likes,
+            COALESCE(p.comment_count, 0) AS comments,
+            CASE WHEN page.comment_id IS NULL THEN 'post' ELSE 'comment' END AS matched_in,
+            CASE WHEN page.comment_id IS NULL THEN (
+                SELECT snippet(posts_fts, -1, ?, ?, '…', ?)
+                FROM posts_fts WHERE posts_fts MATCH ? AND rowid = page.post_id
+            ) ELSE (
+                SELECT snippet(comments_fts, 0, ?, ?, '…', ?)
+                FROM comments_fts WHERE comments_fts MATCH ? AND rowid = page.comment_id
+            ) END AS snippet
+        FROM page
+        JOIN posts p ON p.id = page.post_id
+        JOIN users u ON u.id = p.user_id
+        ORDER BY page.score ASC, page.post_id DESC
+        """,
+        (
+            expr, expr,
+            *short_args,
+            limit, offset,
+            _MARK_OPEN, _MARK_CLOSE, SNIPPET_TOKENS, expr,
+            _MARK_OPEN, _MARK_CLOSE, SNIPPET_TOKENS, expr,
+        ),
+    )
+    rows = cur.fetchall()
+    conn.close()
+
+    return [_row_to_result(r) for r in rows]
+
+
+def _search_like(terms: List[str], limit: int, offset: int) -> List[Dict]:
+    """2글자 이하 검색어만 있을 때: 색인 없이 최신 SEARCH_LIKE_SCAN_POSTS 개 글에서 부분 일치"""
+    conn = get_conn()
+    cur = conn.cursor()
+
+    # 훑을 범위의 가장 오래된 글 id (PK 역순으로 N 번째)
+    cur.execute("SELECT id FROM posts ORDER BY id DESC LIMIT 1 OFFSET ?", (SEARCH_LIKE_SCAN_POSTS - 1,))
+    row = cur.fetchone()
+    floor_id = row["id"] if row else 0
+
+    cond, args = _short_terms_filter(terms)
+    comment_cond = " OR ".join("c.content LIKE ? ESCAPE '\\'" for _ in terms)
+    comment_args = [_like_pattern(t) for t in terms]
+
+    cur.execute(
+        f"""
+        SELECT
+            p.id,
+            p.title,
+            p.content,
+            p.created_at,
+            u.username AS author_name,
+            COALESCE(p.like_count, 0)    AS likes,
+            COALESCE(p.comment_count, 0) AS comments,
+            (
+                SELECT c.content FROM comments c
+                WHERE c.post_id = p.id AND ({comment_cond})
+                ORDER BY c.id LIMIT 1
+            ) AS comment_hit
+        FROM posts p
+        JOIN users u ON u.id = p.user_id
+        WHERE p.id >= ? AND {cond}
+        ORDER BY p.id DESC
+        LIMIT ? OFFSET ?
+        """,
+        (*comment_args, floor_id, *args, limit, offset),
+    )
+    rows = cur.fetchall()
+    conn.close()
+
+    results: List[Dict] = []
+    for r in rows:
+        post_text = f"{r['title']} {r['content'] or ''}"
+        in_post = any(t.lower() in post_text.lower() for t in terms) or not r["comment_hit"]
+        source = post_text if in_post else r["comment_hit"]
+        results.append(
+            {
+                "id": r["id"],
+                "title": r["title"],
+                "created_at": r["created_at"],
+                "author_name": r["author_name"],
+                "likes": like_buffer.like_count(r["id"], r["likes"]),
+                "comments": r["comments"],
+                "snippet": _make_snippet(source, terms),
+                "matched_in": "post" if in_post else "comment",
+            }
+        )
+    return results
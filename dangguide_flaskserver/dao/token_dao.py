@@ -0,0 +1,59 @@
+# dangguide_flaskserver/dao/token_dao.py
+"""액세스 토큰 폐기 목록 저장소 (검증은 auth.py 의 메모리 사본으로만 함)"""
+
+from typing import Dict, Tuple
+
+from db import get_conn, run_write
+
+
+def load_revocations(now: int) -> Tuple[Dict[str, int], Dict[int, int]]:
+    """
+    만료 안 된 폐기 토큰 {jti: expires_at}, 사용자별 {user_id: not_before}.
+    요청 처리 중(before_request)에 불리므로 읽기만 함 (정리는 prune_revocations)
+    """
+    conn = get_conn()
+    cur = conn.cursor()
+
+    cur.execute("SELECT jti, expires_at FROM revoked_tokens WHERE expires_at > ?", (now,))
+    tokens = {row["jti"]: row["expires_at"] for row in cur.fetchall()}
+
+    cur.execute("SELECT user_id, not_before FROM user_token_cutoffs")
+    cutoffs = {row["user_id"]: row["not_before"] for row in cur.fetchall()}
+
+    conn.close()
+    return tokens, cutoffs
+
+
+def prune_revocations(now: int) -> int:
+    """만료된 폐기 기록 삭제 (앱 시작 시, flask prune_tokens). return: 지운 개수"""
+    return run_write(_prune_revocations, now)
+
+
+def _prune_revocations(cur, now: int) -> int:
+    cur.execute("DELETE FROM revoked_tokens WHERE expires_at <= ?", (now,))
+    return cur.rowcount
+
+
+def save_revoked_token(jti: str, user_id: int, expires_at: int) -> None:
+    run_write(_save_revoked_token, jti, user_id, expires_at)
+
+
+def _save_revoked_token(cur, jti: str, user_id: int, expires_at: int) -> None:
+    cur.execute(
+        "INSERT OR IGNORE INTO revoked_tokens (jti, user_id, expires_at) VALUES (?, ?, ?)",
+        (jti, user_id, expires_at),
+    )
+
+
+def save_user_cutoff(user_id: int, not_before: int) -> None:
+    run_write(_save_user_cutoff, user_id, not_before)
+
+
+def _save_user_cutoff(cur, user_id: int, not_before: int) -> None:
+    cur.execute(
+        """
+        INSERT INTO user_token_cutoffs (user_id, not_before) VALUES (?, ?)
+        ON CONFLICT(user_id) DO UPDATE SET not_before = MAX(not_before, excluded.not_before)
+        """,
+        (user_id, not_before),
+    )
@@ -0,0 +1,53 @@
+from typing import Dict, Iterable, List, Tuple
+from db import get_conn, run_write
+
+# SQLite 변수 개수 제한 안쪽으로 나눠서 조회
+_CHUNK = 500
+
+
+def get_cached_translations(texts: Iterable[str], target_lang: str) -> Dict[str, str]:
+    """원문 목록 중 캐시에 있는 것만 {원문: 번역문} 으로 반환"""
+    texts = list(texts)
+    found: Dict[str, str] = {}
+    if not texts:
+        return found
+
+    conn = get_conn()
+    cur = conn.cursor()
+
+    for i in range(0, len(texts), _CHUNK):
+        chunk = texts[i:i + _CHUNK]
+        placeholders = ",".join("?" * len(chunk))
+        cur.execute(
+            f"""
+            SELECT source_text, translated_text
+            FROM translation_cache
+            WHERE target_lang = ? AND source_text IN ({placeholders})
+            """,
+            (target_lang, *chunk),
+        )
+        for row in cur.fetchall():
+            found[row["source_text"]] = row["translated_text"]
+
+    conn.close()
+    return found
+
+
+def save_translations(pairs: List[Tuple[str, str]], target_lang: str) -> None:
+    """(원문, 번역문) 목록을 한 트랜잭션으로 저장"""
+    if not pairs:
+        return
+
+    run_write(_save_translations, pairs, target_lang)
+
+
+def _save_translations(cur, pairs: List[Tuple[str, str]], target_lang: str) -> None:
+    cur.executemany(
+        """
+        INSERT INTO translation_cache (source_text, target_lang, translated_text)
+        VALUES (?, ?, ?)
+        ON CONFLICT (source_text, target_lang) DO UPDATE SET
+            translated_text = excluded.translated_text
+        """,
+        ((src, target_lang, dst) for src, dst in pairs),
+    )
@@ -1,8 +1,36 @@
 from __future__ import annotations
 
+import os
+import sqlite3
+import time
 from typing import Optional, Dict, Any
 
-from db import get_conn
+from db import WriteTimeout, get_conn, run_write
+from dao.passwords import hash_password, verify_password
+from dao.username_index import username_index
+
+# 다른 워커 프로세스에서 가입한 아이디를 반영하는 주기 (id 증분 조회)
+USERNAME_INDEX_REFRESH_SEC = float(os.getenv("USERNAME_INDEX_REFRESH_SEC", "5"))
+_index_refreshed_at = 0.0
+
+
+class UsernameTaken(Exception):
+  """INSERT 가 UNIQUE(username) 에 걸림 (확인과 INSERT 사이에 다른 요청/워커가 먼저 가입)"""
+
+
+class InactiveUser(Exception):
+  """없는 사용자이거나 탈퇴 처리 중(deleted_at)인 사용자의 쓰기 요청"""
+
+
+def ensure_active_user(cur, user_id: int) -> None:
+  """
+  쓰기 DAO 용: 같은 트랜잭션 안에서 사용자 확인, 아니면 InactiveUser (호출한 쪽이 롤백).
+  첫 INSERT/UPDATE/DELETE 뒤에 불러야 쓰기 락을 잡은 최신 상태를 봄
+  → 탈퇴 표시와 엇갈려 리퍼가 지운 뒤에 글/댓글이 새로 생기지 않음
+  """
+  cur.execute("SELECT 1 FROM users WHERE id = ? AND deleted_at IS NULL", (user_id,))
+  if cur.fetchone() is None:
+    raise InactiveUser(user_id)
 
 
 def find_user_by_username(username: str) -> Optional[Dict[str, Any]]:
@@ -10,7 +38,7 @@ def find_user_by_username(username: str) -> Optional[Dict[str, Any]]:
   cur = conn.cursor()
 
   cur.execute(
-    "SELECT id, username, password, created_at FROM users WHERE username = ?",
+    "SELECT id, username, password, created_at FROM users WHERE username = ? AND deleted_at IS NULL",
     (username,),
   )
   row = cur.fetchone()
@@ -27,86 +55,172 @@ def find_user_by_username(username: str) -> Optional[Dict[str, Any]]:
   }
 
 
-def create_user(username: str, password: str) -> Optional[Dict[str, Any]]:
+def user_exists(username: str) -> bool:
   """
-  단순 예제용: 비밀번호 평문 저장.
-  실제 서비스라면 반드시 해시 사용해야 함.
+  password 컬럼을 읽지 않고 UNIQUE 인덱스만으로 존재 여부 확인.
+  탈퇴 처리 중(deleted_at)인 계정도 행이 지워질 때까지는 아이디를 차지함
   """
   conn = get_conn()
   cur = conn.cursor()
 
-  try:
-    cur.execute(
-      """
-      INSERT INTO users (username, password)
-      VALUES (?, ?)
-      """,
-      (username, password),
-    )
-    conn.commit()
+  cur.execute("SELECT EXISTS (SELECT 1 FROM users WHERE username = ?)", (username,))
+  exists = bool(cur.fetchone()[0])
+  conn.close()
+  return exists
 
-    user_id = cur.lastrowid
 
-    return {
-      "id": user_id,
-      "username": username,
-    }
+def load_username_index() -> None:
+  """서버 시작 시 전체 아이디로 Bloom 필터 생성"""
+  global _index_refreshed_at
+
+  conn = get_conn()
+  cur = conn.cursor()
+  cur.execute("SELECT id, username FROM users")
+  username_index.load(cur.fetchall())
+  conn.close()
+
+  _index_refreshed_at = time.monotonic()
+
+
+def _refresh_username_index() -> None:
+  """마지막으로 반영한 id 이후 가입자만 추가"""
+  global _index_refreshed_at
+  if time.monotonic() - _index_refreshed_at < USERNAME_INDEX_REFRESH_SEC:
+    return
+  _index_refreshed_at = time.monotonic()
+
+  conn = get_conn()
+  cur = conn.cursor()
+  cur.execute("SELECT id, username FROM users WHERE id > ?", (username_index.max_user_id,))
+  rows = cur.fetchall()
+  conn.close()
+
+  for user_id, username in rows:
+    username_index.add(username, user_id)
+
+
+def is_username_taken(username: str) -> bool:
+  """
+  Bloom 필터에 없으면 DB 조회 없이 False,
+  최근 확인된 아이디면 True, 그 외에만 user_exists 로 확인
+  """
+  if not username_index.loaded:
+    return user_exists(username)
+
+  _refresh_username_index()
+
+  known = username_index.lookup(username)
+  if known is not None:
+    return known
+
+  exists = user_exists(username)
+  username_index.confirm(username, exists)
+  return exists
+
+
+def create_user(username: str, password: str) -> Optional[Dict[str, Any]]:
+  """
+  비밀번호는 scrypt 해시로 저장 (dao/passwords.py).
+  KDF 는 DB 연결을 잡기 전에 워커 풀에서 계산.
+  이미 있는 아이디면 UsernameTaken, 그 외 실패는 None
+  """
+  password_hash = hash_password(password)
+
+  try:
+    user_id = run_write(_insert_user, username, password_hash)
+  except sqlite3.IntegrityError:
+    # 아이디 인덱스가 아직 모르는 가입자 (다른 워커) → 바로 반영
+    username_index.add(username)
+    raise UsernameTaken(username)
+  except WriteTimeout:
+    raise
   except Exception:
-    conn.rollback()
     return None
-  finally:
-    conn.close()
+
+  username_index.add(username, user_id)
+  return {
+    "id": user_id,
+    "username": username,
+  }
+
+
+def _insert_user(cur, username: str, password_hash: str) -> int:
+  cur.execute(
+    """
+    INSERT INTO users (username, password)
+    VALUES (?, ?)
+    """,
+    (username, password_hash),
+  )
+  return cur.lastrowid
+
+
+def _rehash_password(user_id: int, old_stored: str, password: str) -> None:
+  """평문/옛 파라미터 해시 → 현재 파라미터 해시 (다른 요청이 먼저 바꿨으면 그대로 둠)"""
+  new_hash = hash_password(password)
+  run_write(_update_password, user_id, old_stored, new_hash)
+
+
+def _update_password(cur, user_id: int, old_stored: str, new_hash: str) -> None:
+  cur.execute(
+    "UPDATE users SET password = ? WHERE id = ? AND password = ?",
+    (new_hash, user_id, old_stored),
+  )
 
 
 def validate_login(username: str, password: str) -> Optional[Dict[str, Any]]:
   user = find_user_by_username(username)
-  if user is None:
-    return None
 
-  # 평문 비교 (예제용)
-  if user["password"] != password:
+  # 없는 아이디도 같은 KDF 비용 (응답 시간으로 가입 여부가 드러나지 않게)
+  ok, needs_rehash = verify_password(password, user["password"] if user else None)
+  if not ok:
     return None
 
+  if needs_rehash:
+    _rehash_password(user["id"], user["password"], password)
+
   return {
     "id": user["id"],
     "username": user["username"],
   }
 
-def delete_user_by_credentials(username: str, password: str) -> bool:
+def delete_user_by_credentials(username: str, password: str) -> Optional[int]:
     """
-    username + password 확인 후 회원 삭제.
-    성공 시 True, 실패 시 False 반환.
+    username + password 확인 후 탈퇴 표시(deleted_at).
+    게시글/댓글/좋아요/이미지는 dao/account_reaper.py 가 백그라운드에서 나눠 삭제.
+    성공 시 user_id, 실패 시 None 반환.
     """
+    # 1) 유저 조회 (비밀번호 검증 동안 풀 커넥션을 잡고 있지 않도록 바로 반납)
     conn = get_conn()
     cur = conn.cursor()
-
-    # 1) 유저 조회
     cur.execute(
       """
       SELECT id, password
       FROM users
-      WHERE username = ?
+      WHERE username = ? AND deleted_at IS NULL
       """,
       (username,),
     )
     row = cur.fetchone()
+    conn.close()
+
+    user_id, stored_pw = row if row else (None, None)
 
-    if not row:
-      conn.close()
-      return False
+    # 비밀번호 확인 (없는 아이디도 같은 KDF 비용)
+    ok, _ = verify_password(password, stored_pw)
+    if not ok:
+      return None
 
-    user_id, stored_pw = row
+    # 2) 탈퇴 표시만 (연관 행을 한 번에 지우면 쓰기 락을 오래 잡음)
+    #    검증하는 사이 비밀번호가 바뀌었거나 이미 탈퇴했으면 실패
+    if not run_write(_mark_deleted, user_id, stored_pw):
+      return None
+    return user_id
 
-    # 비밀번호 확인 (지금은 평문 저장 기준. 나중에 해시 쓰면 여기서 check_password_hash 등으로 변경)
-    if stored_pw != password:
-      conn.close()
-      return False
 
-    # 2) 삭제 (ON DELETE CASCADE로 posts, comments, post_likes, user_profiles 같이 삭제)
+def _mark_deleted(cur, user_id: int, stored_pw: str) -> bool:
     cur.execute(
-      "DELETE FROM users WHERE id = ?",
-      (user_id,),
+      "UPDATE users SET deleted_at = CURRENT_TIMESTAMP WHERE id = ? AND password = ? AND deleted_at IS NULL",
+      (user_id, stored_pw),
     )
-    conn.commit()
-    conn.close()
-    return True
\ No newline at end of file
+    return cur.rowcount == 1
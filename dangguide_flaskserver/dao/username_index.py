@@ -0,0 +1,126 @@
+"""
+아이디 존재 여부 메모리 인덱스 (Bloom 필터 + 최근 확인된 아이디 LRU).
+회원가입 화면은 글자 칠 때마다 /api/users/check 를 부르므로
+  - Bloom 필터에 없으면 "확실히 없음" → SQLite 조회 없이 응답
+  - 최근에 있다고 확인된 아이디면 LRU 에서 바로 응답
+  - 나머지(필터 적중)만 DB 에 EXISTS 확인
+DB 접근은 dao/user_dao.py 에서 하고, 여기는 메모리 자료구조만 둔다.
+"""
+
+import hashlib
+import math
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable
+
+USERNAME_BLOOM_CAPACITY = int(os.getenv("USERNAME_BLOOM_CAPACITY", "100000"))
+USERNAME_BLOOM_FP_RATE = float(os.getenv("USERNAME_BLOOM_FP_RATE", "0.01"))
+USERNAME_LRU_SIZE = int(os.getenv("USERNAME_LRU_SIZE", "4096"))
+
+
+class BloomFilter:
+    """삭제 불가. 거짓 양성(있다고 했는데 없음)만 있고 거짓 음성은 없음"""
+
+    def __init__(self, capacity: int, fp_rate: float):
+        capacity = max(capacity, 1)
+        self.size = max(8, int(-capacity * math.log(fp_rate) / (math.log(2) ** 2)))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, key: str):
+        # 128비트 해시 하나를 둘로 나눠 이중 해싱 (k 개 위치)
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, key: str) -> None:
+        for pos in self._positions(key):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def __contains__(self, key: str) -> bool:
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+
+class UsernameIndex:
+    def __init__(self, capacity: int = USERNAME_BLOOM_CAPACITY, fp_rate: float = USERNAME_BLOOM_FP_RATE,
+                 lru_size: int = USERNAME_LRU_SIZE):
+        self.capacity = capacity
+        self.fp_rate = fp_rate
+        self.lru_size = lru_size
+        self._lock = threading.Lock()
+        self._bloom = BloomFilter(capacity, fp_rate)
+        self._recent: "OrderedDict[str, None]" = OrderedDict()
+        self.loaded = False
+        self.max_user_id = 0  # 여기까지의 users.id 는 필터에 반영됨 (증분 갱신 기준)
+        self._stats = {"negative": 0, "lru_hit": 0, "db_check": 0, "false_positive": 0}
+
+    def load(self, rows: Iterable[tuple]) -> None:
+        """(id, username) 전체로 새로 만듦. 예상 크기의 2배로 필터 크기를 잡음"""
+        rows = list(rows)
+        bloom = BloomFilter(max(self.capacity, len(rows) * 2), self.fp_rate)
+        max_id = 0
+        for user_id, username in rows:
+            bloom.add(username)
+            max_id = max(max_id, user_id)
+
+        with self._lock:
+            self._bloom = bloom
+            self._recent.clear()
+            self.max_user_id = max_id
+            self.loaded = True
+
+    def add(self, username: str, user_id: int = 0) -> None:
+        with self._lock:
+            self._bloom.add(username)
+            self._remember(username)
+            self.max_user_id = max(self.max_user_id, user_id)
+
+    def discard(self, username: str) -> None:
+        # Bloom 필터에서는 못 지움 → 이후 조회는 DB 확인으로 넘어가 정확히 "없음"
+        with self._lock:
+            self._recent.pop(username, None)
+
+    def _remember(self, username: str) -> None:
+        self._recent[username] = None
+        self._recent.move_to_end(username)
+        if len(self._recent) > self.lru_size:
+            self._recent.popitem(last=False)
+
+    def lookup(self, username: str):
+        """False: 확실히 없음, True: 최근 확인된 아이디, None: DB 확인 필요"""
+        with self._lock:
+            if username not in self._bloom:
+                self._stats["negative"] += 1
+                return False
+            if username in self._recent:
+                self._recent.move_to_end(username)
+                self._stats["lru_hit"] += 1
+                return True
+            self._stats["db_check"] += 1
+            return None
+
+    def confirm(self, username: str, exists: bool) -> None:
+        """DB 확인 결과 반영"""
+        with self._lock:
+            if exists:
+                self._remember(username)
+            else:
+                self._stats["false_positive"] += 1
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            return {
+                **self._stats,
+                "loaded": self.loaded,
+                "bloom_items": self._bloom.count,
+                "bloom_bits": self._bloom.size,
+                "bloom_hashes": self._bloom.hashes,
+                "lru_items": len(self._recent),
+            }
+
+
+username_index = UsernameIndex()
@@ -1,130 +1,435 @@
 # db.py
+import atexit
+import os
+import queue
 import sqlite3
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeout
 from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from flask import g, has_app_context, jsonify
+
+from migrations import run_migrations
 
 # 같은 폴더에 DB 파일 생성
 DB_PATH = Path(__file__).parent / "dangguide_server.db"
 
+# ---- 커넥션 풀 / PRAGMA 설정 (.env 로 조정 가능) ----
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "8"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "10"))      # 커넥션 대기 최대 시간(초)
+DB_BUSY_TIMEOUT_MS = int(os.getenv("DB_BUSY_TIMEOUT_MS", "5000"))
+DB_SYNCHRONOUS = os.getenv("DB_SYNCHRONOUS", "NORMAL")           # WAL 에서는 NORMAL 로 충분
+DB_MMAP_SIZE = int(os.getenv("DB_MMAP_SIZE", str(256 * 1024 * 1024)))
+DB_CACHE_SIZE_KB = int(os.getenv("DB_CACHE_SIZE_KB", "16384"))   # 커넥션당 페이지 캐시
+
+# ---- 단일 writer 큐 (DB_WRITE_QUEUE=1 일 때만) ----
+DB_WRITE_QUEUE = os.getenv("DB_WRITE_QUEUE", "0") == "1"
+DB_WRITE_BATCH_MAX = int(os.getenv("DB_WRITE_BATCH_MAX", "64"))      # 한 트랜잭션에 묶는 최대 작업 수
+DB_WRITE_LINGER_MS = float(os.getenv("DB_WRITE_LINGER_MS", "0"))     # 묶을 작업을 더 기다리는 시간
+DB_WRITE_QUEUE_MAX = int(os.getenv("DB_WRITE_QUEUE_MAX", "1000"))    # 대기열 상한 (넘으면 에러)
+DB_WRITE_TIMEOUT = float(os.getenv("DB_WRITE_TIMEOUT", "30"))        # 호출자가 결과를 기다리는 최대 시간
 
-def get_conn():
-    conn = sqlite3.connect(DB_PATH)
+
+def _connect() -> sqlite3.Connection:
+    # 풀에서 여러 스레드가 번갈아 쓰므로 check_same_thread 끔 (동시에 한 스레드만 사용)
+    conn = sqlite3.connect(
+        DB_PATH,
+        timeout=DB_BUSY_TIMEOUT_MS / 1000,
+        check_same_thread=False,
+    )
     conn.row_factory = sqlite3.Row  # dict처럼 접근 가능
+
+    # WAL: 읽기가 쓰기를 막지 않음 (journal_mode 는 DB 파일에 영구 저장됨)
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute(f"PRAGMA synchronous = {DB_SYNCHRONOUS}")
+    conn.execute(f"PRAGMA busy_timeout = {DB_BUSY_TIMEOUT_MS}")
+    conn.execute(f"PRAGMA mmap_size = {DB_MMAP_SIZE}")
+    conn.execute(f"PRAGMA cache_size = -{DB_CACHE_SIZE_KB}")
+    conn.execute("PRAGMA temp_store = MEMORY")
+    # FK 제약 검사 (SQLite 는 커넥션마다 켜야 함)
+    conn.execute("PRAGMA foreign_keys = ON")
     return conn
 
 
-def init_db():
+class ConnectionPool:
+    """
+    SQLite 커넥션 풀.
+    매 호출마다 connect/close 하지 않고 열린 커넥션을 재사용한다.
+    """
+
+    def __init__(self, max_size: int = DB_POOL_SIZE, timeout: float = DB_POOL_TIMEOUT):
+        self.max_size = max_size
+        self.timeout = timeout
+        self._idle: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._opened = 0
+
+        # 통계
+        self._checkouts = 0
+        self._waits = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        self._timeouts = 0
+
+    def acquire(self) -> sqlite3.Connection:
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            conn = None
+
+        if conn is None:
+            with self._lock:
+                can_open = self._opened < self.max_size
+                if can_open:
+                    self._opened += 1
+            if can_open:
+                try:
+                    conn = _connect()
+                except Exception:
+                    with self._lock:
+                        self._opened -= 1
+                    raise
+            else:
+                # 풀이 꽉 찼으면 반납될 때까지 대기
+                started = time.perf_counter()
+                try:
+                    conn = self._idle.get(timeout=self.timeout)
+                except queue.Empty:
+                    with self._lock:
+                        self._timeouts += 1
+                    raise RuntimeError("DB 커넥션 풀 대기 시간 초과")
+                waited = time.perf_counter() - started
+                with self._lock:
+                    self._waits += 1
+                    self._wait_total += waited
+                    self._wait_max = max(self._wait_max, waited)
+
+        with self._lock:
+            self._checkouts += 1
+        return conn
+
+    def release(self, conn: sqlite3.Connection) -> None:
+        # 커밋 안 된 트랜잭션이 다음 사용자에게 넘어가지 않도록
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+        except sqlite3.Error:
+            self._discard(conn)
+            return
+        self._idle.put(conn)
+
+    def _discard(self, conn: sqlite3.Connection) -> None:
+        try:
+            conn.close()
+        finally:
+            with self._lock:
+                self._opened -= 1
+
+    def close_all(self) -> None:
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(conn)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            idle = self._idle.qsize()
+            return {
+                "pool_size": self.max_size,
+                "open": self._opened,
+                "idle": idle,
+                "in_use": self._opened - idle,
+                "checkouts": self._checkouts,
+                "waits": self._waits,
+                "wait_avg_ms": round(self._wait_total / self._waits * 1000, 3) if self._waits else 0.0,
+                "wait_max_ms": round(self._wait_max * 1000, 3),
+                "timeouts": self._timeouts,
+            }
+
+
+pool = ConnectionPool()
+
+
+class PooledConnection:
+    """
+    sqlite3.Connection 래퍼.
+    DAO 에서 기존처럼 conn.close() 를 호출하면 실제로 닫지 않고 풀에 반납한다.
+    요청(app context) 안에서는 요청 끝날 때 teardown 에서 반납한다.
+    """
+
+    def __init__(self, conn: sqlite3.Connection, bound: bool):
+        self._conn = conn
+        self._bound = bound
+        self._released = False
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def __enter__(self):
+        return self._conn.__enter__()
+
+    def __exit__(self, *exc):
+        return self._conn.__exit__(*exc)
+
+    def close(self) -> None:
+        if self._released:
+            return
+        self._released = True
+        if self._bound:
+            # 같은 요청의 다음 DAO 호출이 그대로 쓰도록, 열린 트랜잭션만 정리
+            if self._conn.in_transaction:
+                self._conn.rollback()
+            return
+        pool.release(self._conn)
+
+
+def get_conn() -> PooledConnection:
+    # Flask 요청 처리 중이면 요청 단위로 커넥션 하나를 공유
+    if has_app_context():
+        conn = g.get("_db_conn")
+        if conn is None:
+            conn = pool.acquire()
+            g._db_conn = conn
+        return PooledConnection(conn, bound=True)
+
+    return PooledConnection(pool.acquire(), bound=False)
+
+
+def release_request_conn(exc=None) -> None:
+    conn = g.pop("_db_conn", None)
+    if conn is not None:
+        pool.release(conn)
+
+
+def init_app(app) -> None:
+    """요청 종료(app context teardown) 시 커넥션을 풀에 반납하도록 등록"""
+    app.teardown_appcontext(release_request_conn)
+
+    @app.errorhandler(WriteTimeout)
+    def write_timeout(e):
+        if e.maybe_committed:
+            # 반영됐을 수도 있음 → 클라이언트는 그대로 재시도하지 말고 결과를 다시 조회
+            return jsonify({"ok": False, "error": "쓰기 처리 지연 (반영 여부 확인 필요)", "maybe_committed": True}), 504
+        return jsonify({"ok": False, "error": "쓰기 대기 시간 초과 (반영 안 됨)", "maybe_committed": False}), 503
+
+
+def pool_stats() -> Dict[str, Any]:
+    return {**pool.stats(), "write_queue": write_queue_stats()}
+
+
+# ====================================
+# ✍️ 단일 writer 큐
+# ====================================
+# 요청 스레드마다 커밋하면 SQLite 쓰기 락을 두고 서로 기다리다 busy 에러가 난다.
+# DB_WRITE_QUEUE=1 이면 쓰기 작업을 writer 스레드 하나(전용 커넥션)로 보내고,
+# 대기열에 쌓인 작업 여러 개를 한 트랜잭션으로 묶어 커밋한다 (group commit).
+# 작업마다 SAVEPOINT 를 걸어 하나가 실패해도 그 작업만 되돌리고 나머지는 커밋.
+class _WriteOp:
+    __slots__ = ("fn", "args", "kwargs", "future")
+
+    def __init__(self, fn: Callable, args: tuple, kwargs: dict):
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.future: Future = Future()
+
+
+_STOP = object()
+
+
+class WriteTimeout(Exception):
+    """
+    DB_WRITE_TIMEOUT 안에 쓰기 결과를 못 받음.
+    maybe_committed=False: 시작 전이라 취소됨 → 반영 안 됨 (다시 시도해도 됨)
+    maybe_committed=True : 이미 실행 중이었음 → 뒤늦게 커밋됐을 수 있음 (그대로 재시도하면 중복 가능)
+    """
+
+    def __init__(self, maybe_committed: bool):
+        super().__init__("DB 쓰기 결과 대기 시간 초과" + (" (반영됐을 수 있음)" if maybe_committed else " (취소됨)"))
+        self.maybe_committed = maybe_committed
+
+
+class WriteQueue:
+    def __init__(self, batch_max: int = DB_WRITE_BATCH_MAX, linger_ms: float = DB_WRITE_LINGER_MS,
+                 max_pending: int = DB_WRITE_QUEUE_MAX):
+        self.batch_max = max(1, batch_max)
+        self.linger = linger_ms / 1000
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_pending)
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._cur: Optional[sqlite3.Cursor] = None
+
+        # 통계
+        self._ops = 0
+        self._failed_ops = 0
+        self._batches = 0
+        self._failed_batches = 0
+        self._batch_max_seen = 0
+        self._commit_total = 0.0
+
+    def start(self) -> None:
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._loop, name="db-writer", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """대기 중인 작업까지 처리하고 종료"""
+        thread = self._thread
+        if thread is None or not thread.is_alive():
+            return
+        self._queue.put(_STOP)
+        thread.join(timeout)
+
+    def submit(self, fn: Callable, *args, **kwargs) -> Any:
+        # writer 스레드 안에서 다시 호출하면 (작업 안의 작업) 현재 트랜잭션에서 바로 실행
+        if threading.current_thread() is self._thread:
+            return fn(self._cur, *args, **kwargs)
+
+        self.start()
+        op = _WriteOp(fn, args, kwargs)
+        try:
+            self._queue.put(op, timeout=DB_WRITE_TIMEOUT)
+        except queue.Full:
+            raise RuntimeError("DB 쓰기 대기열 가득 참")
+        try:
+            return op.future.result(timeout=DB_WRITE_TIMEOUT)
+        except FutureTimeout:
+            # 아직 writer 가 꺼내지 않은 작업은 취소 (_run_batch 가 건너뜀), 이미 실행 중이면 결과를 알 수 없음
+            raise WriteTimeout(maybe_committed=not op.future.cancel())
+
+    def _loop(self) -> None:
+        conn = _connect()
+        # BEGIN/COMMIT/SAVEPOINT 를 직접 관리
+        conn.isolation_level = None
+        self._cur = conn.cursor()
+
+        stopping = False
+        while not stopping:
+            first = self._queue.get()
+            if first is _STOP:
+                break
+
+            batch: List[_WriteOp] = [first]
+            deadline = time.monotonic() + self.linger
+            while len(batch) < self.batch_max:
+                try:
+                    remaining = deadline - time.monotonic()
+                    item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            self._run_batch(self._cur, batch)
+
+        conn.close()
+
+    def _run_batch(self, cur: sqlite3.Cursor, batch: List[_WriteOp]) -> None:
+        started = time.perf_counter()
+        done = []  # (future, 결과) → 커밋 성공 후에 알려줌
+        failed = 0
+        try:
+            cur.execute("BEGIN IMMEDIATE")
+            for op in batch:
+                if not op.future.set_running_or_notify_cancel():
+                    continue
+                cur.execute("SAVEPOINT write_op")
+                try:
+                    result = op.fn(cur, *op.args, **op.kwargs)
+                except Exception as e:
+                    cur.execute("ROLLBACK TO write_op")
+                    cur.execute("RELEASE write_op")
+                    op.future.set_exception(e)
+                    failed += 1
+                    continue
+                cur.execute("RELEASE write_op")
+                done.append((op.future, result))
+            cur.execute("COMMIT")
+        except Exception as e:
+            # BEGIN/SAVEPOINT/COMMIT 자체가 실패 (busy 등) → 아직 결과를 못 받은 작업 전부 실패 처리
+            if cur.connection.in_transaction:
+                cur.connection.rollback()
+            for op in batch:
+                if op.future.done():
+                    continue
+                if op.future.running() or op.future.set_running_or_notify_cancel():
+                    op.future.set_exception(e)
+            with self._lock:
+                self._batches += 1
+                self._failed_batches += 1
+                self._ops += len(batch)
+                self._failed_ops += len(batch)
+            return
+
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            self._batches += 1
+            self._ops += len(batch)
+            self._failed_ops += failed
+            self._batch_max_seen = max(self._batch_max_seen, len(batch))
+            self._commit_total += elapsed
+
+        for future, result in done:
+            future.set_result(result)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            ok_batches = self._batches - self._failed_batches
+            return {
+                "enabled": DB_WRITE_QUEUE,
+                "running": self._thread is not None and self._thread.is_alive(),
+                "pending": self._queue.qsize(),
+                "ops": self._ops,
+                "failed_ops": self._failed_ops,
+                "batches": self._batches,
+                "failed_batches": self._failed_batches,
+                "batch_avg": round(self._ops / self._batches, 2) if self._batches else 0.0,
+                "batch_max": self._batch_max_seen,
+                "batch_avg_ms": round(self._commit_total / ok_batches * 1000, 3) if ok_batches else 0.0,
+            }
+
+
+write_queue = WriteQueue()
+atexit.register(write_queue.stop)
+
+
+def run_write(fn: Callable, *args, **kwargs) -> Any:
+    """
+    쓰기 작업 실행: fn(cur, *args, **kwargs) 의 반환값을 커밋 후 돌려준다 (예외도 그대로 전달).
+    fn 은 commit/close 하지 않고 받은 커서로만 SQL 실행.
+    DB_WRITE_QUEUE=1 이면 writer 스레드에서 다른 요청과 묶어 커밋, 아니면 기존처럼 직접 커밋
+    (큐에서 결과를 못 기다리면 WriteTimeout — maybe_committed 로 반영 가능성 구분)
+    """
+    if DB_WRITE_QUEUE:
+        return write_queue.submit(fn, *args, **kwargs)
+
     conn = get_conn()
     cur = conn.cursor()
+    try:
+        result = fn(cur, *args, **kwargs)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+    return result
+
 
-    cur.execute("""
-        CREATE TABLE IF NOT EXISTS users (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            username TEXT NOT NULL UNIQUE,
-            password TEXT NOT NULL,
-            created_at DATETIME DEFAULT CURRENT_TIMESTAMP
-        );
-    """)
-
-    cur.execute("""
-        CREATE TABLE IF NOT EXISTS posts (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            user_id INTEGER NOT NULL,
-            title TEXT NOT NULL,
-            content TEXT,
-            created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-            like_count INTEGER DEFAULT 0,
-            comment_count INTEGER DEFAULT 0,
-            FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
-        );
-    """)
-    cur.execute("""
-        CREATE TABLE IF NOT EXISTS post_images (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            post_id INTEGER NOT NULL,
-            image_path TEXT NOT NULL,
-            FOREIGN KEY (post_id) REFERENCES posts(id) ON DELETE CASCADE
-        );
-    """)
-
-    cur.execute("""
-        CREATE TABLE IF NOT EXISTS comments
-        (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            user_id INTEGER NOT NULL,
-            post_id INTEGER NOT NULL,
-            content TEXT NOT NULL,
-            created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (post_id) REFERENCES posts(id) ON DELETE CASCADE,
-            FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
-        );
-    """)
-
-    cur.execute("""
-    CREATE TABLE IF NOT EXISTS post_likes
-    (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        post_id INTEGER NOT NULL,
-        user_id INTEGER NOT NULL,
-        created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-        UNIQUE(post_id, user_id),   -- 같은 유저가 같은 글을 두 번 좋아요할 수 없음
-        FOREIGN KEY (post_id) REFERENCES posts(id) ON DELETE CASCADE,
-        FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
-        );
-    """)
-
-    cur.execute("""
-        CREATE TABLE IF NOT EXISTS breed_guides (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-
-            -- 외부 데이터와 매칭할 ID (TheDogAPI)
-            breed_id INTEGER NOT NULL UNIQUE,
-
-            -- 견종명(영문/한글)
-            breed_name TEXT NOT NULL,
-            breed_name_kr TEXT,     -- 번역된 이름 저장 가능
-
-            -- 기본 정보
-            life_span TEXT,
-            weight_range TEXT,
-            height_range TEXT,
-
-            -- 성격 및 수치화된 평가
-            temperament TEXT,         -- 성격 한 줄 텍스트
-            energy_level INTEGER,      -- 1~5
-            friendliness INTEGER,      -- 친화력 1~5
-            trainability INTEGER,      -- 훈련 난이도 1~5
-            shedding_level INTEGER,    -- 털빠짐 1~5
-            grooming_level INTEGER,    -- 관리 난이도 1~5
-            bark_level INTEGER,        -- 짖음 빈도 1~5
-
-            -- 가이드 요소(앱에서 보여줄 핵심 텍스트)
-            summary TEXT,              -- 한 줄 요약
-            care_tips TEXT,            -- 관리 팁
-            caution TEXT               -- 주의사항
-        );
-    """)
-    cur.execute("""
-        CREATE TABLE IF NOT EXISTS user_profiles (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-
-            user_id INTEGER NOT NULL UNIQUE,   -- users 테이블과 1:1 매칭
-
-            guardian_name TEXT,
-            pet_name TEXT,
-            species TEXT,
-            birth TEXT,
-            gender TEXT,
-            neutered TEXT,
-            weight TEXT,
-
-            profile_image TEXT,                -- 이미지 경로 저장
-
-            updated_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-
-            FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
-        );
-    """)
-
-
-    conn.commit()
-    conn.close()
\ No newline at end of file
+def write_queue_stats() -> Dict[str, Any]:
+    return write_queue.stats()
+
+
+def init_db():
+    """앱 시작 시 호출: 아직 적용 안 된 스키마 마이그레이션 적용"""
+    conn = get_conn()
+    run_migrations(conn)
+    conn.close()
@@ -1,4 +1,6 @@
 # main.py
+import os
+
 from flask import Flask
 from dotenv import load_dotenv
 
@@ -9,32 +11,59 @@ from routes.breed_routes import breed_bp
 from routes.breed_admin_routes import breed_admin_bp
 from routes.user_routes import user_bp
 from routes.mypage_routes import mypage_bp
+from routes.admin_routes import admin_bp
+from routes.image_routes import image_bp
 
-from db import init_db
+from db import init_db, init_app as init_db_pool
+from auth import init_app as init_auth
+from commands import register_commands
 from dao.breed_dao import count_breeds
-from dao.breed_sync import sync_breeds_from_api
+from dao.user_dao import load_username_index
+from dao.breed_sync import start_background_sync
+from dao.account_reaper import start_reaper
+from dao.like_buffer import LIKE_BUFFER, start_like_flusher
 
 
 def create_app() -> Flask:
     app = Flask(__name__)
 
+    # 업로드 요청 전체 크기 상한 (이미지 1장 상한은 board_routes.MAX_IMAGE_BYTES)
+    app.config["MAX_CONTENT_LENGTH"] = int(os.getenv("MAX_UPLOAD_BYTES", str(50 * 1024 * 1024)))
+
+    # 요청마다 커넥션을 새로 열지 않고 풀에서 빌려 쓰고, 요청 끝나면 반납
+    init_db_pool(app)
+
     # ✅ 앱 시작할 때 DB 테이블 초기화
     with app.app_context():
         init_db()
+        # 아이디 중복 확인용 Bloom 필터 (대부분의 /users/check 를 DB 없이 응답)
+        load_username_index()
+
+    # Authorization: Bearer <토큰> 검증 (DB 조회 없음). AUTH_REQUIRED=1 이면 쓰기 API 토큰 필수
+    init_auth(app)
 
+    # 견종 동기화는 백그라운드로: 외부 API 가 느려도 서버는 바로 요청을 받음
+    # 진행 상황: GET /api/admin/sync_breeds/status
     if count_breeds() == 0:
-        print("🔄 dog_breeds 테이블이 비어있음 → DogAPI에서 자동 동기화 시작...")
-        try:
-            saved = sync_breeds_from_api()
-            print(f"✅ 동기화 완료! 저장된 개수: {saved}")
-        except Exception as e:
-            print(f"❌ 동기화 실패: {e}")
+        print("🔄 dog_breeds 테이블이 비어있음 → DogAPI 백그라운드 동기화 시작...")
+        start_background_sync()
+
+    # 탈퇴 계정 데이터 정리 (탈퇴 요청 때 깨우고, 재시작 후 남은 계정도 이어서 처리)
+    start_reaper()
+
+    # LIKE_BUFFER=1 이면 좋아요를 모아서 LIKE_BUFFER_FLUSH_SEC 마다 반영 (종료 시 남은 것도 반영)
+    if LIKE_BUFFER:
+        start_like_flusher()
 
     app.register_blueprint(breed_bp, url_prefix="/api")
     app.register_blueprint(breed_admin_bp, url_prefix="/api")
     app.register_blueprint(board_bp, url_prefix="/api")             # 게시판 API: /api/posts
     app.register_blueprint(user_bp, url_prefix="/api")
     app.register_blueprint(mypage_bp, url_prefix="/api")
+    app.register_blueprint(admin_bp, url_prefix="/api")
+    app.register_blueprint(image_bp, url_prefix="/api")            # 게시글 이미지: /api/images/...
+
+    register_commands(app)
 
     return app
 
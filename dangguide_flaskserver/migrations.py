@@ -0,0 +1,612 @@
+# migrations.py
+"""
+스키마 마이그레이션.
+PRAGMA user_version 으로 현재 버전을 기록하고, 그보다 큰 버전만 순서대로 적용한다.
+모든 마이그레이션은 IF NOT EXISTS 등으로 다시 실행해도 안전하게 작성한다.
+
+새 마이그레이션 추가:
+    @migration(N, "설명")
+    def _vN(cur): ...
+"""
+
+import re
+import sqlite3
+import time
+from typing import Callable, Dict, List, Tuple, Any
+
+MigrationFn = Callable[[sqlite3.Cursor], None]
+MIGRATIONS: List[Tuple[int, str, MigrationFn]] = []
+
+
+def migration(version: int, name: str):
+    def deco(fn: MigrationFn) -> MigrationFn:
+        MIGRATIONS.append((version, name, fn))
+        return fn
+    return deco
+
+
+def _has_column(cur: sqlite3.Cursor, table: str, column: str) -> bool:
+    return any(row[1] == column for row in cur.execute(f"PRAGMA table_info({table})").fetchall())
+
+
+def add_column(cur: sqlite3.Cursor, table: str, column: str, decl: str) -> None:
+    """ALTER TABLE ADD COLUMN 은 IF NOT EXISTS 가 없어서 직접 확인"""
+    if not _has_column(cur, table, column):
+        cur.execute(f"ALTER TABLE {table} ADD COLUMN {column} {decl}")
+
+
+def current_version(conn) -> int:
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def run_migrations(conn) -> List[Dict[str, Any]]:
+    """
+    아직 적용 안 된 마이그레이션을 버전 순으로 하나씩(각각 한 트랜잭션) 적용.
+    소요 시간은 schema_migrations 에 남겨 큰 DB 업그레이드 계획에 참고한다.
+    return: 이번에 적용된 마이그레이션 목록
+    """
+    cur = conn.cursor()
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version INTEGER PRIMARY KEY,
+            name TEXT NOT NULL,
+            applied_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+            duration_ms REAL NOT NULL
+        );
+    """)
+    conn.commit()
+
+    applied: List[Dict[str, Any]] = []
+    version = current_version(conn)
+
+    for v, name, fn in sorted(MIGRATIONS, key=lambda m: m[0]):
+        if v <= version:
+            continue
+
+        started = time.perf_counter()
+        try:
+            cur.execute("BEGIN IMMEDIATE")
+            fn(cur)
+            duration_ms = (time.perf_counter() - started) * 1000
+            cur.execute(
+                "INSERT OR REPLACE INTO schema_migrations (version, name, duration_ms) VALUES (?, ?, ?)",
+                (v, name, duration_ms),
+            )
+            cur.execute(f"PRAGMA user_version = {int(v)}")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            print(f"❌ 마이그레이션 실패: v{v} {name}")
+            raise
+
+        print(f"🛠  마이그레이션 적용: v{v} {name} ({duration_ms:.1f}ms)")
+        applied.append({"version": v, "name": name, "duration_ms": round(duration_ms, 3)})
+        version = v
+
+    if applied:
+        # 새 인덱스 통계 반영
+        cur.execute("PRAGMA optimize")
+    return applied
+
+
+def migration_history(conn) -> List[Dict[str, Any]]:
+    rows = conn.execute(
+        "SELECT version, name, applied_at, duration_ms FROM schema_migrations ORDER BY version"
+    ).fetchall()
+    return [dict(r) for r in rows]
+
+
+# =========================
+# v1: 기본 테이블
+# =========================
+@migration(1, "base schema")
+def _v1_base_schema(cur: sqlite3.Cursor) -> None:
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS users (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            username TEXT NOT NULL UNIQUE,
+            password TEXT NOT NULL,
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        );
+    """)
+
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS posts (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER NOT NULL,
+            title TEXT NOT NULL,
+            content TEXT,
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+            like_count INTEGER DEFAULT 0,
+            comment_count INTEGER DEFAULT 0,
+            FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+        );
+    """)
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS post_images (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            post_id INTEGER NOT NULL,
+            image_path TEXT NOT NULL,
+            FOREIGN KEY (post_id) REFERENCES posts(id) ON DELETE CASCADE
+        );
+    """)
+
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS comments
+        (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER NOT NULL,
+            post_id INTEGER NOT NULL,
+            content TEXT NOT NULL,
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (post_id) REFERENCES posts(id) ON DELETE CASCADE,
+            FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+        );
+    """)
+
+    cur.execute("""
+    CREATE TABLE IF NOT EXISTS post_likes
+    (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        post_id INTEGER NOT NULL,
+        user_id INTEGER NOT NULL,
+        created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+        UNIQUE(post_id, user_id),   -- 같은 유저가 같은 글을 두 번 좋아요할 수 없음
+        FOREIGN KEY (post_id) REFERENCES posts(id) ON DELETE CASCADE,
+        FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+        );
+    """)
+
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS breed_guides (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+
+            -- 외부 데이터와 매칭할 ID (TheDogAPI)
+            breed_id INTEGER NOT NULL UNIQUE,
+
+            -- 견종명(영문/한글)
+            breed_name TEXT NOT NULL,
+            breed_name_kr TEXT,     -- 번역된 이름 저장 가능
+
+            -- 기본 정보
+            life_span TEXT,
+            weight_range TEXT,
+            height_range TEXT,
+
+            -- 성격 및 수치화된 평가
+            temperament TEXT,         -- 성격 한 줄 텍스트
+            energy_level INTEGER,      -- 1~5
+            friendliness INTEGER,      -- 친화력 1~5
+            trainability INTEGER,      -- 훈련 난이도 1~5
+            shedding_level INTEGER,    -- 털빠짐 1~5
+            grooming_level INTEGER,    -- 관리 난이도 1~5
+            bark_level INTEGER,        -- 짖음 빈도 1~5
+
+            -- 가이드 요소(앱에서 보여줄 핵심 텍스트)
+            summary TEXT,              -- 한 줄 요약
+            care_tips TEXT,            -- 관리 팁
+            caution TEXT               -- 주의사항
+        );
+    """)
+    # TheDogAPI 견종 캐시 (breed_dao 가 사용)
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS dog_breeds
+        (
+            id  INTEGER PRIMARY KEY,
+            -- TheDogAPI의 breed id 그대로 사용
+            name_en TEXT,
+            name_ko TEXT,
+            temperament_en TEXT,
+            temperament_ko TEXT,
+            bred_for_en TEXT,
+            bred_for_ko TEXT,
+            breed_group_en TEXT,
+            breed_group_ko TEXT,
+            life_span_en TEXT,
+            life_span_ko TEXT,
+            origin_en TEXT,
+            origin_ko TEXT,
+            weight_kg TEXT,
+            height_cm TEXT,
+            image_url TEXT
+        );
+    """)
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS user_profiles (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+
+            user_id INTEGER NOT NULL UNIQUE,   -- users 테이블과 1:1 매칭
+
+            guardian_name TEXT,
+            pet_name TEXT,
+            species TEXT,
+            birth TEXT,
+            gender TEXT,
+            neutered TEXT,
+            weight TEXT,
+
+            profile_image TEXT,                -- 이미지 경로 저장
+
+            updated_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+
+            FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+        );
+    """)
+
+
+# =========================
+# v2: DAO 조회 패턴용 인덱스
+# =========================
+@migration(2, "indexes for DAO lookups")
+def _v2_indexes(cur: sqlite3.Cursor) -> None:
+    # 피드 썸네일(첫 이미지) / 상세 이미지 목록: WHERE post_id ORDER BY id
+    cur.execute("""
+        CREATE INDEX IF NOT EXISTS idx_post_images_post_id_id
+        ON post_images (post_id, id);
+    """)
+
+    # 댓글 목록: WHERE post_id ORDER BY id
+    cur.execute("""
+        CREATE INDEX IF NOT EXISTS idx_comments_post_id_id
+        ON comments (post_id, id);
+    """)
+
+    # 회원 삭제(FK CASCADE) 시 작성자 기준 탐색
+    cur.execute("""
+        CREATE INDEX IF NOT EXISTS idx_comments_user_id
+        ON comments (user_id);
+    """)
+    cur.execute("""
+        CREATE INDEX IF NOT EXISTS idx_posts_user_id
+        ON posts (user_id);
+    """)
+
+    # post_likes(post_id, user_id) 는 UNIQUE 로 이미 인덱스 있음 → 반대 방향만
+    cur.execute("""
+        CREATE INDEX IF NOT EXISTS idx_post_likes_user_id
+        ON post_likes (user_id);
+    """)
+
+
+# =========================
+# v3: 번역 캐시
+# =========================
+@migration(3, "translation cache")
+def _v3_translation_cache(cur: sqlite3.Cursor) -> None:
+    # (원문, 대상 언어) → 번역문. 재동기화 때 바뀌지 않은 문장은 번역기 호출 안 함
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS translation_cache (
+            source_text TEXT NOT NULL,
+            target_lang TEXT NOT NULL,
+            translated_text TEXT NOT NULL,
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (source_text, target_lang)
+        ) WITHOUT ROWID;
+    """)
+
+
+# =========================
+# v4: 견종 내용 해시 (변경 없는 행은 재저장 생략)
+# =========================
+@migration(4, "dog_breeds content hash")
+def _v4_breed_content_hash(cur: sqlite3.Cursor) -> None:
+    add_column(cur, "dog_breeds", "content_hash", "TEXT")
+
+
+# =========================
+# v5: 게시글 이미지 리사이즈 버전
+# =========================
+@migration(5, "post_images thumbnail/medium variants")
+def _v5_post_image_variants(cur: sqlite3.Cursor) -> None:
+    # 백그라운드 워커가 만든 작은 이미지 파일명 (아직 없으면 NULL → 원본 사용)
+    add_column(cur, "post_images", "thumb_path", "TEXT")
+    add_column(cur, "post_images", "medium_path", "TEXT")
+
+
+# =========================
+# v6: 내용 주소(해시) 기반 이미지 저장소
+# =========================
+@migration(6, "content-addressed image blobs")
+def _v6_blobs(cur: sqlite3.Cursor) -> None:
+    # 같은 사진은 한 번만 저장하고, 참조하는 post_images 수를 refcount 로 관리
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS blobs (
+            hash TEXT PRIMARY KEY,           -- sha256 hex
+            path TEXT NOT NULL,              -- 저장소 기준 상대 경로 (ab/cd/<hash>.jpg)
+            size INTEGER NOT NULL,
+            refcount INTEGER NOT NULL DEFAULT 0,
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        ) WITHOUT ROWID;
+    """)
+    cur.execute("""
+        CREATE INDEX IF NOT EXISTS idx_blobs_unreferenced
+        ON blobs (refcount) WHERE refcount <= 0;
+    """)
+
+    # 예전 업로드(평평한 파일명)는 blob_hash 가 NULL
+    add_column(cur, "post_images", "blob_hash", "TEXT REFERENCES blobs(hash)")
+
+    # FK CASCADE(게시글/회원 삭제)로 지워지는 경우까지 트리거로 refcount 유지
+    cur.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_post_images_blob_ref
+        AFTER INSERT ON post_images
+        WHEN NEW.blob_hash IS NOT NULL
+        BEGIN
+            UPDATE blobs SET refcount = refcount + 1 WHERE hash = NEW.blob_hash;
+        END;
+    """)
+    cur.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_post_images_blob_unref
+        AFTER DELETE ON post_images
+        WHEN OLD.blob_hash IS NOT NULL
+        BEGIN
+            UPDATE blobs SET refcount = refcount - 1 WHERE hash = OLD.blob_hash;
+        END;
+    """)
+
+
+# =========================
+# v7: 게시글/댓글 전문 검색 (FTS5, trigram → 한국어도 부분 일치)
+# =========================
+@migration(7, "full-text search over posts and comments")
+def _v7_fts(cur: sqlite3.Cursor) -> None:
+    # 외부 콘텐츠 테이블: 본문은 posts/comments 에만 저장하고 색인만 따로 둠
+    cur.execute("""
+        CREATE VIRTUAL TABLE IF NOT EXISTS posts_fts USING fts5(
+            title, content,
+            content = 'posts', content_rowid = 'id',
+            tokenize = 'trigram'
+        );
+    """)
+    cur.execute("""
+        CREATE VIRTUAL TABLE IF NOT EXISTS comments_fts USING fts5(
+            content,
+            content = 'comments', content_rowid = 'id',
+            tokenize = 'trigram'
+        );
+    """)
+
+    # 트리거로 색인 동기화 (FK CASCADE 로 지워지는 행 포함)
+    cur.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_posts_fts_insert AFTER INSERT ON posts BEGIN
+            INSERT INTO posts_fts (rowid, title, content) VALUES (NEW.id, NEW.title, NEW.content);
+        END;
+    """)
+    cur.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_posts_fts_delete AFTER DELETE ON posts BEGIN
+            INSERT INTO posts_fts (posts_fts, rowid, title, content)
+            VALUES ('delete', OLD.id, OLD.title, OLD.content);
+        END;
+    """)
+    cur.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_posts_fts_update AFTER UPDATE OF title, content ON posts BEGIN
+            INSERT INTO posts_fts (posts_fts, rowid, title, content)
+            VALUES ('delete', OLD.id, OLD.title, OLD.content);
+            INSERT INTO posts_fts (rowid, title, content) VALUES (NEW.id, NEW.title, NEW.content);
+        END;
+    """)
+    cur.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_comments_fts_insert AFTER INSERT ON comments BEGIN
+            INSERT INTO comments_fts (rowid, content) VALUES (NEW.id, NEW.content);
+        END;
+    """)
+    cur.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_comments_fts_delete AFTER DELETE ON comments BEGIN
+            INSERT INTO comments_fts (comments_fts, rowid, content) VALUES ('delete', OLD.id, OLD.content);
+        END;
+    """)
+    cur.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_comments_fts_update AFTER UPDATE OF content ON comments BEGIN
+            INSERT INTO comments_fts (comments_fts, rowid, content) VALUES ('delete', OLD.id, OLD.content);
+            INSERT INTO comments_fts (rowid, content) VALUES (NEW.id, NEW.content);
+        END;
+    """)
+
+    # 기존 글/댓글 색인
+    cur.execute("INSERT INTO posts_fts (posts_fts) VALUES ('rebuild')")
+    cur.execute("INSERT INTO comments_fts (comments_fts) VALUES ('rebuild')")
+
+
+# =========================
+# v8: 견종 체중/체고 숫자 범위 (검색 필터용)
+# =========================
+@migration(8, "dog_breeds numeric weight/height ranges")
+def _v8_breed_ranges(cur: sqlite3.Cursor) -> None:
+    # weight_kg/height_cm 은 "3 - 6" 같은 문자열 → 동기화 때 min/max 로 파싱해 저장
+    for column in ("weight_min_kg", "weight_max_kg", "height_min_cm", "height_max_cm"):
+        add_column(cur, "dog_breeds", column, "REAL")
+
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_dog_breeds_weight ON dog_breeds(weight_min_kg, weight_max_kg);")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_dog_breeds_height ON dog_breeds(height_min_cm, height_max_cm);")
+
+    # 기존 행 채우기 (dao.breed_dao.parse_range 의 v8 시점 사본 — 이후 DAO 가 바뀌어도 이 버전은 고정)
+    def parse_range(text):
+        numbers = [float(n) for n in re.findall(r"\d+(?:\.\d+)?", text or "")]
+        return (min(numbers), max(numbers)) if numbers else (None, None)
+
+    rows = cur.execute("SELECT id, weight_kg, height_cm FROM dog_breeds").fetchall()
+    cur.executemany(
+        """
+        UPDATE dog_breeds
+        SET weight_min_kg = ?, weight_max_kg = ?, height_min_cm = ?, height_max_cm = ?
+        WHERE id = ?
+        """,
+        [(*parse_range(r[1]), *parse_range(r[2]), r[0]) for r in rows],
+    )
+
+
+# =========================
+# v9: 액세스 토큰 폐기 목록
+# =========================
+@migration(9, "access token revocation")
+def _v9_token_revocation(cur: sqlite3.Cursor) -> None:
+    # 로그아웃한 토큰 (만료 시각 지나면 정리)
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS revoked_tokens (
+            jti TEXT PRIMARY KEY,
+            user_id INTEGER NOT NULL,
+            expires_at INTEGER NOT NULL
+        );
+    """)
+    # 사용자 단위 폐기: not_before 이전에 발급된 토큰은 모두 무효 (회원 탈퇴 등)
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS user_token_cutoffs (
+            user_id INTEGER PRIMARY KEY,
+            not_before INTEGER NOT NULL
+        );
+    """)
+
+
+# =========================
+# v10: 회원 탈퇴 표시 (연관 데이터는 백그라운드에서 나눠 삭제)
+# =========================
+@migration(10, "users soft delete")
+def _v10_users_deleted_at(cur: sqlite3.Cursor) -> None:
+    add_column(cur, "users", "deleted_at", "DATETIME")
+    # 정리 대기 중인 계정만 담는 작은 인덱스 (리퍼가 조회)
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_users_deleted_at ON users(deleted_at) WHERE deleted_at IS NOT NULL;")
+
+
+# =========================
+# v11: 게시글 목록용 비정규화 테이블 (post_feed)
+# =========================
+@migration(11, "denormalized post feed")
+def _v11_post_feed(cur: sqlite3.Cursor) -> None:
+    # 목록 한 줄에 필요한 값을 미리 합쳐 둠 → GET /api/posts 는 id 범위 스캔 한 번
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS post_feed (
+            id INTEGER PRIMARY KEY,          -- posts.id
+            user_id INTEGER NOT NULL,
+            title TEXT NOT NULL,
+            created_at DATETIME,
+            author_name TEXT NOT NULL,
+            likes INTEGER NOT NULL DEFAULT 0,
+            comments INTEGER NOT NULL DEFAULT 0,
+            thumbnail TEXT                   -- 첫 이미지 (썸네일 있으면 썸네일)
+        );
+    """)
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_post_feed_user ON post_feed(user_id);")
+
+    # 글 생성/수정/삭제 (좋아요/댓글 카운터는 posts UPDATE 로 같이 반영)
+    # 작성자가 없는 글은 기존 목록(JOIN users)처럼 빠짐
+    cur.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_post_feed_insert AFTER INSERT ON posts BEGIN
+            INSERT INTO post_feed (id, user_id, title, created_at, author_name, likes, comments)
+            SELECT NEW.id, NEW.user_id, NEW.title, NEW.created_at, u.username,
+                   COALESCE(NEW.like_count, 0), COALESCE(NEW.comment_count, 0)
+            FROM users u WHERE u.id = NEW.user_id;
+        END;
+    """)
+    cur.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_post_feed_update
+        AFTER UPDATE OF title, like_count, comment_count ON posts BEGIN
+            UPDATE post_feed
+            SET title = NEW.title,
+                likes = COALESCE(NEW.like_count, 0),
+                comments = COALESCE(NEW.comment_count, 0)
+            WHERE id = NEW.id;
+        END;
+    """)
+    cur.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_post_feed_delete AFTER DELETE ON posts BEGIN
+            DELETE FROM post_feed WHERE id = OLD.id;
+        END;
+    """)
+
+    # 첫 이미지가 바뀌는 경우만 (추가/썸네일 생성/삭제된 행이 그 글의 첫 이미지) 썸네일 다시 계산
+    first_image = """
+        (SELECT COALESCE(thumb_path, image_path) FROM post_images
+         WHERE post_id = {row}.post_id ORDER BY id LIMIT 1)
+    """
+    is_first = "NOT EXISTS (SELECT 1 FROM post_images WHERE post_id = {row}.post_id AND id < {row}.id)"
+    for name, event, row in (
+        ("insert", "INSERT", "NEW"),
+        ("update", "UPDATE OF image_path, thumb_path", "NEW"),
+        ("delete", "DELETE", "OLD"),
+    ):
+        cur.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_post_feed_image_{name}
+            AFTER {event} ON post_images
+            WHEN {is_first.format(row=row)}
+            BEGIN
+                UPDATE post_feed SET thumbnail = {first_image.format(row=row)} WHERE id = {row}.post_id;
+            END;
+        """)
+
+    # 아이디 변경 → 그 사람 글의 작성자명
+    cur.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_post_feed_username
+        AFTER UPDATE OF username ON users BEGIN
+            UPDATE post_feed SET author_name = NEW.username WHERE user_id = NEW.id;
+        END;
+    """)
+
+    # 기존 글 채우기 (dao.board_dao.fill_post_feed 의 v11 시점 사본 — 이후 DAO 가 바뀌어도 이 버전은 고정)
+    cur.execute("DELETE FROM post_feed")
+    cur.execute("""
+        INSERT INTO post_feed (id, user_id, title, created_at, author_name, likes, comments, thumbnail)
+        SELECT
+            p.id,
+            p.user_id,
+            p.title,
+            p.created_at,
+            u.username,
+            COALESCE(p.like_count, 0),
+            COALESCE(p.comment_count, 0),
+            (SELECT COALESCE(pi.thumb_path, pi.image_path) FROM post_images pi
+             WHERE pi.post_id = p.id ORDER BY pi.id LIMIT 1)
+        FROM posts p
+        JOIN users u ON u.id = p.user_id
+    """)
+
+
+# =========================
+# v12: FK 가 꺼져 있던 동안 CASCADE 되지 않고 남은 행 정리
+# =========================
+@migration(12, "remove rows orphaned before foreign keys were enforced")
+def _v12_orphan_cleanup(cur: sqlite3.Cursor) -> None:
+    # 자식부터: 없는 글에 달린 이미지/댓글/좋아요 (이미지 blob refcount 는 트리거가 감소)
+    for table in ("post_images", "comments", "post_likes"):
+        cur.execute(f"DELETE FROM {table} WHERE post_id NOT IN (SELECT id FROM posts)")
+
+    # 없는 회원의 글 → 그 글의 자식 → 글
+    orphan_posts = "SELECT id FROM posts WHERE user_id NOT IN (SELECT id FROM users)"
+    for table in ("post_images", "comments", "post_likes"):
+        cur.execute(f"DELETE FROM {table} WHERE post_id IN ({orphan_posts})")
+    cur.execute(f"DELETE FROM posts WHERE id IN ({orphan_posts})")
+
+    # 없는 회원이 남긴 댓글/좋아요/프로필
+    for table in ("comments", "post_likes", "user_profiles"):
+        cur.execute(f"DELETE FROM {table} WHERE user_id NOT IN (SELECT id FROM users)")
+
+    # 지운 댓글/좋아요만큼 카운터 보정 (어긋난 글만)
+    cur.execute("""
+        UPDATE posts
+        SET like_count = actual.likes,
+            comment_count = actual.comments
+        FROM (
+            SELECT
+                p.id,
+                (SELECT COUNT(*) FROM post_likes l WHERE l.post_id = p.id) AS likes,
+                (SELECT COUNT(*) FROM comments c WHERE c.post_id = p.id)   AS comments
+            FROM posts p
+        ) AS actual
+        WHERE posts.id = actual.id
+          AND (posts.like_count IS NOT actual.likes
+               OR posts.comment_count IS NOT actual.comments)
+    """)
+
+
+# =========================
+# v13: 견종 카탈로그 버전 (워커 프로세스끼리 공유)
+# =========================
+@migration(13, "breed catalog version")
+def _v13_catalog_meta(cur: sqlite3.Cursor) -> None:
+    # 동기화로 dog_breeds 가 바뀔 때마다 version +1 → 각 프로세스의 메모리 캐시/인덱스가 이 값과 비교
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS catalog_meta (
+            name TEXT PRIMARY KEY,
+            version INTEGER NOT NULL DEFAULT 0
+        );
+    """)
+    cur.execute("INSERT OR IGNORE INTO catalog_meta (name, version) VALUES ('dog_breeds', 0);")
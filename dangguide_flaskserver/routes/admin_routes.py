@@ -0,0 +1,35 @@
+# dangguide_flaskserver/routes/admin_routes.py
+
+from flask import Blueprint, jsonify
+
+from auth import require_admin
+from db import pool_stats
+from dao.like_buffer import like_buffer
+from dao.breed_cache import cache_stats as breed_cache_stats
+from dao.passwords import login_throttle
+from dao.username_index import username_index
+
+admin_bp = Blueprint("admin", __name__)
+
+
+@admin_bp.get("/admin/db/stats")
+def db_stats():
+    """DB 커넥션 풀 상태 (풀 크기, 대기 횟수/시간, 열린 커넥션 수), 좋아요 버퍼 반영 상태"""
+    return jsonify({"ok": True, "pool": pool_stats(), "like_buffer": like_buffer.stats()}), 200
+
+
+@admin_bp.get("/admin/cache/stats")
+def cache_stats():
+    """메모리 캐시 적중/미스 통계"""
+    return jsonify({"ok": True, "breeds": breed_cache_stats()}), 200
+
+
+@admin_bp.get("/admin/auth/stats")
+@require_admin
+def auth_stats():
+    """로그인 시도 제한 상태, 아이디 존재 인덱스(Bloom 필터) 적중 통계 (X-Admin-Token 필요)"""
+    return jsonify({
+        "ok": True,
+        "login_throttle": login_throttle.stats(),
+        "username_index": username_index.stats(),
+    }), 200
@@ -1,24 +1,38 @@
 # dangguide_flaskserver/routes/board_routes.py
 
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, url_for
 from dao.board_dao import (
     get_posts, create_post,
     get_comments, create_comment, toggle_like,
-    add_post_image, get_post_detail
+    add_post_images, get_post_detail, get_posts_batch, delete_post
 )
-from werkzeug.utils import secure_filename
-from pathlib import Path
-from datetime import datetime
+from dao.blob_store import (
+    STORE_ROOT, ImageTooLarge,
+    stage_upload, publish_staged, discard_staged
+)
+from dao.image_variants import schedule_variants
+from dao.account_reaper import request_blob_gc
+from dao.search_dao import search_posts
+from routes.pagination import encode_cursor, decode_cursor, parse_limit
+from auth import acting_user_id, viewer_user_id
+from werkzeug.exceptions import RequestEntityTooLarge
+import os
 
 board_bp = Blueprint("board", __name__)
 
 # ====================================
 # 🔥 업로드 경로 설정 (절대경로)
 # ====================================
-BASE_DIR = Path(__file__).resolve().parent.parent   # dangguide_flaskserver/
-UPLOAD_FOLDER = BASE_DIR / "static" / "post_images"
+# 파일은 내용 해시로 저장: static/post_images/ab/cd/<sha256>.<ext>
+UPLOAD_FOLDER = STORE_ROOT
 ALLOWED_EXT = {"jpg", "jpeg", "png", "gif"}
 
+# 이미지 1장 최대 크기
+MAX_IMAGE_BYTES = int(os.getenv("MAX_IMAGE_BYTES", str(10 * 1024 * 1024)))
+# 업로드 요청 1번에 올릴 수 있는 이미지 수 → 업로드 요청 본문 상한 = 이미지 수 × 1장 상한 + 여유
+MAX_IMAGES_PER_UPLOAD = int(os.getenv("MAX_IMAGES_PER_UPLOAD", "10"))
+_MULTIPART_OVERHEAD = 64 * 1024
+
 UPLOAD_FOLDER.mkdir(parents=True, exist_ok=True)
 
 
@@ -26,13 +40,41 @@ def allowed_file(filename: str) -> bool:
     return "." in filename and filename.rsplit(".", 1)[1].lower() in ALLOWED_EXT
 
 
+def _normalized_ext(filename: str) -> str:
+    ext = filename.rsplit(".", 1)[1].lower()
+    return "jpg" if ext == "jpeg" else ext
+
+
+@board_bp.errorhandler(RequestEntityTooLarge)
+def request_too_large(e):
+    # 요청 전체 크기가 MAX_CONTENT_LENGTH 초과
+    return jsonify({"ok": False, "error": "요청 크기 초과"}), 413
+
+
 # ====================================
 # 📌 게시글 목록
 # ====================================
 @board_bp.get("/posts")
 def list_posts():
-    posts = get_posts()
-    return jsonify({"ok": True, "posts": posts}), 200
+    """
+    GET /api/posts?limit=20&before_id=123
+    GET /api/posts?limit=20&cursor=<이전 응답의 next_cursor>
+    → 최신 글부터 limit 개, 다음 페이지가 있으면 next_cursor 포함
+    """
+    limit = parse_limit(request.args.get("limit", type=int))
+    before_id = request.args.get("before_id", type=int)
+
+    cursor = request.args.get("cursor")
+    if cursor:
+        data = decode_cursor(cursor)
+        if data is None or not isinstance(data.get("before_id"), int):
+            return jsonify({"ok": False, "error": "잘못된 cursor"}), 400
+        before_id = data["before_id"]
+
+    posts, next_before_id = get_posts(limit, before_id)
+    next_cursor = encode_cursor({"before_id": next_before_id}) if next_before_id else None
+
+    return jsonify({"ok": True, "posts": posts, "next_cursor": next_cursor}), 200
 
 
 # ====================================
@@ -42,7 +84,7 @@ def list_posts():
 def create_post_route():
     data = request.get_json(silent=True) or {}
 
-    user_id = data.get("user_id")
+    user_id = acting_user_id(data.get("user_id"))
     title = data.get("title")
     content = data.get("content")
 
@@ -58,7 +100,23 @@ def create_post_route():
 # ====================================
 @board_bp.get("/posts/<int:post_id>/comments")
 def comments_list(post_id: int):
-    return jsonify({"ok": True, "comments": get_comments(post_id)}), 200
+    """
+    GET /api/posts/<post_id>/comments?limit=20&after_id=123
+    GET /api/posts/<post_id>/comments?limit=20&cursor=<next_cursor>
+    → 오래된 댓글부터 limit 개, 다음 페이지가 있으면 next_cursor 포함
+    """
+    limit = parse_limit(request.args.get("limit", type=int))
+    after_id = request.args.get("after_id", type=int)
+
+    cursor = request.args.get("cursor")
+    if cursor:
+        data = decode_cursor(cursor)
+        if data is None or not isinstance(data.get("after_id"), int):
+            return jsonify({"ok": False, "error": "잘못된 cursor"}), 400
+        after_id = data["after_id"]
+
+    comments, next_after_id = get_comments(post_id, after_id, limit)
+    return jsonify({"ok": True, "comments": comments, "next_cursor": _comments_cursor(next_after_id)}), 200
 
 
 # ====================================
@@ -67,7 +125,7 @@ def comments_list(post_id: int):
 @board_bp.post("/posts/<int:post_id>/comments")
 def add_comment(post_id: int):
     data = request.get_json(silent=True) or {}
-    user_id = data.get("user_id")
+    user_id = acting_user_id(data.get("user_id"))
     content = data.get("content")
 
     if not user_id or not content:
@@ -84,7 +142,7 @@ def add_comment(post_id: int):
 @board_bp.post("/posts/<int:post_id>/like")
 def like_post(post_id: int):
     data = request.get_json(silent=True) or {}
-    user_id = data.get("user_id")
+    user_id = acting_user_id(data.get("user_id"))
 
     if not user_id:
         return jsonify({"ok": False, "error": "user_id 필요"}), 400
@@ -98,29 +156,141 @@ def like_post(post_id: int):
 # ====================================
 @board_bp.post("/posts/<int:post_id>/images")
 def upload_post_images(post_id: int):
+    # request.files 를 건드리는 순간 Werkzeug 가 본문 전체를 임시 파일로 받아 두므로
+    # 그 전에 본문 상한을 이 엔드포인트 기준으로 낮춤 → Content-Length 가 넘으면 파싱 없이 413
+    upload_limit = MAX_IMAGES_PER_UPLOAD * MAX_IMAGE_BYTES + _MULTIPART_OVERHEAD
+    if request.max_content_length is not None:
+        upload_limit = min(upload_limit, request.max_content_length)
+    request.max_content_length = upload_limit
+
     if "images" not in request.files:
         return jsonify({"ok": False, "error": "'images' 필드 필요"}), 400
 
     files = request.files.getlist("images")
-    saved_files = []
+    if len(files) > MAX_IMAGES_PER_UPLOAD:
+        return jsonify({"ok": False, "error": f"이미지는 한 번에 최대 {MAX_IMAGES_PER_UPLOAD}장"}), 400
 
+    # 형식 먼저 전부 확인 (중간에 실패해서 일부만 저장되는 일 없도록)
     for file in files:
-        if file and allowed_file(file.filename):
-            filename = secure_filename(file.filename)
-            timestamp = datetime.utcnow().timestamp()
-            final_name = f"{post_id}_{timestamp}_{filename}"
-
-            save_path = UPLOAD_FOLDER / final_name
-            file.save(str(save_path))
-
-            add_post_image(post_id, final_name)
-            saved_files.append(final_name)
-        else:
+        if not (file and allowed_file(file.filename)):
             return jsonify({"ok": False, "error": "허용되지 않는 파일 형식"}), 400
 
+    # Werkzeug 가 받아 둔 파일을 청크 단위로 임시 파일에 복사하면서 sha256 계산 + 1장 상한 확인
+    staged = []
+    try:
+        for file in files:
+            staged.append(stage_upload(file.stream, _normalized_ext(file.filename), MAX_IMAGE_BYTES))
+    except ImageTooLarge:
+        discard_staged(staged)
+        limit_mb = MAX_IMAGE_BYTES // (1024 * 1024)
+        return jsonify({"ok": False, "error": f"이미지 1장당 최대 {limit_mb}MB"}), 413
+    except BaseException:
+        discard_staged(staged)
+        raise
+
+    # DB 기록은 한 트랜잭션 → 커밋 후 해시 경로로 옮김 (같은 파일이 있으면 재사용)
+    try:
+        images = add_post_images(post_id, [(s.hash, s.rel_path, s.size) for s in staged])
+    except BaseException:
+        discard_staged(staged)
+        raise
+    saved_files = [path for _, path in images]
+    publish_staged(staged, saved_files)
+
+    # 썸네일/중간 크기는 백그라운드에서 생성
+    schedule_variants(UPLOAD_FOLDER, images)
+
     return jsonify({"ok": True, "files": saved_files}), 201
 
 
+def _comments_cursor(after_id):
+    return encode_cursor({"after_id": after_id}) if after_id else None
+
+
+def _present_detail(detail):
+    """DAO 상세 → 응답 형태 (이미지 URL 변환, 댓글 다음 페이지 커서)"""
+    detail["images"] = _image_urls(detail["images"])
+    detail["comments_next_cursor"] = _comments_cursor(detail.pop("comments_next_after_id", None))
+    return detail
+
+
+def _image_urls(images):
+    # DB에 저장된 파일 이름 리스트
+    # → 캐시 헤더/Range/프록시 전송을 지원하는 이미지 전용 엔드포인트 URL 로 변환
+    return [url_for("image.serve_post_image", filename=img, _external=True) for img in images]
+
+
+# ====================================
+# 📌 게시글 여러 건 상세 (피드 화면용)
+# ====================================
+MAX_BATCH_IDS = 50
+
+
+@board_bp.get("/posts/batch")
+def get_posts_batch_route():
+    """
+    GET /api/posts/batch?ids=3,5,8&user_id=4
+    → { ok, posts: { "3": {...상세}, "5": {...} } }  (없는 id 는 빠짐)
+    """
+    raw_ids = (request.args.get("ids") or "").split(",")
+    try:
+        ids = [int(x) for x in raw_ids if x.strip()]
+    except ValueError:
+        return jsonify({"ok": False, "error": "ids 는 쉼표로 구분된 숫자"}), 400
+
+    if not ids:
+        return jsonify({"ok": False, "error": "ids 필요"}), 400
+    if len(ids) > MAX_BATCH_IDS:
+        return jsonify({"ok": False, "error": f"ids 는 최대 {MAX_BATCH_IDS}개"}), 400
+
+    current_user_id = viewer_user_id(request.args.get("user_id", type=int))
+    details = get_posts_batch(ids, current_user_id)
+
+    for detail in details.values():
+        _present_detail(detail)
+
+    return jsonify({"ok": True, "posts": {str(pid): d for pid, d in details.items()}}), 200
+
+
+# ====================================
+# 🔍 게시글/댓글 검색
+# ====================================
+MAX_SEARCH_QUERY_LEN = 100
+MAX_SEARCH_OFFSET = 1000
+
+
+@board_bp.get("/posts/search")
+def search_posts_route():
+    """
+    GET /api/posts/search?q=산책 강아지&limit=20&cursor=<next_cursor>
+    → 관련도 순 게시글 목록 (snippet 에 일치 부분 <b>강조</b>)
+    """
+    q = (request.args.get("q") or "").strip()
+    if not q:
+        return jsonify({"ok": False, "error": "q 필요"}), 400
+    if len(q) > MAX_SEARCH_QUERY_LEN:
+        return jsonify({"ok": False, "error": f"q 는 최대 {MAX_SEARCH_QUERY_LEN}자"}), 400
+
+    limit = parse_limit(request.args.get("limit", type=int))
+    offset = 0
+
+    cursor = request.args.get("cursor")
+    if cursor:
+        data = decode_cursor(cursor)
+        if data is None or not isinstance(data.get("offset"), int) or data["offset"] < 0:
+            return jsonify({"ok": False, "error": "잘못된 cursor"}), 400
+        offset = data["offset"]
+
+    # 관련도 정렬은 키셋 페이지네이션이 불가능 → 깊은 페이지는 제한
+    if offset >= MAX_SEARCH_OFFSET:
+        return jsonify({"ok": True, "posts": [], "next_cursor": None}), 200
+
+    results, has_more = search_posts(q, limit, offset)
+    next_cursor = encode_cursor({"offset": offset + limit}) if has_more else None
+
+    return jsonify({"ok": True, "posts": results, "next_cursor": next_cursor}), 200
+
+
 # ====================================
 # 📌 게시글 상세
 # ====================================
@@ -130,16 +300,31 @@ def get_post_detail_route(post_id: int):
     GET /api/posts/<post_id>?user_id=4
     → liked_by_me 계산하려면 user_id를 쿼리스트링으로 받음
     """
-    current_user_id = request.args.get("user_id", type=int)
+    current_user_id = viewer_user_id(request.args.get("user_id", type=int))
 
     detail = get_post_detail(post_id, current_user_id)
     if detail is None:
         return jsonify({"ok": False, "error": "post not found"}), 404
 
-    # detail["images"] 는 DB에 저장된 파일 이름 리스트
-    base_url = request.host_url.rstrip("/")
-    detail["images"] = [
-        f"{base_url}/static/post_images/{img}" for img in detail["images"]
-    ]
+    _present_detail(detail)
 
     return jsonify({"ok": True, "post": detail}), 200
+
+
+# ====================================
+# 📌 게시글 삭제
+# ====================================
+@board_bp.delete("/posts/<int:post_id>")
+def delete_post_route(post_id: int):
+    data = request.get_json(silent=True) or {}
+    user_id = acting_user_id(data.get("user_id"))
+
+    if not user_id:
+        return jsonify({"ok": False, "error": "user_id 필요"}), 400
+
+    if not delete_post(post_id, user_id):
+        return jsonify({"ok": False, "error": "post not found"}), 404
+
+    # 더 이상 아무 글도 참조하지 않는 이미지 파일 정리는 백그라운드에서
+    request_blob_gc()
+    return jsonify({"ok": True}), 200
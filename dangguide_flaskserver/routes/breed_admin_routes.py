@@ -1,46 +1,61 @@
-from flask import Blueprint, jsonify
-from dao.breed_dao import save_breed
-from routes.thedogapi import fetch_breeds, normalize_breed, translate_breed
+from flask import Blueprint, jsonify, request
+from dao.breed_sync import apply_breed_changes, get_sync_status
+from routes.thedogapi import fetch_breed_changes, fetch_stats
 
 breed_admin_bp = Blueprint("breed_admin", __name__)
 
 
 @breed_admin_bp.post("/admin/sync_breeds")
 def sync_breeds():
-    """DogAPI에서 종 정보를 가져와 DB에 저장 + 진행률 출력"""
+    """
+    DogAPI에서 종 정보를 가져와 DB에 저장 + 진행률 출력
+    POST /api/admin/sync_breeds          → 지난 동기화 이후 바뀐 견종만
+    POST /api/admin/sync_breeds?full=1   → 전체 다시 번역/저장
+    """
+    force = request.args.get("full", type=int) == 1
 
     print("\n==============================")
     print("🔄 DogAPI 품종 동기화 시작")
     print("==============================")
 
-    # 1) 전체 목록 가져오기
+    # 1) 전체 목록 가져오기 (ETag 재검증) + 바뀐 견종 추리기
     try:
         print("📡 DogAPI에서 품종 가져오는 중...")
-        raw_breeds = fetch_breeds(limit=200)
+        before = dict(fetch_stats)
+        raw_breeds, changed = fetch_breed_changes(limit=200, force=force)
     except Exception as e:
         print(f"❌ DogAPI fetch 실패: {e}")
         return jsonify({"ok": False, "error": str(e)}), 500
 
     total = len(raw_breeds)
-    print(f"📥 총 {total}개 수신 완료\n")
+    downloaded = fetch_stats["downloaded"] - before["downloaded"]
+    not_modified = fetch_stats["not_modified"] - before["not_modified"]
+    print(f"📥 총 {total}개 수신 완료 (다운로드 {downloaded}페이지, 304 {not_modified}페이지)")
+    print(f"🔍 변경된 견종: {len(changed)}개\n")
 
-    # 2) 번역 + 저장
-    print("📝 번역 + DB 저장 중...\n")
-    count = 0
-
-    for idx, raw in enumerate(raw_breeds):
-        breed = normalize_breed(raw)
-        breed = translate_breed(breed)
-
-        save_breed(breed)
-        count += 1
-
-        # --- 진행률 출력 (20개 단위로 표시) ---
-        if idx % 20 == 0:
-            print(f"  진행률: {idx}/{total}")
+    # 2) 번역 → 저장 → 해시 기록 (백그라운드 동기화와 같은 함수, 번역 실패한 견종은 다음에 재시도)
+    print("📝 번역/저장 중...")
+    count, retry_ids = apply_breed_changes(changed)
 
     print("\n🎉 동기화 완료!")
-    print(f"총 {count}개 저장됨")
+    print(f"총 {total}개 중 {count}개 추가/변경됨")
+    if retry_ids:
+        print(f"⚠️ 번역 실패 {len(retry_ids)}개 → 다음 동기화 때 재시도")
     print("==============================\n")
 
-    return jsonify({"ok": True, "saved": count}), 200
+    return jsonify({
+        "ok": True,
+        "saved": count,
+        "changed": len(changed),
+        "total": total,
+        "translate_failed": retry_ids,
+    }), 200
+
+
+@breed_admin_bp.get("/admin/sync_breeds/status")
+def sync_breeds_status():
+    """
+    백그라운드 견종 동기화 상태
+    → { state, stage, done, total, progress, eta_sec, elapsed_sec, saved, errors }
+    """
+    return jsonify({"ok": True, "sync": get_sync_status()}), 200
@@ -1,21 +1,153 @@
-from flask import Blueprint, jsonify
-from dao.breed_dao import get_all_breeds, get_breed_by_id
+from flask import Blueprint, jsonify, request, Response
+from dao.breed_cache import get_breed_list_body, get_breed_body
+from dao.breed_index import search_breeds
+from dao.breed_recommend import recommend_breeds
+from dao.mypage_dao import get_user_profile
+from dao.breed_sync import is_sync_running
+from routes.pagination import encode_cursor, decode_cursor, parse_limit
+from auth import viewer_user_id
 
 breed_bp = Blueprint("breed", __name__)
 
 
+def _cached_json(body: bytes, etag: str) -> Response:
+    """미리 직렬화된 바이트 + 강한 ETag. If-None-Match 가 맞으면 304"""
+    resp = Response(body, mimetype="application/json")
+    resp.set_etag(etag)
+    resp.headers["Cache-Control"] = "no-cache"  # 매번 ETag 로 재검증
+    return resp.make_conditional(request)
+
+
 @breed_bp.get("/breeds")
 def list_breeds():
-    """DB에서 전체 견종 리스트 반환"""
-    breeds = get_all_breeds()
-    return jsonify({"ok": True, "count": len(breeds), "breeds": breeds}), 200
+    """
+    전체 견종 리스트 반환 (메모리 캐시, 카탈로그가 바뀔 때만 다시 만듦).
+    첫 동기화가 아직 진행 중이면 빈 목록 + warming: true
+    """
+    cached = get_breed_list_body()
+    if cached is None:
+        return jsonify({"ok": True, "count": 0, "breeds": [], "warming": is_sync_running()}), 200
+
+    return _cached_json(*cached)
 
 
 @breed_bp.get("/breeds/<int:breed_id>")
 def get_breed_detail(breed_id):
-    """DB에서 특정 견종 상세 정보 반환"""
-    breed = get_breed_by_id(breed_id)
-    if not breed:
+    """특정 견종 상세 정보 반환 (메모리 캐시)"""
+    cached = get_breed_body(breed_id)
+    if not cached or not cached[0]:
+        if is_sync_running():
+            # 동기화 끝나면 생길 수 있으므로 404 대신 잠시 후 재시도 안내
+            return jsonify({"ok": False, "error": "breed sync in progress", "warming": True}), 503, {"Retry-After": "5"}
         return jsonify({"ok": False, "error": "breed not found"}), 404
 
-    return jsonify({"ok": True, "breed": breed}), 200
+    return _cached_json(*cached)
+
+
+def _csv_arg(name: str):
+    raw = request.args.get(name) or ""
+    return [v.strip() for v in raw.split(",") if v.strip()]
+
+
+@breed_bp.get("/breeds/search")
+def search_breeds_route():
+    """
+    GET /api/breeds/search?q=리트&group=Sporting,Hound&origin=독일&temperament=friendly,active
+                          &weight_min=5&weight_max=20&height_min=&height_max=
+                          &sort=-weight&limit=20&cursor=<next_cursor>
+    → { ok, count(전체 일치 수), breeds, next_cursor }
+    """
+    ranges = {}
+    for name in ("weight_min", "weight_max", "height_min", "height_max"):
+        raw = request.args.get(name)
+        try:
+            ranges[name] = float(raw) if raw not in (None, "") else None
+        except ValueError:
+            return jsonify({"ok": False, "error": f"{name} 는 숫자"}), 400
+
+    limit = parse_limit(request.args.get("limit", type=int))
+    offset = 0
+    cursor = request.args.get("cursor")
+    if cursor:
+        data = decode_cursor(cursor)
+        if data is None or not isinstance(data.get("offset"), int) or data["offset"] < 0:
+            return jsonify({"ok": False, "error": "잘못된 cursor"}), 400
+        offset = data["offset"]
+
+    try:
+        breeds = search_breeds(
+            q=request.args.get("q"),
+            groups=_csv_arg("group"),
+            origins=_csv_arg("origin"),
+            temperaments=_csv_arg("temperament"),
+            weight_range=(ranges["weight_min"], ranges["weight_max"]),
+            height_range=(ranges["height_min"], ranges["height_max"]),
+            sort=request.args.get("sort"),
+        )
+    except ValueError as e:
+        return jsonify({"ok": False, "error": str(e)}), 400
+
+    if breeds is None:
+        return jsonify({"ok": True, "count": 0, "breeds": [], "next_cursor": None, "warming": is_sync_running()}), 200
+
+    page = breeds[offset:offset + limit]
+    next_cursor = encode_cursor({"offset": offset + limit}) if offset + limit < len(breeds) else None
+    return jsonify({"ok": True, "count": len(breeds), "breeds": page, "next_cursor": next_cursor}), 200
+
+
+def _float_arg(name: str):
+    """없으면 None, 숫자가 아니면 ValueError"""
+    raw = request.args.get(name)
+    if raw in (None, ""):
+        return None
+    try:
+        return float(raw)
+    except ValueError:
+        raise ValueError(f"{name} 는 숫자")
+
+
+@breed_bp.get("/breeds/recommend")
+def recommend_breeds_route():
+    """
+    GET /api/breeds/recommend?size=small&temperament=friendly,playful&avoid=stubborn
+                             &group=Toy&life_span_min=13&limit=10
+    GET /api/breeds/recommend?user_id=3   (프로필의 견종/체중을 선호로 사용)
+    → { ok, results: [{ breed, score, components }], criteria, ignored }
+    """
+    try:
+        weight_kg = _float_arg("weight")
+        min_life_span = _float_arg("life_span_min")
+    except ValueError as e:
+        return jsonify({"ok": False, "error": str(e)}), 400
+
+    size = request.args.get("size")
+    similar_to = request.args.get("similar_to")
+
+    user_id = viewer_user_id(request.args.get("user_id", type=int))
+    if user_id:
+        profile = get_user_profile(user_id) or {}
+        similar_to = similar_to or profile.get("species") or None
+        if size is None and weight_kg is None:
+            try:
+                weight_kg = float(profile.get("weight") or "")
+            except ValueError:
+                pass
+
+    try:
+        result = recommend_breeds(
+            size=size,
+            weight_kg=weight_kg,
+            temperaments=_csv_arg("temperament"),
+            avoid=_csv_arg("avoid"),
+            groups=_csv_arg("group"),
+            min_life_span=min_life_span,
+            similar_to=similar_to,
+            limit=parse_limit(request.args.get("limit", type=int), default=10, maximum=50),
+        )
+    except ValueError as e:
+        return jsonify({"ok": False, "error": str(e)}), 400
+
+    if result is None:
+        return jsonify({"ok": True, "results": [], "criteria": [], "ignored": [], "warming": is_sync_running()}), 200
+
+    return jsonify({"ok": True, **result}), 200
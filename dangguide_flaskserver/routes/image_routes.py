@@ -0,0 +1,80 @@
+# dangguide_flaskserver/routes/image_routes.py
+"""
+게시글 이미지 전용 서빙.
+- python     : Flask send_file (ETag / Last-Modified 조건부 GET, Range, wsgi.file_wrapper 로 sendfile)
+- x-accel    : nginx 에 X-Accel-Redirect 로 넘김 (파이썬 워커는 헤더만 만듦)
+- x-sendfile : Apache/lighttpd 에 X-Sendfile 로 넘김
+"""
+
+import mimetypes
+import os
+import re
+
+from flask import Blueprint, Response, abort, send_from_directory
+from werkzeug.security import safe_join
+
+from dao.blob_store import STORE_ROOT
+
+image_bp = Blueprint("image", __name__)
+
+IMAGE_DELIVERY = os.getenv("IMAGE_DELIVERY", "python")                  # python / x-accel / x-sendfile
+IMAGE_ACCEL_PREFIX = os.getenv("IMAGE_ACCEL_PREFIX", "/_protected/post_images/")
+
+# 해시 경로는 내용이 절대 안 바뀌므로 1년 + immutable, 예전 파일명은 짧게
+IMAGE_IMMUTABLE_MAX_AGE = int(os.getenv("IMAGE_IMMUTABLE_MAX_AGE", str(365 * 24 * 3600)))
+IMAGE_LEGACY_MAX_AGE = int(os.getenv("IMAGE_LEGACY_MAX_AGE", str(24 * 3600)))
+
+_HASHED_PATH_RE = re.compile(r"^[0-9a-f]{2}/[0-9a-f]{2}/[0-9a-f]{64}(_thumb|_medium)?\.[a-z]+$")
+
+
+def _is_private(filename: str) -> bool:
+    """'.' 으로 시작하는 경로 조각(.tmp 등)이나 .gc 로 끝나는 파일"""
+    return filename.endswith(".gc") or any(part.startswith(".") for part in filename.split("/"))
+
+
+def _is_immutable(filename: str) -> bool:
+    return _HASHED_PATH_RE.match(filename) is not None
+
+
+def _apply_cache_headers(resp: Response, filename: str) -> Response:
+    resp.cache_control.no_cache = None  # send_file 기본값(no-cache) 제거
+    resp.cache_control.public = True
+    if _is_immutable(filename):
+        resp.cache_control.max_age = IMAGE_IMMUTABLE_MAX_AGE
+        resp.cache_control.immutable = True
+    else:
+        resp.cache_control.max_age = IMAGE_LEGACY_MAX_AGE
+    return resp
+
+
+def _proxy_response(filename: str, full_path: str) -> Response:
+    """프록시가 실제 파일 전송을 맡도록 헤더만 담은 응답"""
+    mimetype = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+    resp = Response(mimetype=mimetype)
+    if IMAGE_DELIVERY == "x-accel":
+        resp.headers["X-Accel-Redirect"] = IMAGE_ACCEL_PREFIX.rstrip("/") + "/" + filename
+    else:
+        resp.headers["X-Sendfile"] = full_path
+    return resp
+
+
+@image_bp.get("/images/<path:filename>")
+def serve_post_image(filename: str):
+    """
+    GET /api/images/ab/cd/<sha256>.jpg
+    GET /api/images/<예전 파일명>
+    """
+    # .tmp/ 업로드 임시 파일, 삭제 대기 중인 *.gc 파일은 공개하지 않음
+    if _is_private(filename):
+        abort(404)
+    full_path = safe_join(str(STORE_ROOT), filename)
+    if full_path is None or not os.path.isfile(full_path):
+        abort(404)
+
+    if IMAGE_DELIVERY in ("x-accel", "x-sendfile"):
+        resp = _proxy_response(filename, full_path)
+    else:
+        # conditional=True: If-None-Match / If-Modified-Since → 304, Range → 206
+        resp = send_from_directory(STORE_ROOT, filename, conditional=True, etag=True)
+
+    return _apply_cache_headers(resp, filename)
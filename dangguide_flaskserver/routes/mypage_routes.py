@@ -4,6 +4,7 @@ from __future__ import annotations
 from flask import Blueprint, request, jsonify
 
 from dao.mypage_dao import get_user_profile, upsert_user_profile
+from auth import acting_user_id
 
 mypage_bp = Blueprint("mypage", __name__)
 
@@ -61,6 +62,9 @@ def update_my_page(user_id: int):
       "profile_image": "이미지 경로(optional)"
     }
     """
+    # 토큰이 있으면 본인 프로필만 수정 가능 (다르면 403)
+    user_id = acting_user_id(user_id)
+
     data = request.get_json(silent=True) or {}
 
     # Flutter에서 아직 profile_image 안 보내면 None으로 처리
@@ -0,0 +1,35 @@
+# dangguide_flaskserver/routes/pagination.py
+"""
+커서(keyset) 페이지네이션 공통 유틸.
+클라이언트에는 내부 키를 그대로 노출하지 않고 불투명한 문자열로 넘긴다.
+"""
+
+import base64
+import json
+from typing import Optional, Dict, Any
+
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 100
+
+
+def encode_cursor(data: Dict[str, Any]) -> str:
+    raw = json.dumps(data, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[Dict[str, Any]]:
+    """잘못된 커서는 None (라우트에서 400 처리)"""
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except Exception:
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def parse_limit(value: Optional[int], default: int = DEFAULT_LIMIT, maximum: int = MAX_LIMIT) -> int:
+    if value is None or value <= 0:
+        return default
+    return min(value, maximum)
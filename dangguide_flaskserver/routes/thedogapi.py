@@ -1,18 +1,69 @@
 # routes/thedogapi.py
 
 from __future__ import annotations
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Protocol, Iterable, Callable, Tuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+import hashlib
+import json
 import os
+import re
+import threading
 import requests
 from deep_translator import GoogleTranslator
 
+from dao.translation_cache import get_cached_translations, save_translations
+
 # ---- 설정 ----
 DOG_API_BASE_URL = "https://api.thedogapi.com/v1"
 DOG_API_KEY = os.getenv("DOG_API_KEY")
 HTTP_TIMEOUT = 5
+PAGE_SIZE = 50
+
+# 페이지 원본 + ETag/Last-Modified, 견종별 raw 해시를 저장하는 디스크 캐시
+CACHE_DIR = Path(os.getenv(
+    "DOG_API_CACHE_DIR",
+    str(Path(__file__).resolve().parent.parent / "cache" / "thedogapi"),
+))
+BREED_HASHES_FILE = "breed_hashes.json"
+
+# 동기화 시 페이지 다운로드(200) / 재검증 성공(304) 횟수
+fetch_stats = {"downloaded": 0, "not_modified": 0}
+
+TRANSLATE_TARGET = "ko"
+TRANSLATE_WORKERS = int(os.getenv("TRANSLATE_WORKERS", "8"))  # 번역 동시 요청 수 상한
+TRANSLATE_FAILED = "(번역 실패)"
 
 session: Optional[requests.Session] = None
-translator = GoogleTranslator(source="en", target="ko")
+
+
+class Translator(Protocol):
+    """translate(text) -> str 만 있으면 됨 (테스트에서는 로컬 stub 으로 교체)"""
+
+    def translate(self, text: str) -> str: ...
+
+
+translator: Optional[Translator] = None
+
+# GoogleTranslator 는 translate() 호출마다 인스턴스 상태(_url_params)를 바꾸므로
+# 여러 스레드가 하나를 같이 쓰면 다른 문장의 번역이 섞일 수 있음 → 스레드마다 따로 생성
+_thread_local = threading.local()
+
+
+def get_translator() -> Translator:
+    """set_translator 로 지정한 번역기, 없으면 현재 스레드 전용 GoogleTranslator"""
+    if translator is not None:
+        return translator
+    t = getattr(_thread_local, "translator", None)
+    if t is None:
+        t = _thread_local.translator = GoogleTranslator(source="en", target=TRANSLATE_TARGET)
+    return t
+
+
+def set_translator(t: Optional[Translator]) -> None:
+    """번역기 교체 (여러 스레드에서 동시에 호출되므로 스레드 안전해야 함). None 이면 기본 GoogleTranslator 로 복귀"""
+    global translator
+    translator = t
 
 
 def _get_session() -> requests.Session:
@@ -28,12 +79,7 @@ def _get_session() -> requests.Session:
     return session
 
 
-# ✅ 전체 견종 리스트 가져오기 (limit/page 안 씀 = 전부)
-def fetch_all_breeds() -> List[Dict[str, Any]]:
-    s = _get_session()
-
-    resp = s.get(f"{DOG_API_BASE_URL}/breeds", timeout=HTTP_TIMEOUT)
-
+def _raise_for_status(resp: requests.Response) -> None:
     if resp.status_code == 401:
         raise RuntimeError(("UNAUTHORIZED", 502, "TheDogAPI 키 오류 또는 미설정"))
 
@@ -45,7 +91,7 @@ def fetch_all_breeds() -> List[Dict[str, Any]]:
             {"status": resp.status_code},
         ))
 
-    if resp.status_code != 200:
+    if resp.status_code not in (200, 304):
         raise RuntimeError((
             "UPSTREAM_BAD_RESPONSE",
             502,
@@ -53,8 +99,58 @@ def fetch_all_breeds() -> List[Dict[str, Any]]:
             {"status": resp.status_code},
         ))
 
+
+# ---- 응답 디스크 캐시 (ETag / Last-Modified 로 조건부 요청) ----
+def _cache_path(name: str) -> Path:
+    return CACHE_DIR / name
+
+
+def _read_json(path: Path) -> Optional[Any]:
     try:
-        return resp.json()
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_json(path: Path, data: Any) -> None:
+    # 쓰다가 죽어도 이전 파일이 깨지지 않도록 임시 파일에 쓰고 교체
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False)
+    os.replace(tmp, path)
+
+
+def _fetch_page(s: requests.Session, page: int) -> List[Dict[str, Any]]:
+    """
+    한 페이지 요청. 캐시에 ETag/Last-Modified 가 있으면 조건부 요청을 보내고
+    304 면 디스크에 저장된 payload 를 그대로 사용.
+    """
+    path = _cache_path(f"breeds_page_{page}.json")
+    cached = _read_json(path)
+
+    headers = {}
+    if cached:
+        if cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+        if cached.get("last_modified"):
+            headers["If-Modified-Since"] = cached["last_modified"]
+
+    resp = s.get(
+        f"{DOG_API_BASE_URL}/breeds",
+        params={"limit": PAGE_SIZE, "page": page},
+        headers=headers,
+        timeout=HTTP_TIMEOUT,
+    )
+    _raise_for_status(resp)
+
+    if resp.status_code == 304 and cached is not None:
+        fetch_stats["not_modified"] += 1
+        return cached["items"]
+
+    try:
+        items = resp.json()
     except Exception as e:
         raise RuntimeError((
             "UPSTREAM_PARSE_FAILED",
@@ -62,6 +158,32 @@ def fetch_all_breeds() -> List[Dict[str, Any]]:
             f"TheDogAPI 응답 파싱 실패: {e}",
         ))
 
+    fetch_stats["downloaded"] += 1
+    _write_json(path, {
+        "etag": resp.headers.get("ETag"),
+        "last_modified": resp.headers.get("Last-Modified"),
+        "items": items,
+    })
+    return items
+
+
+# ✅ 전체 견종 리스트 가져오기 (PAGE_SIZE 단위로 빈 페이지 나올 때까지)
+def fetch_all_breeds() -> List[Dict[str, Any]]:
+    s = _get_session()
+
+    all_items: List[Dict[str, Any]] = []
+    page = 0
+
+    while True:
+        items = _fetch_page(s, page)
+        if not items:
+            break  # 더 이상 없음
+
+        all_items.extend(items)
+        page += 1
+
+    return all_items
+
 
 # (원래 함수가 필요하면 남겨두고, 내부에서 위 함수 재사용하게 해도 됨)
 def fetch_breeds(limit: int) -> List[Dict[str, Any]]:
@@ -76,6 +198,34 @@ def fetch_breeds(limit: int) -> List[Dict[str, Any]]:
     return all_breeds[:limit]
 
 
+# ---- 견종 단위 변경 감지 ----
+def _raw_hash(raw: Dict[str, Any]) -> str:
+    payload = json.dumps(raw, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def fetch_breed_changes(limit: int, force: bool = False) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    return: (전체 raw 목록, 마지막 동기화 이후 바뀐/새로 생긴 raw 목록)
+    force=True 면 전부 바뀐 것으로 취급 (DB 가 비어 있을 때 등)
+    """
+    raw_breeds = fetch_breeds(limit)
+    if force:
+        return raw_breeds, list(raw_breeds)
+
+    known = _read_json(_cache_path(BREED_HASHES_FILE)) or {}
+    changed = [raw for raw in raw_breeds if known.get(str(raw.get("id"))) != _raw_hash(raw)]
+    return raw_breeds, changed
+
+
+def commit_breed_hashes(raw_breeds: List[Dict[str, Any]]) -> None:
+    """DB 저장까지 끝난 견종의 raw 해시 기록 (실패한 동기화는 다음에 다시 diff 에 잡힘)"""
+    path = _cache_path(BREED_HASHES_FILE)
+    known = _read_json(path) or {}
+    known.update({str(raw.get("id")): _raw_hash(raw) for raw in raw_breeds})
+    _write_json(path, known)
+
+
 # 필요한 필드만 정리
 def normalize_breed(raw: Dict[str, Any]) -> Dict[str, Any]:
     image = raw.get("image") or {}
@@ -94,47 +244,124 @@ def normalize_breed(raw: Dict[str, Any]) -> Dict[str, Any]:
     }
 
 
-def translate_breed(breed: Dict[str, Any]) -> Dict[str, Any]:
-    # 영어 → 한국어 필드 목록
-    fields = [
-        ("name_en", "name_ko"),
-        ("temperament_en", "temperament_ko"),
-        ("bred_for_en", "bred_for_ko"),
-        ("breed_group_en", "breed_group_ko"),
-        ("life_span_en", "life_span_ko"),
-        ("origin_en", "origin_ko"),
-    ]
-
-    for src, dst in fields:
-        text = breed.get(src)
-        if text:
-            try:
-                breed[dst] = translator.translate(text)
-            except Exception as e:
-                print(f"[translate error] field={src}, text={text}, error={e}")
-                breed[dst] = "(번역 실패)"
-
-    return breed
+# 영어 → 한국어 필드 목록
+TRANSLATE_FIELDS = [
+    ("name_en", "name_ko"),
+    ("temperament_en", "temperament_ko"),
+    ("bred_for_en", "bred_for_ko"),
+    ("breed_group_en", "breed_group_ko"),
+    ("life_span_en", "life_span_ko"),
+    ("origin_en", "origin_ko"),
+]
 
-def fetch_all_breeds() -> List[Dict[str, Any]]:
-    s = _get_session()
+# "Stubborn, Curious, ..." 처럼 쉼표로 나열된 필드는 단어 단위로 번역해 견종 간 중복 제거
+_LIST_FIELDS = {"temperament_en", "origin_en"}
+_LIFE_SPAN_RE = re.compile(r"^\s*(\d+)(?:\s*[-–]\s*(\d+))?\s*years?\s*$", re.IGNORECASE)
 
-    all_items = []
-    page = 0
 
-    while True:
-        params = {"limit": 50, "page": page}
-        resp = s.get(f"{DOG_API_BASE_URL}/breeds",
-                     params=params, timeout=HTTP_TIMEOUT)
+def _split_units(field: str, text: str) -> List[str]:
+    if field in _LIST_FIELDS:
+        return [t.strip() for t in text.split(",") if t.strip()]
+    return [text.strip()]
 
-        if resp.status_code != 200:
-            break
 
-        items = resp.json()
-        if not items:
-            break  # 더 이상 없음
+def _local_translation(field: str, text: str) -> Optional[str]:
+    """번역기 없이 바로 만들 수 있는 형식 ("10 - 12 years" → "10~12년")"""
+    if field == "life_span_en":
+        m = _LIFE_SPAN_RE.match(text)
+        if m:
+            lo, hi = m.group(1), m.group(2)
+            return f"{lo}~{hi}년" if hi else f"{lo}년"
+    return None
 
-        all_items.extend(items)
-        page += 1
 
-    return all_items
+def _translate_one(t: Optional[Translator], text: str) -> Optional[str]:
+    try:
+        # 워커 스레드 안에서 번역기를 가져옴 (기본 번역기는 스레드마다 하나)
+        return (t or get_translator()).translate(text)
+    except Exception as e:
+        print(f"[translate error] text={text}, error={e}")
+        return None
+
+
+# 진행률 콜백: (완료 수, 전체 수)
+ProgressFn = Callable[[int, int], None]
+
+
+def translate_texts(
+    texts: Iterable[str],
+    t: Optional[Translator] = None,
+    on_progress: Optional[ProgressFn] = None,
+) -> Dict[str, Optional[str]]:
+    """
+    중복 제거 → 캐시 조회 → 캐시에 없는 것만 스레드 풀로 동시에 번역 → 캐시에 저장.
+    번역 실패한 문장은 None (캐시에 저장하지 않아 다음 동기화 때 재시도)
+    """
+    unique = list(dict.fromkeys(texts))
+    result: Dict[str, Optional[str]] = dict(get_cached_translations(unique, TRANSLATE_TARGET))
+
+    missing = [text for text in unique if text not in result]
+    if on_progress:
+        on_progress(0, len(missing))
+
+    if missing:
+        workers = max(1, min(TRANSLATE_WORKERS, len(missing)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="translate") as ex:
+            futures = {ex.submit(_translate_one, t, text): text for text in missing}
+            for done, fut in enumerate(as_completed(futures), start=1):
+                result[futures[fut]] = fut.result()
+                if on_progress:
+                    on_progress(done, len(missing))
+
+        save_translations(
+            [(src, result[src]) for src in missing if result[src]],
+            TRANSLATE_TARGET,
+        )
+
+    return result
+
+
+def translate_breeds(
+    breeds: List[Dict[str, Any]],
+    t: Optional[Translator] = None,
+    on_progress: Optional[ProgressFn] = None,
+) -> List[Dict[str, Any]]:
+    """여러 견종을 한 번에 번역 (견종 간 반복되는 문장은 한 번만 번역)"""
+    # 1) 번역이 필요한 단위 모으기
+    units: List[str] = []
+    for breed in breeds:
+        for src, _ in TRANSLATE_FIELDS:
+            text = breed.get(src)
+            if text and _local_translation(src, text) is None:
+                units.extend(_split_units(src, text))
+
+    translated = translate_texts(units, t, on_progress)
+
+    # 2) 필드별로 다시 조립
+    for breed in breeds:
+        for src, dst in TRANSLATE_FIELDS:
+            text = breed.get(src)
+            if not text:
+                continue
+
+            local = _local_translation(src, text)
+            if local is not None:
+                breed[dst] = local
+                continue
+
+            parts = [translated.get(u) for u in _split_units(src, text)]
+            if any(p is None for p in parts):
+                breed[dst] = TRANSLATE_FAILED
+            else:
+                breed[dst] = ", ".join(parts)
+
+    return breeds
+
+
+def translation_failed(breed: Dict[str, Any]) -> bool:
+    """번역 못 한 필드가 하나라도 있으면 True (해시를 기록하지 않아 다음 동기화 때 재시도)"""
+    return any(breed.get(dst) == TRANSLATE_FAILED for _, dst in TRANSLATE_FIELDS)
+
+
+def translate_breed(breed: Dict[str, Any]) -> Dict[str, Any]:
+    return translate_breeds([breed])[0]
@@ -5,13 +5,35 @@ from flask import Blueprint, request, jsonify
 from dao.user_dao import (
     create_user,
     validate_login,
-    find_user_by_username,
-    delete_user_by_credentials
+    is_username_taken,
+    delete_user_by_credentials,
+    UsernameTaken,
 )
+from dao.account_reaper import wake_reaper
+from dao.passwords import PasswordBusy, login_throttle
+from auth import issue_token, current_claims, revoke_token, revoke_user_tokens
 
 user_bp = Blueprint("user", __name__)
 
 
+@user_bp.errorhandler(PasswordBusy)
+def password_busy(e):
+  # 비밀번호 해시 워커 풀이 가득 참 → 잠시 후 재시도
+  return jsonify({"ok": False, "error": "요청이 많습니다. 잠시 후 다시 시도해주세요."}), 503, {"Retry-After": "1"}
+
+
+def _throttled(username: str):
+  """아이디별 시도 제한 초과면 429 응답 (KDF 계산 전에 거절)"""
+  retry_after = login_throttle.acquire(username)
+  if not retry_after:
+    return None
+  return (
+    jsonify({"ok": False, "error": "로그인 시도가 너무 많습니다. 잠시 후 다시 시도해주세요."}),
+    429,
+    {"Retry-After": str(int(retry_after) + 1)},
+  )
+
+
 @user_bp.get("/users/check")
 def check_username():
   """
@@ -23,8 +45,8 @@ def check_username():
   if not username:
     return jsonify({"ok": False, "error": "username 파라미터 필요"}), 400
 
-  user = find_user_by_username(username)
-  exists = user is not None
+  # 대부분 메모리(Bloom 필터)에서 바로 응답, 필터 적중 때만 DB EXISTS
+  exists = is_username_taken(username)
 
   return jsonify({"ok": True, "exists": exists}), 200
 
@@ -39,10 +61,14 @@ def register_user():
     return jsonify({"ok": False, "error": "username과 password 필요"}), 400
 
   # 중복 체크
-  if find_user_by_username(username):
+  if is_username_taken(username):
     return jsonify({"ok": False, "error": "이미 존재하는 username"}), 409
 
-  user = create_user(username, password)
+  try:
+    user = create_user(username, password)
+  except UsernameTaken:
+    # 확인과 INSERT 사이에 다른 요청이 먼저 가입했거나, 아이디 인덱스가 아직 모르는 가입 (UNIQUE 위반)
+    return jsonify({"ok": False, "error": "이미 존재하는 username"}), 409
   if user is None:
     return jsonify({"ok": False, "error": "회원가입 실패"}), 500
 
@@ -58,18 +84,43 @@ def login_user():
   if not username or not password:
     return jsonify({"ok": False, "error": "username과 password 필요"}), 400
 
+  throttled = _throttled(username)
+  if throttled:
+    return throttled
+
   user = validate_login(username, password)
   if user is None:
     return jsonify({"ok": False, "error": "로그인 실패"}), 401
 
+  login_throttle.reset(username)
+
+  # 이후 요청은 Authorization: Bearer <token>
+  token = issue_token(user["id"])
+
   return jsonify({
     "ok": True,
     "user": {
       "id": user["id"],
       "username": user["username"],
-    }
+    },
+    "token": token["token"],
+    "token_expires_at": token["expires_at"],
   }), 200
 
+
+@user_bp.post("/users/logout")
+def logout_user():
+  """
+  POST /api/users/logout  (Authorization: Bearer <token>)
+  → 해당 토큰 폐기
+  """
+  claims = current_claims()
+  if claims is None:
+    return jsonify({"ok": False, "error": "토큰 필요"}), 401
+
+  revoke_token(claims)
+  return jsonify({"ok": True}), 200
+
 @user_bp.post("/users/delete")
 def delete_user_route():
     data = request.get_json(silent=True) or {}
@@ -82,14 +133,22 @@ def delete_user_route():
             "error": "username, password 필요"
         }), 400
 
-    ok = delete_user_by_credentials(username, password)
+    throttled = _throttled(username)
+    if throttled:
+        return throttled
+
+    deleted_user_id = delete_user_by_credentials(username, password)
 
-    if not ok:
+    if not deleted_user_id:
         return jsonify({
             "ok": False,
             "error": "아이디 또는 비밀번호가 올바르지 않습니다."
         }), 400
 
-    # 여기까지 오면 users에서 해당 유저 삭제 완료
-    # posts / comments / post_likes / user_profiles 도 FK CASCADE로 함께 삭제됨
+    # 탈퇴한 계정으로 발급된 토큰 전부 폐기
+    revoke_user_tokens(deleted_user_id)
+
+    # 여기까지 오면 탈퇴 표시 완료 (로그인/아이디 조회에서 바로 제외)
+    # posts / comments / post_likes / user_profiles / 이미지 파일은 리퍼가 나눠서 삭제
+    wake_reaper()
     return jsonify({"ok": True}), 200
\ No newline at end of file
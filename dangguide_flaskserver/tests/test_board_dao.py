@@ -0,0 +1,89 @@
+# tests/test_board_dao.py
+"""
+게시글 DAO: 좋아요 직접 반영 경로(LIKE_BUFFER=0)의 like_count, 글 삭제 시 자식 행/대기 중인 좋아요 정리.
+
+    cd dangguide_flaskserver
+    python -m pytest tests
+"""
+
+import pytest
+
+import db
+from bench._common import use_temp_db, seed_users
+from dao import board_dao
+from dao.like_buffer import LikeBuffer
+from dao.user_dao import InactiveUser
+
+POST_ID = 1
+
+
+def _db_likes():
+    conn = db.get_conn()
+    row = conn.execute(
+        "SELECT like_count, (SELECT COUNT(*) FROM post_likes WHERE post_id = ?) FROM posts WHERE id = ?",
+        (POST_ID, POST_ID),
+    ).fetchone()
+    conn.close()
+    return tuple(row)
+
+
+@pytest.fixture
+def post(monkeypatch):
+    use_temp_db()
+    seed_users(5)
+    monkeypatch.setattr(board_dao, "LIKE_BUFFER", False)
+    conn = db.get_conn()
+    conn.execute("INSERT INTO posts (id, user_id, title, content) VALUES (?, 1, 't', 'c')", (POST_ID,))
+    conn.commit()
+    conn.close()
+    return POST_ID
+
+
+def test_toggle_like_updates_like_count(post):
+    assert board_dao.toggle_like(post, 2) is True
+    assert _db_likes() == (1, 1)
+
+    assert board_dao.toggle_like(post, 3) is True
+    assert _db_likes() == (2, 2)
+
+    assert board_dao.toggle_like(post, 2) is False
+    assert _db_likes() == (1, 1)
+
+
+def test_toggle_like_rejects_deleted_user(post):
+    conn = db.get_conn()
+    conn.execute("UPDATE users SET deleted_at = CURRENT_TIMESTAMP WHERE id = 4")
+    conn.commit()
+    conn.close()
+
+    with pytest.raises(InactiveUser):
+        board_dao.toggle_like(post, 4)
+    assert _db_likes() == (0, 0)
+
+
+def test_delete_post_cascades_and_drops_pending_likes(post, monkeypatch):
+    board_dao.toggle_like(post, 2)
+    conn = db.get_conn()
+    conn.execute("INSERT INTO comments (user_id, post_id, content) VALUES (3, ?, 'hi')", (post,))
+    conn.commit()
+    conn.close()
+
+    # 버퍼에 대기 중인 좋아요
+    buffer = LikeBuffer()
+    monkeypatch.setattr(board_dao, "like_buffer", buffer)
+    monkeypatch.setattr(board_dao, "LIKE_BUFFER", True)
+    board_dao.toggle_like(post, 3)
+    assert buffer.stats()["pending"] == 1
+
+    assert board_dao.delete_post(post, 2) is False  # 작성자 아님
+    assert board_dao.delete_post(post, 1) is True
+
+    assert buffer.stats()["pending"] == 0
+    assert buffer.like_count(post, 0) == 0
+    conn = db.get_conn()
+    left = [
+        conn.execute(f"SELECT COUNT(*) FROM {table} WHERE post_id = ?", (post,)).fetchone()[0]
+        for table in ("comments", "post_likes")
+    ]
+    conn.close()
+    assert left == [0, 0]
@@ -0,0 +1,110 @@
+# tests/test_like_buffer.py
+"""
+좋아요 버퍼: toggle 과 flush 가 엇갈려도 상태/카운터가 맞는지.
+
+    cd dangguide_flaskserver
+    python -m pytest tests
+"""
+
+import threading
+
+import pytest
+
+import db
+from bench._common import use_temp_db, seed_users
+from dao.like_buffer import LikeBuffer
+
+POST_ID = 1
+
+
+def _is_liked(post_id: int, user_id: int) -> bool:
+    conn = db.get_conn()
+    row = conn.execute(
+        "SELECT 1 FROM post_likes WHERE post_id = ? AND user_id = ?", (post_id, user_id)
+    ).fetchone()
+    conn.close()
+    return row is not None
+
+
+def _db_likes():
+    conn = db.get_conn()
+    row = conn.execute(
+        "SELECT like_count, (SELECT COUNT(*) FROM post_likes WHERE post_id = ?) FROM posts WHERE id = ?",
+        (POST_ID, POST_ID),
+    ).fetchone()
+    conn.close()
+    return tuple(row)
+
+
+@pytest.fixture
+def buffer():
+    use_temp_db()
+    seed_users(20)
+    conn = db.get_conn()
+    conn.execute("INSERT INTO posts (id, user_id, title, content) VALUES (?, 1, 't', 'c')", (POST_ID,))
+    conn.commit()
+    conn.close()
+    return LikeBuffer()
+
+
+def test_flush_during_lookup_does_not_reuse_stale_state(buffer):
+    # 이미 좋아요한 사용자
+    conn = db.get_conn()
+    conn.execute("INSERT INTO post_likes (post_id, user_id) VALUES (?, 2)", (POST_ID,))
+    conn.execute("UPDATE posts SET like_count = 1 WHERE id = ?", (POST_ID,))
+    conn.commit()
+    conn.close()
+
+    calls = []
+
+    def racing_lookup(post_id, user_id):
+        state = _is_liked(post_id, user_id)
+        if not calls:
+            # 첫 조회 직후 다른 요청이 좋아요 취소 + flush 커밋 → 방금 읽은 값은 낡음
+            calls.append(state)
+            assert buffer.toggle(post_id, user_id, _is_liked) is False
+            buffer.flush()
+        return state
+
+    # 취소 뒤 다시 누른 것 → 좋아요 ON
+    assert buffer.toggle(POST_ID, 2, racing_lookup) is True
+    assert buffer.like_count(POST_ID, _db_likes()[0]) == 1
+
+    buffer.flush()
+    assert _db_likes() == (1, 1)
+    assert buffer.stats()["pending"] == 0
+
+
+def test_concurrent_toggles_and_flushes_match_click_parity(buffer):
+    users = range(2, 12)
+    clicks_per_user = 41
+    stop = threading.Event()
+    errors = []
+
+    def flusher():
+        while not stop.is_set():
+            try:
+                buffer.flush()
+            except Exception as e:
+                errors.append(e)
+
+    def clicker(user_id):
+        for _ in range(clicks_per_user):
+            buffer.toggle(POST_ID, user_id, _is_liked)
+
+    flush_thread = threading.Thread(target=flusher)
+    flush_thread.start()
+    threads = [threading.Thread(target=clicker, args=(u,)) for u in users]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    stop.set()
+    flush_thread.join()
+    buffer.flush()
+
+    assert not errors
+    # 홀수 번 누름 → 전원 좋아요 ON
+    assert _db_likes() == (len(users), len(users))
+    assert all(_is_liked(POST_ID, u) for u in users)
+    assert buffer.stats()["pending"] == 0